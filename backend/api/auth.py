@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, current_user, jwt_required
 from backend.extensions import db
 from backend.api import api_bp
 from backend.models.user import User
@@ -32,6 +32,8 @@ def login():
     user = User.query.filter_by(email=email).first()
     if not user or not user.check_password(password or ""):
         return jsonify({"error": "Invalid credentials"}), 401
+    if db.session.is_modified(user):
+        db.session.commit()  # Password rehashed with the current settings
     token = create_access_token(identity=str(user.id))
     return jsonify({"token": token, "user": user.to_dict()})
 
@@ -39,8 +41,7 @@ def login():
 @api_bp.get("/auth/me")
 @jwt_required()
 def me():
-    uid = get_jwt_identity()
-    user = User.query.get(int(uid))
+    user = db.session.get(User, current_user.id)
     return jsonify(user.to_dict())
 
 
@@ -1,9 +1,13 @@
 from flask import jsonify
 from flask_jwt_extended import jwt_required
 from backend.api import api_bp
-import json
 from backend.config import Config
-from web3 import Web3
+from backend.services.chain import chain
+from backend.services import indexer, merkle
+from backend.models.contribution import Contribution
+from backend.models.anchor_batch import AnchorBatch
+from backend.models.chain_transaction import ChainTransaction
+import json
 
 
 @api_bp.get("/blockchain/status")
@@ -11,14 +15,13 @@ from web3 import Web3
 def bc_status():
     """Check if Ganache is running and accessible"""
     try:
-        w3 = Web3(Web3.HTTPProvider(Config.GANACHE_URL))
-        # Try to get latest block to verify connection
-        latest_block = w3.eth.get_block('latest')
+        # Try to get latest block number to verify connection
+        latest_block = chain.w3.eth.block_number
         return jsonify({
             "connected": True,
             "url": Config.GANACHE_URL,
-            "latestBlock": latest_block.number if latest_block else None,
-            "chainId": w3.eth.chain_id if hasattr(w3.eth, 'chain_id') else None
+            "latestBlock": latest_block,
+            "chainId": chain.chain_id,
         })
     except Exception as e:
         return jsonify({
@@ -34,9 +37,7 @@ def bc_status():
 def contract_info():
     """Get contract ABI and address for frontend"""
     try:
-        with open(Config.CONTRACT_ABI_PATH, "r") as f:
-            data = json.load(f)
-        
+        data = chain.contract_data()
         return jsonify({
             "address": Config.CONTRACT_ADDRESS or data.get("address"),
             "abi": data["abi"],
@@ -46,3 +47,45 @@ def contract_info():
         return jsonify({"error": str(e)}), 500
 
 
+
+
+@api_bp.get("/blockchain/anchors/<int:contribution_id>")
+def contribution_anchor(contribution_id: int):
+    """Merkle batch and inclusion proof for a batch-anchored contribution"""
+    c = Contribution.query.get_or_404(contribution_id)
+    if not c.anchor_batch_id:
+        return jsonify({"error": "Contribution is not batch-anchored"}), 404
+    if c.anchor_proof is None:
+        return jsonify({"error": "Batch anchor not confirmed yet"}), 404
+    batch = AnchorBatch.query.get_or_404(c.anchor_batch_id)
+    proof = json.loads(c.anchor_proof or "[]")
+    return jsonify({
+        "contributionId": c.id,
+        "ipfsHash": c.ipfs_cid,
+        "batch": batch.to_dict(),
+        "proof": proof,
+        "verified": merkle.verify(c.ipfs_cid, proof, bytes.fromhex(batch.merkle_root[2:])),
+    })
+
+
+@api_bp.get("/blockchain/transactions/<tx_hash>")
+@jwt_required(optional=True)
+def transaction_status(tx_hash: str):
+    """Confirmation state of a transaction sent by the backend"""
+    tx = ChainTransaction.query.filter_by(tx_hash=tx_hash).first()
+    if not tx:
+        return jsonify({"error": "Unknown transaction"}), 404
+    return jsonify(tx.to_dict())
+
+
+@api_bp.get("/blockchain/hashes/<ipfs_hash>")
+@jwt_required(optional=True)
+def hash_anchors(ipfs_hash: str):
+    """Transactions that stored a CID via saveHash, from the local event index"""
+    anchors = indexer.anchors_for(ipfs_hash)
+    return jsonify({
+        "ipfsHash": ipfs_hash,
+        "anchored": bool(anchors),
+        "anchors": [a.to_dict() for a in anchors],
+        "lastIndexedBlock": indexer.last_indexed_block(),
+    })
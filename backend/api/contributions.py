@@ -1,18 +1,28 @@
 import os
-from flask import request, jsonify, current_app, send_from_directory
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import logging
+from urllib.parse import quote
+from flask import request, jsonify, current_app, send_file, abort
+from flask_jwt_extended import current_user, jwt_required, get_jwt_identity
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
-from backend.extensions import db, socketio
+from backend.extensions import db
 from backend.api import api_bp
 from backend.models.contribution import Contribution
 from backend.models.user import User
-from web3 import Web3
-import json
-from backend.config import Config
-from backend.services.storage import save_upload, upload_file_to_pinata, test_pinata_auth
+from backend.models.approval_job import ApprovalJob
+from backend.services import approvals, derivatives, feed, realtime, receipts
+from backend.services.chain import chain, ContractNotDeployed
+from backend.services.cid import compute_cid
+from backend.models.stored_file import StoredFile, blob_path
+from backend.services.storage import save_upload, upload_file_to_pinata, pinata_auth_status
+from backend.utils.auth_utils import admin_required
+from backend.utils.pagination import InvalidCursor, keyset_page, page_size, parse_datetime
+from backend.utils.uploads import parse_upload_url, upload_mimetype
 
 ALLOWED_EXT = {"pdf", "png", "jpg", "jpeg", "gif", "txt", "md"}
 
+logger = logging.getLogger(__name__)
+
 
 def allowed(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXT
@@ -20,33 +30,153 @@ def allowed(filename: str) -> bool:
 
 @api_bp.get("/uploads/<path:filename>")
 def serve_upload(filename):
-    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
+    """Serve an upload with conditional GET and Range support.
+
+    Content-addressed blobs never change, so they get their SHA-256 as a
+    strong ETag and immutable caching; only the browser may cache private
+    blobs (KYC documents), never shared caches or CDNs. With UPLOAD_SEND_MODE "x-accel" or
+    "x-sendfile" the body is left to the front proxy.
+
+    The Content-Type comes from the name the file was stored under, not from
+    the name in the URL (which anyone can change), and is limited to
+    ``SAFE_MIMETYPES`` so an upload is never rendered as a page of this origin.
+    """
+    config = current_app.config
+    sha256, name = parse_upload_url(filename)
+    private = True
+    if sha256:
+        relative, etag, max_age = blob_path(sha256), sha256, config["UPLOAD_CACHE_MAX_AGE"]
+        stored = StoredFile.query.filter_by(sha256=sha256).first()
+        private = stored is None or stored.private
+        mimetype = upload_mimetype(stored.original_name if stored else None)
+    else:
+        # Flat uploads stored before content addressing can be overwritten; always revalidate
+        relative, etag, max_age = filename, None, None
+        mimetype = upload_mimetype(name)
+    path = safe_join(config["UPLOAD_FOLDER"], relative)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mode = config["UPLOAD_SEND_MODE"]
+    if mode in ("x-accel", "x-sendfile"):
+        etag = etag or f"{os.path.getmtime(path):.0f}-{os.path.getsize(path)}"
+        if request.if_none_match.contains(etag):
+            resp = current_app.response_class(status=304)
+        else:
+            resp = current_app.response_class(mimetype=mimetype)
+            if mode == "x-accel":
+                resp.headers["X-Accel-Redirect"] = config["UPLOAD_ACCEL_PREFIX"].rstrip("/") + "/" + relative
+            else:
+                resp.headers["X-Sendfile"] = path
+            resp.headers["Content-Disposition"] = f"inline; filename={quote(name)}"
+        resp.set_etag(etag)
+        if max_age:
+            resp.cache_control.max_age = max_age
+            resp.cache_control.immutable = True
+            _set_cache_scope(resp, private)
+        else:
+            resp.cache_control.no_cache = True
+        resp.headers["X-Content-Type-Options"] = "nosniff"
+        return resp
+
+    resp = send_file(path, mimetype=mimetype, download_name=name, conditional=True,
+                     etag=etag or True, max_age=max_age)
+    if max_age:
+        resp.cache_control.immutable = True
+        _set_cache_scope(resp, private)
+    resp.headers["X-Content-Type-Options"] = "nosniff"
+    return resp
+
+
+def _set_cache_scope(resp, private: bool) -> None:
+    resp.cache_control.public = not private
+    # None drops the directive; False would be sent as "private=False", which caches read as private
+    resp.cache_control.private = True if private else None
+
+
+@api_bp.get("/derivatives/<preset>/<sha256>")
+def serve_derivative(preset, sha256):
+    """Resized image of an upload (see services.derivatives.PRESETS); the original if it cannot be resized."""
+    config = current_app.config
+    stored = StoredFile.query.filter_by(sha256=sha256).first()
+    if preset not in derivatives.PRESETS or not stored or stored.private:
+        abort(404)
+    source = os.path.join(config["UPLOAD_FOLDER"], blob_path(sha256))
+    if not os.path.isfile(source):
+        abort(404)
+    folder = config["DERIVATIVE_FOLDER"] or os.path.join(config["UPLOAD_FOLDER"], ".derivatives")
+    derived = derivatives.ensure_derivative(source, sha256, preset, folder, config["DERIVATIVE_CACHE_MAX_BYTES"])
+    if derived:
+        path, mimetype = derived
+    else:
+        path, mimetype = source, upload_mimetype(stored.original_name)
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=f"{sha256}-{preset}",
+                     max_age=config["UPLOAD_CACHE_MAX_AGE"])
+    resp.cache_control.immutable = True
+    resp.headers["X-Content-Type-Options"] = "nosniff"
+    return resp
 
 
 @api_bp.get("/contributions")
 def list_contributions():
-    items = Contribution.query.order_by(Contribution.created_at.desc()).limit(20).all()
-    return jsonify([c.to_card() for c in items])
+    """Newest-first contributions feed with keyset pagination.
+
+    Query params: ``cursor`` (from the ``X-Next-Cursor`` response header),
+    ``limit``, ``status``, ``author_id``, ``since`` and ``until`` (ISO dates).
+    """
+    limit = page_size(
+        request.args.get("limit"),
+        current_app.config["CONTRIBUTIONS_PAGE_SIZE"],
+        current_app.config["CONTRIBUTIONS_MAX_PAGE_SIZE"],
+    )
+    query = Contribution.with_author()
+    status = request.args.get("status")
+    if status:
+        query = query.filter(Contribution.status == status)
+    author_id = request.args.get("author_id")
+    if author_id:
+        if not author_id.isdigit():
+            return jsonify({"error": "Invalid author_id"}), 400
+        query = query.filter(Contribution.author_id == int(author_id))
+    try:
+        since = parse_datetime(request.args.get("since"))
+        until = parse_datetime(request.args.get("until"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if since:
+        query = query.filter(Contribution.created_at >= since)
+    if until:
+        query = query.filter(Contribution.created_at < until)
+
+    try:
+        items, next_cursor = keyset_page(query, Contribution, request.args.get("cursor"), limit)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+
+    resp = jsonify(Contribution.serialize_cards(items))
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
 
 
 @api_bp.post("/contributions")
 @jwt_required()
 def create_contribution():
-    uid = int(get_jwt_identity())
-    user = User.query.get(uid)
+    user = db.session.get(User, current_user.id)
     
     # Handle file upload (optional)
     file_url = None
+    content_cid = None
     if "file" in request.files:
         file = request.files["file"]
-        print(f"File received: {file.filename if file else 'None'}")
         if file and file.filename and allowed(file.filename):
             # Save file locally to uploads folder
-            filename = save_upload(file, current_app.config["UPLOAD_FOLDER"])
-            file_url = f"/api/uploads/{filename}"
-            print(f"File saved: {filename}, URL: {file_url}")
+            saved = save_upload(file, current_app.config["UPLOAD_FOLDER"])
+            file_url = saved.url
+            content_cid = compute_cid(saved.path)
+            logger.debug("Contribution file saved: %s, URL: %s, CID: %s", saved.file.sha256, file_url, content_cid)
         else:
-            print(f"File rejected: filename={file.filename if file else 'None'}, allowed={allowed(file.filename) if file and file.filename else False}")
+            logger.info("Contribution file rejected: %r", file.filename if file else None)
     
     title = request.form.get("title") or "Untitled"
     description = request.form.get("description") or ""
@@ -58,230 +188,80 @@ def create_contribution():
         author=user,
         ipfs_cid=None,  # Will be set after admin approval
         file_url=file_url,  # Local file path
+        content_cid=content_cid,
         reward_amount=0.0,
         status="Pending"  # Default status
     )
+    author = user.to_dict()
     db.session.add(contrib)
     db.session.commit()
 
-    contrib_detail = contrib.to_detail()
-    print(f"Contribution created with file_url: {contrib_detail.get('file_url')}")
-    socketio.emit("new_contribution", contrib.to_card())
+    contrib_detail = contrib.to_detail(author=author)
+    logger.debug("Contribution %s created with file_url %s", contrib.id, file_url)
+    feed.contribution_created(contrib)
     return jsonify(contrib_detail), 201
 
 
 @api_bp.get("/contributions/<int:cid>")
 def get_contribution(cid: int):
-    c = Contribution.query.get_or_404(cid)
+    c = Contribution.with_author().get_or_404(cid)
     return jsonify(c.to_detail())
 
 
 @api_bp.get("/ipfs/status")
 def ipfs_status():
-    """Health check for Pinata credentials/auth."""
-    status = test_pinata_auth()
+    """Health check for Pinata credentials/auth (cached; ``?refresh=1`` forces a probe)."""
+    status = pinata_auth_status(force=request.args.get("refresh") in ("1", "true", "True"))
     code = 200 if status.get("ok") else 500
     return jsonify(status), code
 
 
 @api_bp.post("/contributions/<int:cid>/review")
-@jwt_required()
+@admin_required
 def review_contribution(cid: int):
-    # Admin only: accept or reject
-    uid = int(get_jwt_identity())
-    from backend.models.user import User  # local import to avoid cycle
-    user = User.query.get(uid)
-    if not user or user.role != "admin":
-        return jsonify({"error": "Forbidden"}), 403
-
     data = request.get_json() or {}
     action = (data.get("action") or "").lower()
     if action not in {"accept", "reject"}:
         return jsonify({"error": "Invalid action"}), 400
 
-    c = Contribution.query.get_or_404(cid)
+    c = Contribution.with_author().get_or_404(cid)
     
     if action == "reject":
         # Simply update status to Rejected
         c.status = "Rejected"
         db.session.commit()
+        feed.status_changed(cid, c.status)
         
-        # Send notification to user
-        socketio.emit("contribution_reviewed", {
+        # Notify the author (and other admins)
+        realtime.emit_to_user("contribution_reviewed", {
             "id": cid, 
             "status": c.status,
             "message": "Your contribution was rejected by the admin.",
             "userId": c.author_id
-        })
+        }, c.author_id)
         
         return jsonify({"status": "ok", "newStatus": c.status, "message": "Contribution rejected"})
     
-    elif action == "accept":
-        # Upload to IPFS and blockchain
-        try:
-            print(f"[Approval] Starting approval for contribution {cid}")
-            
-            # Validate Pinata credentials before trying to upload
-            print(f"[Approval] Testing Pinata authentication...")
-            auth_status = test_pinata_auth()
-            if not auth_status.get("ok"):
-                error_msg = f"Pinata authentication failed: {auth_status}"
-                print(f"[Approval] ERROR: {error_msg}")
-                return jsonify({
-                    "error": "IPFS upload failed",
-                    "details": auth_status,
-                }), 500
-            
-            print(f"[Approval] Pinata authentication successful")
-            
-            # Get local file path - handle both cases where file_url might be None or a full URL
-            local_path = None
-            if c.file_url:
-                # Extract filename from URL path like "/api/uploads/filename.jpg"
-                filename = os.path.basename(c.file_url)
-                local_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
-                print(f"[Approval] File URL: {c.file_url}, Resolved path: {local_path}")
-                
-                # Check if file exists
-                if not os.path.exists(local_path):
-                    print(f"[Approval] WARNING: File not found at {local_path}")
-                    # Try to continue without file upload
-                    local_path = None
-                else:
-                    print(f"[Approval] File found at {local_path}")
-            
-            # Upload to IPFS via Pinata (only if file exists)
-            ipfs_metadata = None
-            if local_path and os.path.exists(local_path):
-                # Extract original filename from file_url (e.g., "/api/uploads/myfile.pdf" -> "myfile.pdf")
-                # Also get the actual filename from the local file system as a backup
-                original_filename = None
-                if c.file_url:
-                    original_filename = os.path.basename(c.file_url)
-                    print(f"[Approval] File URL: {c.file_url}")
-                    print(f"[Approval] Extracted filename from URL: {original_filename}")
-                
-                # Also get filename from local_path as verification
-                actual_filename = os.path.basename(local_path)
-                print(f"[Approval] Actual filename from local path: {actual_filename}")
-                
-                # Use the extracted filename (should be the same as actual_filename)
-                # Fallback to actual_filename if original_filename is empty
-                pinata_filename = original_filename or actual_filename or f"contribution_{cid}"
-                
-                print(f"[Approval] Using Pinata filename: {pinata_filename}")
-                print(f"[Approval] Uploading file to Pinata: {local_path} with name: {pinata_filename}")
-                ipfs_metadata = upload_file_to_pinata(local_path, name=pinata_filename)
-                print(f"[Approval] Pinata upload completed successfully! File saved as: {pinata_filename}")
-            else:
-                print(f"[Approval] No file to upload for contribution {cid}, creating text entry")
-                # Create a text-based IPFS entry for contributions without files
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as tmp:
-                    tmp.write(f"Contribution: {c.title}\nDescription: {c.description}\nAuthor: {c.author.email}")
-                    tmp_path = tmp.name
-                # Use contribution title as filename if available
-                text_filename = f"{c.title}.txt" if c.title else f"contribution_{cid}_text.txt"
-                print(f"[Approval] Uploading text entry to Pinata: {tmp_path} with name: {text_filename}")
-                ipfs_metadata = upload_file_to_pinata(tmp_path, name=text_filename)
-                os.unlink(tmp_path)  # Clean up temp file
-                print(f"[Approval] Text entry uploaded successfully!")
-            
-            # Store on blockchain (optional - can be skipped if Ganache is not running)
-            tx_hash = None
-            ipfs_hash = ipfs_metadata.get("cid") if ipfs_metadata else None
-            if ipfs_hash:
-                try:
-                    with open(Config.CONTRACT_ABI_PATH, "r") as f:
-                        data = json.load(f)
-                    abi = data["abi"]
-                    address = Config.CONTRACT_ADDRESS or data.get("address")
-                    if address and Config.DEPLOYER_PRIVATE_KEY:
-                        print(f"[Blockchain] Attempting to save IPFS hash to blockchain...")
-                        w3 = Web3(Web3.HTTPProvider(Config.GANACHE_URL))
-                        
-                        # Check if Ganache is running
-                        try:
-                            w3.eth.get_block('latest')
-                            print(f"[Blockchain] Ganache connection successful")
-                        except Exception as conn_err:
-                            raise ConnectionError(f"Ganache is not running at {Config.GANACHE_URL}. Please start Ganache to enable blockchain transactions. IPFS upload completed successfully.")
-                        
-                        acct = w3.eth.account.from_key(Config.DEPLOYER_PRIVATE_KEY)
-                        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
-                        nonce = w3.eth.get_transaction_count(acct.address)
-                        tx = contract.functions.saveHash(ipfs_hash).build_transaction({
-                            "from": acct.address,
-                            "nonce": nonce,
-                            "gas": 300000,
-                            "maxFeePerGas": w3.to_wei("2", "gwei"),
-                            "maxPriorityFeePerGas": w3.to_wei("1", "gwei"),
-                            "chainId": w3.eth.chain_id,
-                        })
-                        signed = acct.sign_transaction(tx)
-                        txh = w3.eth.send_raw_transaction(signed.rawTransaction)
-                        tx_hash = txh.hex()
-                        print(f"[Blockchain] Transaction successful: {tx_hash}")
-                except ConnectionError as ce:
-                    print(f"[Blockchain] {str(ce)}")
-                    # Continue without blockchain - IPFS is enough
-                except Exception as e:
-                    print(f"[Blockchain] Transaction failed: {e}")
-                    print(f"[Blockchain] Note: IPFS upload completed successfully. Blockchain is optional.")
-                    # Continue without blockchain - IPFS is enough
-            
-            # Update contribution with IPFS metadata, approved status, and reward amount
-            print(f"[Approval] Saving IPFS hash to database: {ipfs_hash}")
-            c.ipfs_cid = ipfs_hash
-            if ipfs_metadata:
-                c.ipfs_file_size = ipfs_metadata.get("size")
-                c.ipfs_pin_timestamp = ipfs_metadata.get("timestamp")
-                print(f"[Approval] IPFS metadata: size={c.ipfs_file_size}, timestamp={c.ipfs_pin_timestamp}")
-            c.status = "Accepted"
-            c.reward_amount = 100.00  # Set reward to 100.00 tokens
-            
-            # Add reward tokens to user's balance
-            c.author.cnri_balance = (c.author.cnri_balance or 0.0) + 100.00
-            
-            db.session.commit()
-            print(f"[Approval] Contribution {cid} updated in database with IPFS CID: {ipfs_hash}")
-            
-            # Send notification to user with reward info
-            socketio.emit("contribution_reviewed", {
-                "id": cid, 
-                "status": c.status,
-                "message": f"Your contribution has been approved! You earned 100.00 CTRI tokens. New balance: {c.author.cnri_balance:.2f} CTRI",
-                "ipfsHash": ipfs_hash,
-                "txHash": tx_hash,
-                "userId": c.author_id,
-                "rewardAmount": 100.00,
-                "newBalance": c.author.cnri_balance
-            })
-            
-            # Return success response with Pinata verification links
-            pinata_url = f"https://app.pinata.cloud/pinmanager"
-            ipfs_gateway_url = f"https://ipfs.io/ipfs/{ipfs_hash}" if ipfs_hash else None
-            
-            return jsonify({
-                "status": "ok", 
-                "newStatus": c.status, 
-                "message": f"Contribution approved! Rewarded 100.00 CTRI tokens.",
-                "ipfsHash": ipfs_hash,
-                "ipfsGatewayUrl": ipfs_gateway_url,
-                "pinataDashboardUrl": pinata_url,
-                "txHash": tx_hash,
-                "rewardAmount": 100.00,
-                "userBalance": c.author.cnri_balance,
-                "uploadedFileName": ipfs_metadata.get("name") if ipfs_metadata else None,
-                "uploadedFileSize": ipfs_metadata.get("size") if ipfs_metadata else None,
-            })
-            
-        except Exception as e:
-            # Surface clearer errors for missing/invalid Pinata credentials
-            msg = str(e)
-            if "Pinata" in msg or "credentials" in msg:
-                return jsonify({"error": "IPFS upload failed", "details": msg}), 500
-            return jsonify({"error": f"Failed to process approval: {msg}"}), 500
+    # Accept: pinning and chain anchoring run on the approval worker pool
+    try:
+        job = approvals.enqueue(c, requested_by=current_user.id)
+    except approvals.AlreadyAccepted as e:
+        return jsonify({"error": str(e)}), 409
+    resp = jsonify({
+        "status": "queued",
+        "jobId": job.id,
+        "job": job.to_dict(),
+        "message": "Approval queued",
+    })
+    resp.headers["Location"] = f"/api/approval-jobs/{job.id}"
+    return resp, 202
+
+
+@api_bp.get("/approval-jobs/<int:job_id>")
+@admin_required
+def get_approval_job(job_id: int):
+    job = ApprovalJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
 
 
 @api_bp.post("/contributions/<int:cid>/claim-reward")
@@ -291,31 +271,20 @@ def claim_reward(cid: int):
     # Minimal on-chain transfer using deployer key (demo). Amount fixed/mock.
     amount = int((c.reward_amount or 1.0) * 10**18)
     try:
-        with open(Config.CONTRACT_ABI_PATH, "r") as f:
-            data = json.load(f)
-        abi = data["abi"]
-        address = Config.CONTRACT_ADDRESS or data.get("address")
-        if not address:
-            return jsonify({"error": "Contract not deployed"}), 400
-        w3 = Web3(Web3.HTTPProvider(Config.GANACHE_URL))
-        acct = w3.eth.account.from_key(Config.DEPLOYER_PRIVATE_KEY)
-        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
-        nonce = w3.eth.get_transaction_count(acct.address)
-        tx = contract.functions.transfer(acct.address, amount).build_transaction({
-            "from": acct.address,
-            "nonce": nonce,
-            "gas": 200000,
-            "maxFeePerGas": w3.to_wei("2", "gwei"),
-            "maxPriorityFeePerGas": w3.to_wei("1", "gwei"),
-            "chainId": w3.eth.chain_id,
-        })
-        signed = acct.sign_transaction(tx)
-        txh = w3.eth.send_raw_transaction(signed.rawTransaction)
-        tx_hash = txh.hex()
+        contract = chain.contract()
+        tx_hash = chain.transact(contract.functions.transfer(chain.account.address, amount), gas=200000)
+    except ContractNotDeployed as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    receipts.track(tx_hash, "reward", contribution_id=cid, user_id=c.author_id)
+    db.session.commit()
 
-    socketio.emit("token_transferred", {"contributionId": cid, "txHash": tx_hash, "amount": c.reward_amount})
+    realtime.emit_to_user(
+        "token_transferred",
+        {"contributionId": cid, "txHash": tx_hash, "amount": c.reward_amount, "userId": c.author_id},
+        c.author_id,
+    )
     return jsonify({"status": "ok", "txHash": tx_hash})
 
 
@@ -330,9 +299,11 @@ def upload_and_store_hash():
         return jsonify({"error": "Invalid file"}), 400
 
     # Save to persistent uploads folder
-    filename = save_upload(file, current_app.config["UPLOAD_FOLDER"])
-    local_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
-    file_url = f"/api/uploads/{filename}"
+    saved = save_upload(file, current_app.config["UPLOAD_FOLDER"])
+    db.session.commit()
+    filename = os.path.basename(saved.url)
+    local_path = saved.path
+    file_url = saved.url
 
     # Upload to IPFS via Pinata
     try:
@@ -355,29 +326,15 @@ def upload_and_store_hash():
 
     # Send to smart contract (saveHash) using backend signer
     try:
-        with open(Config.CONTRACT_ABI_PATH, "r") as f:
-            data = json.load(f)
-        abi = data["abi"]
-        address = Config.CONTRACT_ADDRESS or data.get("address")
-        if not address:
-            return jsonify({"error": "Contract not deployed"}), 400
-        w3 = Web3(Web3.HTTPProvider(Config.GANACHE_URL))
-        acct = w3.eth.account.from_key(Config.DEPLOYER_PRIVATE_KEY)
-        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
-        nonce = w3.eth.get_transaction_count(acct.address)
-        tx = contract.functions.saveHash(ipfs_hash).build_transaction({
-            "from": acct.address,
-            "nonce": nonce,
-            "gas": 300000,
-            "maxFeePerGas": w3.to_wei("2", "gwei"),
-            "maxPriorityFeePerGas": w3.to_wei("1", "gwei"),
-            "chainId": w3.eth.chain_id,
-        })
-        signed = acct.sign_transaction(tx)
-        txh = w3.eth.send_raw_transaction(signed.rawTransaction)
-        tx_hash = txh.hex()
+        contract = chain.contract()
+        tx_hash = chain.transact(contract.functions.saveHash(ipfs_hash), gas=300000)
+    except ContractNotDeployed as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Blockchain tx failed: {str(e)}"}), 500
+    identity = get_jwt_identity()
+    receipts.track(tx_hash, "upload", user_id=int(identity) if identity else None)
+    db.session.commit()
 
     return jsonify({
         "status": "success", 
@@ -1,13 +1,19 @@
+import logging
 from flask import request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import current_user, jwt_required
 from sqlalchemy import func
 from backend.extensions import db
 from backend.api import api_bp
 from backend.models.user import User
 from backend.models.kyc_document import KycDocument
-from backend.services.storage import save_upload
+from backend.services import realtime
+from backend.services.storage import release_upload, save_upload
+from backend.utils.auth_utils import admin_required
+from backend.utils.pagination import InvalidCursor, keyset_page, page_size
 import os
 
+logger = logging.getLogger(__name__)
+
 
 @api_bp.route("/kyc/upload", methods=["POST", "OPTIONS"])
 @jwt_required(optional=True)
@@ -19,24 +25,10 @@ def upload_kyc():
     try:
         # Get verified email from form data first
         verified_email = request.form.get("verified_email", "").strip()
-        print(f"[KYC Upload] Verified email from form: '{verified_email}'")
-        print(f"[KYC Upload] All form keys: {list(request.form.keys())}")
-        
-        # Try to get user ID from JWT token first
-        uid = get_jwt_identity()
-        user = None
+        logger.debug("KYC upload: verified email from form %r, form keys %s", verified_email, list(request.form.keys()))
         
-        if uid:
-            try:
-                uid = int(uid)
-                user = User.query.get(uid)
-                if user:
-                    print(f"[KYC Upload] User from JWT: ID={uid}, Email={user.email}")
-                else:
-                    print(f"[KYC Upload] JWT user not found: ID={uid}")
-            except Exception as e:
-                print(f"[KYC Upload] JWT error: {e}")
-                uid = None
+        # Try the logged-in user first
+        user = db.session.get(User, current_user.id) if current_user else None
         
         # If no user from JWT but email is verified, try to find user by email (case-insensitive)
         if not user and verified_email:
@@ -45,24 +37,15 @@ def upload_kyc():
             if not user:
                 # Try case-insensitive lookup
                 user = User.query.filter(func.lower(User.email) == func.lower(verified_email)).first()
-            
-            if user:
-                uid = user.id
-                print(f"[KYC Upload] User found by email: ID={uid}, Email={user.email}")
-            else:
-                print(f"[KYC Upload] No user found with email: '{verified_email}'")
-                # List all user emails for debugging
-                all_users = User.query.all()
-                print(f"[KYC Upload] All user emails in DB: {[u.email for u in all_users]}")
         
         # If still no user, return error
         if not user:
             error_msg = f"User not found. Verified email: '{verified_email}'. Please make sure you're logged in with the same email."
-            print(f"[KYC Upload] {error_msg}")
+            logger.info("KYC upload: no user for verified email %r", verified_email)
             return jsonify({"error": error_msg}), 401
         
         uid = user.id
-        print(f"[KYC Upload] Processing upload for User ID: {uid}, Email: {user.email}")
+        logger.debug("KYC upload for user %s", uid)
         
         # Check if file is provided
         if "file" not in request.files:
@@ -96,10 +79,9 @@ def upload_kyc():
         
         # Save file
         try:
-            filename = save_upload(file, upload_folder)
-            file_url = f"/api/uploads/{filename}"
+            file_url = save_upload(file, upload_folder, private=True).url
         except Exception as e:
-            print(f"[KYC Upload] Error saving file: {e}")
+            logger.error("KYC upload: error saving file: %s", e)
             return jsonify({"error": f"Failed to save file: {str(e)}"}), 500
         
         # Create or update KYC document
@@ -113,6 +95,8 @@ def upload_kyc():
             )
             db.session.add(kyc_doc)
         else:
+            # save_upload took a new reference even if the URL is unchanged
+            release_upload(kyc_doc.file_url, upload_folder)
             kyc_doc.file_url = file_url
             kyc_doc.status = "Pending"
             kyc_doc.verified_email = verified_email
@@ -124,8 +108,10 @@ def upload_kyc():
             db.session.commit()
         except Exception as e:
             db.session.rollback()
-            print(f"[KYC Upload] Database error: {e}")
+            logger.error("KYC upload: database error: %s", e)
             return jsonify({"error": f"Database error: {str(e)}"}), 500
+
+        realtime.emit_to_admins("kyc_submitted", kyc_doc.to_dict())
         
         return jsonify({
             "status": "success", 
@@ -133,72 +119,81 @@ def upload_kyc():
             "kyc": kyc_doc.to_dict()
         })
     except Exception as e:
-        print(f"[KYC Upload] Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("KYC upload failed")
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
 
 @api_bp.route("/kyc/status", methods=["GET"])
 @jwt_required()
 def get_kyc_status():
-    uid = int(get_jwt_identity())
-    user = User.query.get_or_404(uid)
-    kyc_doc = KycDocument.query.filter_by(user_id=uid).first()
+    kyc_doc = KycDocument.query.filter_by(user_id=current_user.id).first()
     
     return jsonify({
-        "kycVerified": bool(user.kyc_verified),
+        "kycVerified": current_user.kyc_verified,
         "kycStatus": kyc_doc.status if kyc_doc else "None",
         "kycDocument": kyc_doc.to_dict() if kyc_doc else None
     })
 
 
 @api_bp.route("/kyc/admin/list", methods=["GET"])
-@jwt_required()
+@admin_required
 def list_kyc_requests():
-    uid = int(get_jwt_identity())
-    user = User.query.get_or_404(uid)
-    if user.role != "admin":
-        return jsonify({"error": "Forbidden"}), 403
-    
-    # Get status filter from query params (default: all)
+    """Newest-first KYC queue with keyset pagination.
+
+    Query params: ``status``, ``limit`` and ``cursor`` (from the
+    ``X-Next-Cursor`` response header).
+    """
+    limit = page_size(
+        request.args.get("limit"),
+        current_app.config["KYC_PAGE_SIZE"],
+        current_app.config["KYC_MAX_PAGE_SIZE"],
+    )
+    query = KycDocument.with_user()
     status_filter = request.args.get("status")
-    query = KycDocument.query
     if status_filter:
-        query = query.filter_by(status=status_filter)
-    
-    kyc_docs = query.order_by(KycDocument.created_at.desc()).all()
-    return jsonify([doc.to_dict() for doc in kyc_docs])
+        query = query.filter(KycDocument.status == status_filter)
+
+    try:
+        kyc_docs, next_cursor = keyset_page(query, KycDocument, request.args.get("cursor"), limit)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+
+    resp = jsonify([doc.to_dict() for doc in kyc_docs])
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
+
+
+@api_bp.route("/kyc/admin/counts", methods=["GET"])
+@admin_required
+def count_kyc_requests():
+    """Number of KYC documents per status, plus ``total``."""
+    rows = db.session.query(KycDocument.status, func.count()).group_by(KycDocument.status).all()
+    counts = {status or "None": count for status, count in rows}
+    counts["total"] = sum(count for _, count in rows)
+    return jsonify(counts)
 
 
 @api_bp.route("/kyc/admin/approve/<int:kyc_id>", methods=["POST"])
-@jwt_required()
+@admin_required
 def approve_kyc(kyc_id):
-    uid = int(get_jwt_identity())
-    user = User.query.get_or_404(uid)
-    if user.role != "admin":
-        return jsonify({"error": "Forbidden"}), 403
-    
     kyc_doc = KycDocument.query.get_or_404(kyc_id)
     kyc_doc.status = "Verified"
     kyc_doc.user.kyc_verified = True
     db.session.commit()
+    realtime.emit_to_user("kyc_status", kyc_doc.to_dict(), kyc_doc.user_id)
     
     return jsonify({"status": "success", "message": "KYC approved", "kyc": kyc_doc.to_dict()})
 
 
 @api_bp.route("/kyc/admin/reject/<int:kyc_id>", methods=["POST"])
-@jwt_required()
+@admin_required
 def reject_kyc(kyc_id):
-    uid = int(get_jwt_identity())
-    user = User.query.get_or_404(uid)
-    if user.role != "admin":
-        return jsonify({"error": "Forbidden"}), 403
-    
     kyc_doc = KycDocument.query.get_or_404(kyc_id)
     kyc_doc.status = "Rejected"
     kyc_doc.user.kyc_verified = False
     db.session.commit()
+    realtime.emit_to_user("kyc_status", kyc_doc.to_dict(), kyc_doc.user_id)
     
     return jsonify({"status": "success", "message": "KYC rejected", "kyc": kyc_doc.to_dict()})
 
@@ -1,9 +1,9 @@
 from flask import request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import current_user, jwt_required
 from backend.extensions import db
 from backend.api import api_bp
 from backend.models.user import User
-from backend.services.storage import save_upload
+from backend.services.storage import release_upload, save_upload
 import os
 import random
 
@@ -17,10 +17,9 @@ def get_profile(user_id: int):
 @api_bp.put("/profile/<int:user_id>")
 @jwt_required()
 def update_profile(user_id: int):
-    uid = int(get_jwt_identity())
-    if uid != user_id:
+    if current_user.id != user_id:
         return jsonify({"error": "Forbidden"}), 403
-    user = User.query.get_or_404(user_id)
+    user = db.session.get(User, user_id)
     data = request.get_json() or {}
     user.name = data.get("name", user.name)
     user.avatar_url = data.get("avatarUrl", user.avatar_url)
@@ -36,11 +35,9 @@ def update_profile(user_id: int):
 def kyc_start():
     if request.method == "OPTIONS":
         return ("", 204)
-    uid = get_jwt_identity()
-    if uid is None:
+    if not current_user:
         return jsonify({"error": "Unauthorized"}), 401
-    uid = int(uid)
-    user = User.query.get_or_404(uid)
+    user = db.session.get(User, current_user.id)
     data = request.get_json() or {}
     aadhaar = (data.get("aadhaar") or "").strip()
     if not aadhaar.isdigit() or len(aadhaar) not in (12,):
@@ -66,11 +63,9 @@ def kyc_start():
 def kyc_verify():
     if request.method == "OPTIONS":
         return ("", 204)
-    uid = get_jwt_identity()
-    if uid is None:
+    if not current_user:
         return jsonify({"error": "Unauthorized"}), 401
-    uid = int(uid)
-    user = User.query.get_or_404(uid)
+    user = db.session.get(User, current_user.id)
     data = request.get_json() or {}
     otp = (data.get("otp") or "").strip()
     aadhaar = (data.get("aadhaar") or "").strip()
@@ -102,19 +97,19 @@ def kyc_verify():
 def upload_avatar():
     if request.method == "OPTIONS":
         return ("", 204)
-    uid = get_jwt_identity()
-    if uid is None:
+    if not current_user:
         return jsonify({"error": "Unauthorized"}), 401
-    uid = int(uid)
-    user = User.query.get_or_404(uid)
+    user = db.session.get(User, current_user.id)
     if "file" not in request.files:
         return jsonify({"error": "No file provided"}), 400
     file = request.files["file"]
     if not file or not file.filename:
         return jsonify({"error": "Invalid file"}), 400
 
-    filename = save_upload(file, current_app.config["UPLOAD_FOLDER"])
-    user.avatar_url = f"/api/uploads/{filename}"
+    saved = save_upload(file, current_app.config["UPLOAD_FOLDER"])
+    # save_upload took a new reference even if the URL is unchanged
+    release_upload(user.avatar_url, current_app.config["UPLOAD_FOLDER"])
+    user.avatar_url = saved.url
     db.session.commit()
     return jsonify({"status": "ok", "avatarUrl": user.avatar_url})
 
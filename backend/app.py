@@ -1,32 +1,54 @@
 import os
 import sys
+import logging
 
 # Ensure project root is on sys.path so 'backend.*' imports work when running from the backend dir
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from backend.extensions import db, migrate, jwt, socketio
-from sqlalchemy import text
 from dotenv import load_dotenv
 
 # Extensions are created in backend.extensions
 
+logger = logging.getLogger("backend.app")
 
-def create_app():
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def create_app(test_config=None):
     load_dotenv()
     app = Flask(__name__)
     app.config.from_object("backend.config.Config")
+    if test_config:
+        app.config.update(test_config)
+    from backend.utils.log import configure_logging
+    configure_logging(app)
     # Force Flask to run on localhost:5000 if run directly by user request
     app.config["SERVER_NAME"] = None
-
-    CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": "*"}})
+    from backend.utils.database import database_uri, engine_options, install_sqlite_pragmas
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri(app.config["SQLALCHEMY_DATABASE_URI"])
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+
+    CORS(
+        app,
+        supports_credentials=True,
+        resources={r"/api/*": {"origins": "*"}},
+        expose_headers=["X-Next-Cursor", "Location"],
+    )
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config)  # Creates the engine only; no connection yet
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     jwt.init_app(app)
-    socketio.init_app(app, async_mode="threading")
+    from backend.services.socket_queue import socketio_options
+    socketio.init_app(app, **socketio_options(app.config))
     
     # JWT error handlers
     @jwt.expired_token_loader
@@ -35,18 +57,30 @@ def create_app():
     
     @jwt.invalid_token_loader
     def invalid_token_callback(error):
-        print(f"[JWT] Invalid token error: {error}")
+        logger.info("Invalid token: %s", error)
         return jsonify({"error": "Invalid token", "message": str(error)}), 401
     
     @jwt.unauthorized_loader
     def missing_token_callback(error):
-        print(f"[JWT] Missing token error: {error}")
+        logger.debug("Missing token: %s", error)
         return jsonify({"error": "Authorization required", "message": "Please login"}), 401
 
+    @jwt.user_lookup_error_loader
+    def user_lookup_error_callback(jwt_header, jwt_payload):
+        return jsonify({"error": "User not found", "message": "Please login again"}), 401
+
+    from backend.utils import auth_utils
+    auth_utils.init_app(app)
+
     from backend.models import user as user_model  # noqa: F401
     from backend.models import contribution as contribution_model  # noqa: F401
     from backend.models import token as token_model  # noqa: F401
     from backend.models import kyc_document as kyc_document_model  # noqa: F401
+    from backend.models import approval_job as approval_job_model  # noqa: F401
+    from backend.models import anchor_batch as anchor_batch_model  # noqa: F401
+    from backend.models import chain_transaction as chain_transaction_model  # noqa: F401
+    from backend.models import hash_anchor as hash_anchor_model  # noqa: F401
+    from backend.models import stored_file as stored_file_model  # noqa: F401
 
     from backend.api import api_bp, init_api
     init_api()
@@ -61,76 +95,40 @@ def create_app():
     def health():
         return jsonify({"status": "ok"})
 
-    # Ensure tables exist (SQLAlchemy only)
-    with app.app_context():
-        try:
-            db.create_all()
-        except Exception:
-            pass
-
-        # SQLite-safe lightweight migration: ensure KYC columns on users table
-        try:
-            engine = db.engine
-            # Detect existing columns
-            with engine.connect() as conn:
-                result = conn.execute(text("PRAGMA table_info(users)"))
-                cols = {row[1] for row in result}
-                statements = []
-                if "kyc_verified" not in cols:
-                    statements.append("ALTER TABLE users ADD COLUMN kyc_verified BOOLEAN DEFAULT 0")
-                if "kyc_aadhaar_last4" not in cols:
-                    statements.append("ALTER TABLE users ADD COLUMN kyc_aadhaar_last4 VARCHAR(4)")
-                for stmt in statements:
-                    try:
-                        conn.execute(text(stmt))
-                        conn.commit()
-                    except Exception:
-                        conn.rollback()
-                        pass
-                
-                # Ensure IPFS metadata columns on contributions table
-                result = conn.execute(text("PRAGMA table_info(contributions)"))
-                contrib_cols = {row[1] for row in result}
-                if "ipfs_file_size" not in contrib_cols:
-                    conn.execute(text("ALTER TABLE contributions ADD COLUMN ipfs_file_size INTEGER"))
-                    conn.commit()
-                    print("[App] Added ipfs_file_size column to contributions table")
-                if "ipfs_pin_timestamp" not in contrib_cols:
-                    conn.execute(text("ALTER TABLE contributions ADD COLUMN ipfs_pin_timestamp VARCHAR(50)"))
-                    conn.commit()
-                    print("[App] Added ipfs_pin_timestamp column to contributions table")
-            
-            # Ensure kyc_documents table exists and has verified_email column
-            try:
-                db.create_all()
-                # Check if kyc_documents table exists and add verified_email column if missing
-                try:
-                    with engine.connect() as conn:
-                        result = conn.execute(text("PRAGMA table_info(kyc_documents)"))
-                        kyc_cols = {row[1] for row in result}
-                        if "verified_email" not in kyc_cols:
-                            conn.execute(text("ALTER TABLE kyc_documents ADD COLUMN verified_email VARCHAR(255)"))
-                            conn.commit()
-                            print("[App] Added verified_email column to kyc_documents table")
-                except Exception as e:
-                    # Table might not exist yet, db.create_all should handle it
-                    print(f"[App] Could not check kyc_documents table: {e}")
-                
-                print("[App] Database tables ensured")
-            except Exception as e:
-                print(f"[App] Database check: {e}")
-        except Exception:
-            # Best-effort; if this fails, migrations can handle it
-            pass
+    from backend.services import metrics
+    metrics.init_app(app)
+
+    @app.get("/api/metrics")
+    def prometheus_metrics():
+        token = app.config["METRICS_TOKEN"]
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return jsonify({"error": "Forbidden"}), 403
+        return metrics.render(), 200, {"Content-Type": metrics.CONTENT_TYPE}
+
+    if not app.testing:
+        # Tests build their schema with db.create_all()
+        from backend.utils.schema import check_schema
+        check_schema(app)
+
+    from backend.services import approvals, anchoring, receipts, indexer, realtime, feed
+    realtime.init_app(app)
+    feed.init_app(app)
+    approvals.init_app(app)
+
+    if app.config["BACKGROUND_SERVICES"] and not app.testing:
+        anchoring.init_app(app)
+        receipts.init_app(app)
+        indexer.init_app(app)
+        from backend.services.storage import start_pinata_auth_refresher
+        start_pinata_auth_refresher()
 
     return app
 
 
-app = create_app()
-
-
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "5001"))
+    # The development server brings the schema up to date itself
+    app = create_app({"SCHEMA_CHECK": os.getenv("SCHEMA_CHECK", "upgrade")})
     socketio.run(app, host="0.0.0.0", port=port)
 
 
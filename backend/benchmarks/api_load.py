@@ -0,0 +1,329 @@
+"""Concurrent load test of the API hot paths against local stand-ins.
+
+Seeds ``--users`` users and ``--contributions`` contributions into a fresh
+SQLite database, serves the app on a local port and drives each scenario
+with ``--concurrency`` client threads:
+
+    list     GET  /api/contributions (plain, by status, by author)
+    create   POST /api/contributions (multipart with a small file)
+    review   POST /api/contributions/<id>/review (accept; the approval job
+             pins to a Pinata stub and anchors on an in-process eth-tester
+             chain, and its completion time is reported separately)
+    login    POST /api/auth/login
+
+The chain runs a stand-in contract that accepts every call, so anchoring
+measures signing, nonce management and RPC rather than contract gas.
+
+    python -m backend.benchmarks.api_load --requests 500 --concurrency 16
+    python -m backend.benchmarks.api_load --baseline bench.json --save-baseline
+    python -m backend.benchmarks.api_load --baseline bench.json   # exits 1 on regressions
+
+Prints one JSON document with requests/s and p50/p95/p99 per scenario.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from backend.benchmarks.common import compare, environment, load_baseline, percentile, save_baseline, summarize
+
+PASSWORD = "bench-password"
+SCENARIOS = ("list", "create", "review", "login")
+STATUSES = ("Pending", "Accepted", "Rejected")
+
+# Deploys a contract whose runtime code is a single STOP: every call succeeds
+STUB_CONTRACT_BYTECODE = "0x6001600c60003960016000f300"
+STUB_CONTRACT_ABI = [
+    {"type": "function", "name": "saveHash", "stateMutability": "nonpayable",
+     "inputs": [{"name": "ipfsHash", "type": "string"}], "outputs": []},
+    {"type": "function", "name": "saveRoot", "stateMutability": "nonpayable",
+     "inputs": [{"name": "root", "type": "bytes32"}, {"name": "size", "type": "uint256"}],
+     "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "transfer", "stateMutability": "nonpayable",
+     "inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}],
+     "outputs": [{"name": "", "type": "bool"}]},
+]
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextmanager
+def _patched(obj, **attrs):
+    saved = {name: getattr(obj, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(obj, name, value)
+
+
+def _tester_provider():
+    """eth-tester provider serialised with a lock (py-evm is not thread-safe)."""
+    from eth_tester import EthereumTester
+    from web3 import EthereumTesterProvider
+
+    class LockedTesterProvider(EthereumTesterProvider):
+        _lock = threading.Lock()
+
+        def make_request(self, method, params):
+            with self._lock:
+                return super().make_request(method, params)
+
+    tester = EthereumTester()
+    return LockedTesterProvider(tester), tester.backend.account_keys[0].to_hex()
+
+
+def _deploy_stub_contract(workdir: str) -> str:
+    """Deploy the stand-in contract with the current chain client; returns the ABI file path."""
+    from backend.services.chain import chain
+
+    w3 = chain.w3
+    tx_hash = chain.send_transaction({"data": STUB_CONTRACT_BYTECODE, "gas": 100000})
+    address = w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+    path = os.path.join(workdir, "contract.json")
+    with open(path, "w") as f:
+        json.dump({"address": address, "abi": STUB_CONTRACT_ABI}, f)
+    return path
+
+
+def _seed(users: int, contributions: int) -> None:
+    from backend.extensions import db
+    from backend.models.contribution import Contribution
+    from backend.models.user import User
+    from backend.services.passwords import hash_password
+
+    password_hash = hash_password(PASSWORD)  # One hash shared by every seeded user
+    db.session.execute(db.insert(User), [
+        {"id": i, "name": f"User {i}", "email": f"user{i}@bench.local", "password_hash": password_hash,
+         "role": "admin" if i == 1 else "user"}
+        for i in range(1, users + 1)
+    ])
+    rng = random.Random(7)
+    base = datetime.utcnow() - timedelta(days=30)
+    db.session.execute(db.insert(Contribution), [
+        {"title": f"Contribution {i}", "description": "benchmark", "author_id": rng.randint(2, max(2, users)),
+         # Every other row stays pending so the review scenario has work
+         "status": "Pending" if i % 2 == 0 else STATUSES[rng.randrange(1, 3)],
+         "created_at": base + timedelta(seconds=i)}
+        for i in range(contributions)
+    ])
+    db.session.commit()
+
+
+def _drive(total: int, concurrency: int, call: Callable) -> Dict[str, float]:
+    """Run ``call(session, i)`` for i in range(total) on ``concurrency`` threads."""
+    import requests
+
+    counter = itertools.count()
+    lock = threading.Lock()
+    durations: List[float] = []
+    errors = [0]
+
+    def worker():
+        session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter)
+            if i >= total:
+                return
+            start = time.perf_counter()
+            try:
+                ok = call(session, i).status_code < 400
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                durations.append(elapsed)
+                errors[0] += 0 if ok else 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(durations, time.perf_counter() - started, errors[0])
+
+
+def _watch_jobs(app, review_started: Dict[int, float], driving_done: threading.Event,
+                timeout: float = 300.0) -> Dict[str, float]:
+    """Time from each review request until its approval job is done, polled every 20 ms."""
+    from backend.extensions import db
+    from backend.models.approval_job import ApprovalJob
+
+    finished: Dict[int, float] = {}
+    failed = 0
+    deadline = time.perf_counter() + timeout
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            started = dict(review_started)
+            if driving_done.is_set() and len(finished) >= len(started):
+                break
+            rows = db.session.query(ApprovalJob.contribution_id, ApprovalJob.state).filter(
+                ApprovalJob.contribution_id.in_(list(started)),
+                ApprovalJob.state.in_((ApprovalJob.DONE, ApprovalJob.FAILED)),
+            ).all()
+            now = time.perf_counter()
+            for contribution_id, state in rows:
+                if contribution_id not in finished:
+                    finished[contribution_id] = now - started[contribution_id]
+                    failed += state == ApprovalJob.FAILED
+            db.session.remove()
+            time.sleep(0.02)
+    durations = list(finished.values())
+    return {
+        "jobs": len(review_started),
+        "failed": failed,
+        "unfinished": len(review_started) - len(finished),
+        "p50Ms": round(percentile(durations, 50) * 1000, 2),
+        "p95Ms": round(percentile(durations, 95) * 1000, 2),
+        "p99Ms": round(percentile(durations, 99) * 1000, 2),
+    }
+
+
+def run(users: int, contributions: int, requests_per_scenario: int, concurrency: int,
+        scenarios=SCENARIOS, approval_workers: int = 4) -> Dict:
+    from flask_jwt_extended import create_access_token
+    from flask_migrate import upgrade
+    from backend.app import create_app
+    from backend.config import Config
+    from backend.extensions import db
+    from backend.models.contribution import Contribution
+    from backend.services.chain import chain
+    from backend.services.storage import invalidate_pinata_auth
+    from backend.benchmarks.pinata_stub import PinataStub
+
+    workdir = tempfile.mkdtemp(prefix="contri-bench-")
+    users = max(users, 2)
+    with ExitStack() as stack:
+        pinata = stack.enter_context(PinataStub())
+        provider, deployer_key = _tester_provider()
+        stack.enter_context(_patched(
+            Config, PINATA_BASE_URL=pinata.url, PINATA_API_KEY="bench", PINATA_SECRET_API_KEY="bench",
+            DEPLOYER_PRIVATE_KEY=deployer_key, CONTRACT_ADDRESS="", ANCHOR_MODE="single",
+        ))
+        chain.use_provider(provider)
+        stack.callback(chain.use_provider, None)
+        stack.callback(invalidate_pinata_auth)
+        stack.enter_context(_patched(Config, CONTRACT_ABI_PATH=_deploy_stub_contract(workdir)))
+
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+            "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+            "BACKGROUND_SERVICES": False,
+            "SCHEMA_CHECK": "off",
+            "APPROVAL_WORKERS": approval_workers,
+            "ANCHOR_MODE": "single",
+            "LOG_LEVEL": "WARNING",
+        })
+        stack.callback(lambda: app.extensions["approvals"] and app.extensions["approvals"].shutdown(wait=True))
+        with app.app_context():
+            upgrade()
+            _seed(users, contributions)
+            tokens = [create_access_token(identity=str(i)) for i in range(1, users + 1)]
+            pending = [cid for (cid,) in db.session.query(Contribution.id).filter(
+                Contribution.status == "Pending").order_by(Contribution.id).limit(requests_per_scenario)]
+
+        server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=_QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stack.callback(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_port}/api"
+        admin = {"Authorization": f"Bearer {tokens[0]}"}
+        review_started: Dict[int, float] = {}
+
+        def list_call(session, i):
+            params = [{}, {"status": "Pending"}, {"author_id": 2 + i % (users - 1)}][i % 3]
+            return session.get(f"{base}/contributions", params={"limit": 20, **params})
+
+        def create_call(session, i):
+            return session.post(
+                f"{base}/contributions",
+                data={"title": f"Load test {i}", "description": "benchmark"},
+                files={"file": (f"bench-{i}.txt", os.urandom(2048))},
+                headers={"Authorization": f"Bearer {tokens[1 + i % (users - 1)]}"},
+            )
+
+        def review_call(session, i):
+            cid = pending[i % len(pending)]
+            review_started.setdefault(cid, time.perf_counter())
+            return session.post(f"{base}/contributions/{cid}/review", json={"action": "accept"}, headers=admin)
+
+        def login_call(session, i):
+            return session.post(f"{base}/auth/login",
+                                json={"email": f"user{1 + i % users}@bench.local", "password": PASSWORD})
+
+        calls = {"list": list_call, "create": create_call, "review": review_call, "login": login_call}
+        results: Dict[str, Dict] = {}
+        approval: Dict[str, float] = {}
+        for name in scenarios:
+            if name != "review":
+                results[name] = _drive(requests_per_scenario, concurrency, calls[name])
+                continue
+            driving_done = threading.Event()
+            watcher = threading.Thread(
+                target=lambda: approval.update(_watch_jobs(app, review_started, driving_done)))
+            watcher.start()
+            results[name] = _drive(min(requests_per_scenario, len(pending)), concurrency, calls[name])
+            driving_done.set()
+            watcher.join()
+
+    return {
+        "environment": environment(),
+        "config": {"users": users, "contributions": contributions, "requests": requests_per_scenario,
+                   "concurrency": concurrency, "approvalWorkers": approval_workers},
+        "scenarios": results,
+        **({"approvalJobs": approval} if approval else {}),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--contributions", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--approval-workers", type=int, default=4)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--baseline", help="Baseline JSON to compare against (or write with --save-baseline)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95/throughput change (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    results = run(args.users, args.contributions, args.requests, args.concurrency, scenarios, args.approval_workers)
+    print(json.dumps(results, indent=2))
+
+    if args.baseline and args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    elif args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            parser.error(f"No baseline at {args.baseline}; create one with --save-baseline")
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
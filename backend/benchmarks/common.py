@@ -0,0 +1,63 @@
+"""Latency summaries and baseline comparison shared by the benchmarks."""
+import json
+import os
+import platform
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(durations: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """Request count, throughput and p50/p95/p99/max latency (ms) of one scenario."""
+    return {
+        "requests": len(durations),
+        "errors": errors,
+        "rps": round(len(durations) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50Ms": round(percentile(durations, 50) * 1000, 2),
+        "p95Ms": round(percentile(durations, 95) * 1000, 2),
+        "p99Ms": round(percentile(durations, 99) * 1000, 2),
+        "maxMs": round(max(durations) * 1000, 2) if durations else 0.0,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": str(os.cpu_count())}
+
+
+def save_baseline(path: str, results: Dict) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` scenarios beyond ``tolerance`` (0.2 = 20%).
+
+    A scenario regresses when its p95 latency grows or its throughput drops
+    by more than the tolerance, or when it starts returning errors.
+    """
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        now = current.get("scenarios", {}).get(name)
+        if now is None:
+            continue
+        if base["p95Ms"] and now["p95Ms"] > base["p95Ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95Ms']} ms -> {now['p95Ms']} ms")
+        if base["rps"] and now["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['rps']} -> {now['rps']} req/s")
+        if now["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {now['errors']}")
+    return regressions
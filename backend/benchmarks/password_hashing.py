@@ -0,0 +1,125 @@
+"""Password verification throughput per KDF, inline and through the worker pool.
+
+Each login costs one ``verify_password``, so verifications per second are
+logins per second before any database or HTTP work. For every method it
+measures three modes:
+
+    inline   one thread, so the rate is logins/s per core
+    threads  ``--concurrency`` request threads hashing inline
+    pool     ``--concurrency`` request threads waiting on ``--workers`` processes
+
+The concurrent modes also report the scheduling lag of a thread that sleeps
+1 ms at a time, which shows whether other request threads stay responsive.
+
+    python -m backend.benchmarks.password_hashing --hashes 200
+    python -m backend.benchmarks.password_hashing --methods bcrypt --bcrypt-rounds 10 --workers 2
+
+Prints one JSON document with verifications/s and p50/p95/p99 per method and mode.
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List
+
+from backend.benchmarks.common import environment, percentile, summarize
+from backend.config import Config
+from backend.services import passwords
+
+PASSWORD = "bench-password"
+
+
+def _drive(total: int, concurrency: int, call: Callable[[], object]) -> Dict[str, float]:
+    counter = itertools.count()
+    lock = threading.Lock()
+    durations: List[float] = []
+    lags: List[float] = []
+    done = threading.Event()
+
+    def worker():
+        while next(counter) < total:
+            start = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - start
+            with lock:
+                durations.append(elapsed)
+
+    def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            time.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    probe = threading.Thread(target=ticker)
+    probe.start()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    probe.join()
+    result = summarize(durations, elapsed)
+    result["lagP99Ms"] = round(percentile(lags, 99) * 1000, 2)
+    return result
+
+
+def run(methods: List[str], hashes: int, concurrency: int, workers: int) -> Dict:
+    results: Dict[str, Dict] = {}
+    for method in methods:
+        Config.PASSWORD_HASH_METHOD = method
+        Config.PASSWORD_HASH_WORKERS = 0
+        stored = passwords.hash_password(PASSWORD)
+
+        def verify():
+            ok, _ = passwords.verify_password(PASSWORD, stored)
+            assert ok
+
+        modes = {
+            "inline": _drive(hashes, 1, verify),
+            "threads": _drive(hashes, concurrency, verify),
+        }
+        Config.PASSWORD_HASH_WORKERS = workers
+        try:
+            verify()  # Spawn the workers outside the measurement
+            modes["pool"] = _drive(hashes, concurrency, verify)
+        finally:
+            passwords.shutdown()
+        modes["pool"]["perWorkerRps"] = round(modes["pool"]["rps"] / workers, 1)
+        results[method] = {"scheme": passwords.current_scheme(), "modes": modes}
+    return {
+        "environment": environment(),
+        "config": {"hashes": hashes, "concurrency": concurrency, "workers": workers},
+        "methods": results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--methods", default=",".join(passwords.METHODS))
+    parser.add_argument("--hashes", type=int, default=100, help="Verifications per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Request threads in the concurrent modes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes in pool mode")
+    parser.add_argument("--scrypt-n", type=int, default=Config.PASSWORD_SCRYPT_N)
+    parser.add_argument("--pbkdf2-iterations", type=int, default=Config.PASSWORD_PBKDF2_ITERATIONS)
+    parser.add_argument("--bcrypt-rounds", type=int, default=Config.PASSWORD_BCRYPT_ROUNDS)
+    args = parser.parse_args(argv)
+
+    methods = [m for m in args.methods.split(",") if m]
+    unknown = set(methods) - set(passwords.METHODS)
+    if unknown:
+        parser.error(f"Unknown method(s): {', '.join(sorted(unknown))}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    Config.PASSWORD_SCRYPT_N = args.scrypt_n
+    Config.PASSWORD_PBKDF2_ITERATIONS = args.pbkdf2_iterations
+    Config.PASSWORD_BCRYPT_ROUNDS = args.bcrypt_rounds
+    print(json.dumps(run(methods, args.hashes, args.concurrency, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Minimal local stand-in for the Pinata API, for tests and benchmarks."""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class PinataStub:
+    def __init__(self, auth_ok=True):
+        self.auth_ok = auth_ok
+        self.requests = []  # (method, path, client_address, body_size)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                stub.requests.append(("GET", self.path, self.client_address, 0))
+                if self.path == "/data/testAuthentication" and stub.auth_ok:
+                    self._reply(200, {"message": "Congratulations! You are communicating with the Pinata API!"})
+                else:
+                    self._reply(401, {"error": "Invalid API key"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                digest = hashlib.sha256()
+                remaining = length
+                while remaining:
+                    chunk = self.rfile.read(min(remaining, 64 * 1024))
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    remaining -= len(chunk)
+                stub.requests.append(("POST", self.path, self.client_address, length))
+                self._reply(200, {
+                    "IpfsHash": "Qm" + digest.hexdigest()[:44],
+                    "PinSize": length,
+                    "Timestamp": "2025-01-01T00:00:00.000Z",
+                })
+
+        return Handler
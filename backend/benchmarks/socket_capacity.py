@@ -0,0 +1,175 @@
+"""Socket.IO connection capacity per backend process.
+
+Starts the backend in a child process (SOCKETIO_ASYNC_MODE and
+SOCKETIO_MESSAGE_QUEUE are passed through), opens clients in steps and after
+each step records connect latency, the server's RSS and thread count, and
+how long one broadcast takes to reach every client.
+
+    python -m backend.benchmarks.socket_capacity --clients 500 --step 100
+    SOCKETIO_ASYNC_MODE=gevent python -m backend.benchmarks.socket_capacity --clients 2000
+
+Prints one JSON document with a row per step.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from backend.benchmarks.common import percentile
+
+BROADCAST_EVENT = "bench_broadcast"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _proc_status(pid: int) -> Dict[str, int]:
+    """VmRSS (KiB) and thread count of a process (Linux only; empty elsewhere)."""
+    stats = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "VmRSS":
+                    stats["rssKiB"] = int(value.split()[0])
+                elif key == "Threads":
+                    stats["threads"] = int(value)
+    except OSError:
+        pass
+    return stats
+
+
+def serve(port: int) -> None:
+    """Child process: the real app plus a handler that broadcasts on request."""
+    from backend.wsgi import application
+    from backend.extensions import socketio
+
+    def broadcast(data):
+        socketio.emit("bench_event", data)
+
+    socketio.on_event(BROADCAST_EVENT, broadcast)
+    socketio.run(application, host="127.0.0.1", port=port, allow_unsafe_werkzeug=True, log_output=False)
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def run(clients: int, step: int, transport: str) -> Dict:
+    import socketio
+
+    port = _free_port()
+    workdir = tempfile.mkdtemp(prefix="contri-bench-")
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "backend.benchmarks.socket_capacity", "--serve", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    connected: List = []
+    steps = []
+    try:
+        _wait_for_port(port)
+        pending = {"count": 0, "started": 0.0}
+        received: List[float] = []
+        lock = threading.Lock()
+        all_received = threading.Event()
+
+        def on_event(data):
+            with lock:
+                received.append(time.perf_counter() - pending["started"])
+                if len(received) >= pending["count"]:
+                    all_received.set()
+
+        failures = 0
+        while len(connected) < clients:
+            connect_times = []
+            for _ in range(min(step, clients - len(connected))):
+                client = socketio.Client(reconnection=False)
+                client.on("bench_event", on_event)
+                start = time.perf_counter()
+                try:
+                    client.connect(url, transports=[transport], wait_timeout=10)
+                except Exception:
+                    failures += 1
+                    continue
+                connect_times.append(time.perf_counter() - start)
+                connected.append(client)
+            if not connect_times:
+                break
+
+            with lock:
+                received.clear()
+                pending["count"] = len(connected)
+                pending["started"] = time.perf_counter()
+                all_received.clear()
+            connected[0].emit(BROADCAST_EVENT, {"step": len(steps)})
+            all_received.wait(timeout=30)
+            with lock:
+                fanout = list(received)
+
+            steps.append({
+                "clients": len(connected),
+                "failures": failures,
+                "connectP50Ms": round(percentile(connect_times, 50) * 1000, 2),
+                "connectP95Ms": round(percentile(connect_times, 95) * 1000, 2),
+                "broadcastDelivered": len(fanout),
+                "broadcastP50Ms": round(percentile(fanout, 50) * 1000, 2),
+                "broadcastP99Ms": round(percentile(fanout, 99) * 1000, 2),
+                **_proc_status(server.pid),
+            })
+    finally:
+        for client in connected:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {
+        "asyncMode": os.getenv("SOCKETIO_ASYNC_MODE", "threading"),
+        "messageQueue": os.getenv("SOCKETIO_MESSAGE_QUEUE"),
+        "transport": transport,
+        "steps": steps,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--step", type=int, default=50)
+    parser.add_argument("--transport", choices=("polling", "websocket"), default="polling",
+                        help="websocket needs the websocket-client package")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.serve:
+        serve(args.port)
+        return
+    print(json.dumps(run(args.clients, args.step, args.transport), indent=2))
+
+
+if __name__ == "__main__":
+    main()
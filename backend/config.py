@@ -5,18 +5,103 @@ class Config:
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev-secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///dev.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool for server databases (Postgres needs psycopg2-binary installed)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds; below typical server idle timeouts
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") not in ("0", "false", "False")
+    # Per-connection SQLite pragmas; an empty value leaves the SQLite default
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
     JWT_SECRET_KEY = os.getenv("JWT_SECRET", "jwt-secret")
     JWT_ACCESS_TOKEN_EXPIRES = False  # No expiration for dev
     JWT_TOKEN_LOCATION = ["headers"]  # Look for token in Authorization header
     UPLOAD_FOLDER = os.path.abspath(os.getenv("UPLOAD_FOLDER", os.path.join(os.path.dirname(__file__), "uploads")))
+    # "app" streams uploads from Flask; "x-accel" (nginx) / "x-sendfile" (Apache, lighttpd) hand them to the proxy
+    UPLOAD_SEND_MODE = os.getenv("UPLOAD_SEND_MODE", "app")
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/_uploads/")  # nginx internal location aliasing UPLOAD_FOLDER
+    UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", str(365 * 24 * 3600)))
+    # Resized image cache (avatars, feed thumbnails); defaults to UPLOAD_FOLDER/.derivatives
+    DERIVATIVE_FOLDER = os.getenv("DERIVATIVE_FOLDER") or None
+    DERIVATIVE_CACHE_MAX_BYTES = int(os.getenv("DERIVATIVE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
     MAX_CONTENT_LENGTH = 20 * 1024 * 1024  # 20MB
+    CONTRIBUTIONS_PAGE_SIZE = int(os.getenv("CONTRIBUTIONS_PAGE_SIZE", "20"))
+    CONTRIBUTIONS_MAX_PAGE_SIZE = int(os.getenv("CONTRIBUTIONS_MAX_PAGE_SIZE", "100"))
+    KYC_PAGE_SIZE = int(os.getenv("KYC_PAGE_SIZE", "50"))
+    KYC_MAX_PAGE_SIZE = int(os.getenv("KYC_MAX_PAGE_SIZE", "200"))
     FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
     GANACHE_URL = os.getenv("GANACHE_URL", "http://127.0.0.1:7545")
+    CHAIN_POOL_SIZE = int(os.getenv("CHAIN_POOL_SIZE", "10"))
+    CHAIN_RPC_TIMEOUT = float(os.getenv("CHAIN_RPC_TIMEOUT", "10"))
+    RECEIPT_POLL_INTERVAL = float(os.getenv("RECEIPT_POLL_INTERVAL", "2"))
+    RECEIPT_BATCH_SIZE = int(os.getenv("RECEIPT_BATCH_SIZE", "100"))
+    TX_CONFIRMATIONS = int(os.getenv("TX_CONFIRMATIONS", "1"))  # 1 = confirmed once mined
+    TX_DROP_TIMEOUT = int(os.getenv("TX_DROP_TIMEOUT", "600"))  # Seconds unknown to the node before "dropped"
+    INDEXER_POLL_INTERVAL = float(os.getenv("INDEXER_POLL_INTERVAL", "5"))
+    INDEXER_START_BLOCK = int(os.getenv("INDEXER_START_BLOCK", "0"))
+    INDEXER_CHUNK_SIZE = int(os.getenv("INDEXER_CHUNK_SIZE", "2000"))  # Blocks per eth_getLogs call
+    INDEXER_CONFIRMATIONS = int(os.getenv("INDEXER_CONFIRMATIONS", "0"))  # Stay this many blocks behind head
+    INDEXER_REORG_DEPTH = int(os.getenv("INDEXER_REORG_DEPTH", "12"))  # Blocks re-indexed after a reorg
     DEPLOYER_PRIVATE_KEY = os.getenv("DEPLOYER_PRIVATE_KEY", "")
     CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS", "")
     CONTRACT_ABI_PATH = os.getenv("CONTRACT_ABI_PATH", os.path.join(os.path.dirname(__file__), "contracts", "build", "contract.json"))
     PINATA_API_KEY = os.getenv("PINATA_API_KEY", "")
     PINATA_SECRET_API_KEY = os.getenv("PINATA_SECRET_API_KEY", "")
+    # Point at a local stub server for tests and benchmarks
+    PINATA_BASE_URL = os.getenv("PINATA_BASE_URL", "https://api.pinata.cloud")
+    PINATA_POOL_SIZE = int(os.getenv("PINATA_POOL_SIZE", "10"))
+    PINATA_CONNECT_TIMEOUT = float(os.getenv("PINATA_CONNECT_TIMEOUT", "5"))
+    PINATA_READ_TIMEOUT = float(os.getenv("PINATA_READ_TIMEOUT", "60"))
+    PINATA_MAX_RETRIES = int(os.getenv("PINATA_MAX_RETRIES", "3"))
+    PINATA_RETRY_BACKOFF = float(os.getenv("PINATA_RETRY_BACKOFF", "0.5"))
+    PINATA_AUTH_TTL = float(os.getenv("PINATA_AUTH_TTL", "300"))
+    PINATA_AUTH_FAILURE_TTL = float(os.getenv("PINATA_AUTH_FAILURE_TTL", "30"))
+    PINATA_AUTH_REFRESH_INTERVAL = float(os.getenv("PINATA_AUTH_REFRESH_INTERVAL", "240"))  # 0 disables
+    PINATA_UPLOAD_CHUNK_SIZE = int(os.getenv("PINATA_UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+    # Background approval pipeline (IPFS pin + chain anchor); 0 runs jobs inline
+    APPROVAL_WORKERS = int(os.getenv("APPROVAL_WORKERS", "4"))
+    APPROVAL_STALE_SECONDS = int(os.getenv("APPROVAL_STALE_SECONDS", "600"))
+    # "single": one saveHash tx per approval; "batch": one saveRoot tx per Merkle batch
+    ANCHOR_MODE = os.getenv("ANCHOR_MODE", "single")
+    ANCHOR_BATCH_SIZE = int(os.getenv("ANCHOR_BATCH_SIZE", "256"))
+    ANCHOR_BATCH_WINDOW = float(os.getenv("ANCHOR_BATCH_WINDOW", "60"))  # seconds
+    # Failed saveRoot: retry after ANCHOR_RETRY_BACKOFF seconds, doubling up to an hour; the job fails after ANCHOR_MAX_ATTEMPTS
+    ANCHOR_RETRY_BACKOFF = float(os.getenv("ANCHOR_RETRY_BACKOFF", "30"))
+    ANCHOR_MAX_ATTEMPTS = int(os.getenv("ANCHOR_MAX_ATTEMPTS", "5"))
+    # A batch still unsubmitted after this many seconds (worker crashed mid-flush) is released for retry
+    ANCHOR_PENDING_TIMEOUT = float(os.getenv("ANCHOR_PENDING_TIMEOUT", "300"))
+    # Socket.IO: "threading", or "gevent"/"eventlet" (installed separately) for many concurrent connections.
+    # SOCKETIO_MESSAGE_QUEUE shares events between processes: redis://..., memory://, file:///path
+    SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE") or None
+    SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "contri")
+    # contributions_batch feed: coalescing window and broadcast rate cap (batches/s per server process)
+    FEED_BATCH_WINDOW_MS = int(os.getenv("FEED_BATCH_WINDOW_MS", "200"))
+    FEED_MAX_BATCHES_PER_SECOND = float(os.getenv("FEED_MAX_BATCHES_PER_SECOND", "4"))
+
+    # Startup schema check against the Alembic head: "warn", "error", "upgrade" (run migrations) or "off"
+    SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn")
+    # Worker threads (anchoring, receipts, indexer, Pinata auth refresh); off for CLI commands
+    BACKGROUND_SERVICES = os.getenv("BACKGROUND_SERVICES", "1") not in ("0", "false", "False")
+
+    # Password KDF: "scrypt", "pbkdf2" or "bcrypt"; logins rehash passwords stored with other settings
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 15)))
+    PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    # Processes running the KDF off the request threads; 0 hashes inline
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Role/KYC flags behind current_user, cached per process; changes elsewhere show up within the TTL
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # seconds; 0 disables the cache
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json" (one object per line)
+    # Prometheus scrape token for /api/metrics (Authorization: Bearer <token>); unset leaves it open
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
     # EmailJS is used for OTP emails (client-side)
     # Mongo removed; using SQLAlchemy only
 
@@ -53,6 +53,33 @@ contract ContriToken {
     function getAllHashes() external view returns (string[] memory) {
         return _allHashes;
     }
+
+    // Batched anchoring: one Merkle root commits many IPFS hashes; proofs are kept off-chain
+    event BatchAnchored(address indexed submitter, uint256 indexed batchId, bytes32 root, uint256 size);
+    bytes32[] private _batchRoots;
+
+    function saveRoot(bytes32 root, uint256 size) external returns (uint256) {
+        _batchRoots.push(root);
+        uint256 batchId = _batchRoots.length - 1;
+        emit BatchAnchored(msg.sender, batchId, root, size);
+        return batchId;
+    }
+
+    function batchRoot(uint256 batchId) external view returns (bytes32) {
+        return _batchRoots[batchId];
+    }
+
+    // Leaves are keccak256(ipfsHash); parents hash their children in sorted order
+    function verifyHash(uint256 batchId, string calldata ipfsHash, bytes32[] calldata proof) external view returns (bool) {
+        bytes32 node = keccak256(bytes(ipfsHash));
+        for (uint256 i = 0; i < proof.length; i++) {
+            bytes32 sibling = proof[i];
+            node = node < sibling
+                ? keccak256(abi.encodePacked(node, sibling))
+                : keccak256(abi.encodePacked(sibling, node));
+        }
+        return node == _batchRoots[batchId];
+    }
 }
 """
 
@@ -0,0 +1,110 @@
+"""Baseline schema: users, contributions, token_transfers, kyc_documents
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Databases created by the old startup code (create_all() plus ad-hoc ALTER
+TABLE statements) already have some or all of this, so each table and
+column is only added when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    ]
+
+
+def _ensure_columns(table, columns):
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in tables:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            *_timestamps(),
+            sa.Column('name', sa.String(length=120), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False, unique=True),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('role', sa.String(length=50)),
+            sa.Column('avatar_url', sa.String(length=500)),
+            sa.Column('bio', sa.Text()),
+            sa.Column('cnri_balance', sa.Float()),
+            sa.Column('kyc_verified', sa.Boolean()),
+            sa.Column('kyc_aadhaar_last4', sa.String(length=4)),
+        )
+    else:
+        _ensure_columns('users', [
+            sa.Column('kyc_verified', sa.Boolean(), server_default=sa.false()),
+            sa.Column('kyc_aadhaar_last4', sa.String(length=4)),
+        ])
+
+    if 'contributions' not in tables:
+        op.create_table(
+            'contributions',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            *_timestamps(),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('file_url', sa.String(length=500)),
+            sa.Column('ipfs_cid', sa.String(length=128)),
+            sa.Column('ipfs_file_size', sa.Integer()),
+            sa.Column('ipfs_pin_timestamp', sa.String(length=50)),
+            sa.Column('reward_amount', sa.Float()),
+            sa.Column('status', sa.String(length=50)),
+        )
+    else:
+        _ensure_columns('contributions', [
+            sa.Column('ipfs_file_size', sa.Integer()),
+            sa.Column('ipfs_pin_timestamp', sa.String(length=50)),
+        ])
+
+    if 'token_transfers' not in tables:
+        op.create_table(
+            'token_transfers',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            *_timestamps(),
+            sa.Column('sender', sa.String(length=64), nullable=False),
+            sa.Column('recipient', sa.String(length=64), nullable=False),
+            sa.Column('amount', sa.Float(), nullable=False),
+            sa.Column('tx_hash', sa.String(length=80)),
+        )
+
+    if 'kyc_documents' not in tables:
+        op.create_table(
+            'kyc_documents',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            *_timestamps(),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False, unique=True),
+            sa.Column('file_url', sa.String(length=500), nullable=False),
+            sa.Column('status', sa.String(length=50)),
+            sa.Column('verified_email', sa.String(length=255)),
+        )
+    else:
+        _ensure_columns('kyc_documents', [sa.Column('verified_email', sa.String(length=255))])
+
+
+def downgrade():
+    op.drop_table('kyc_documents')
+    op.drop_table('token_transfers')
+    op.drop_table('contributions')
+    op.drop_table('users')
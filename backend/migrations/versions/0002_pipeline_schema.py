@@ -0,0 +1,175 @@
+"""Anchoring, approval jobs, receipts, event indexer and content-addressed uploads
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+Like 0001 this only adds what is missing, so databases the old startup
+code already extended upgrade cleanly.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    ]
+
+
+def _create_table(tables, name, *columns):
+    if name not in tables:
+        op.create_table(name, sa.Column('id', sa.Integer(), primary_key=True), *_timestamps(), *columns)
+
+
+def _missing_columns(table, columns):
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+    return [column for column in columns if column.name not in existing]
+
+
+def _ensure_index(table, name, columns, unique=False):
+    if name not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes(table)}:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    _create_table(
+        tables, 'anchor_batches',
+        sa.Column('merkle_root', sa.String(length=66), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('tx_hash', sa.String(length=80)),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error', sa.Text()),
+    )
+
+    missing = _missing_columns('contributions', [
+        sa.Column('content_cid', sa.String(length=128)),
+        sa.Column('anchor_batch_id', sa.Integer()),
+        sa.Column('anchor_proof', sa.Text()),
+    ])
+    if missing:
+        with op.batch_alter_table('contributions') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+            if any(column.name == 'anchor_batch_id' for column in missing):
+                batch_op.create_foreign_key(
+                    'fk_contributions_anchor_batch_id', 'anchor_batches', ['anchor_batch_id'], ['id'])
+    _ensure_index('contributions', 'ix_contributions_content_cid', ['content_cid'])
+    _ensure_index('contributions', 'ix_contributions_anchor_batch_id', ['anchor_batch_id'])
+    _ensure_index('contributions', 'ix_contributions_created_at_id', ['created_at', 'id'])
+    _ensure_index('contributions', 'ix_contributions_status_created_at_id', ['status', 'created_at', 'id'])
+    _ensure_index('contributions', 'ix_contributions_author_created_at_id', ['author_id', 'created_at', 'id'])
+
+    _create_table(
+        tables, 'approval_jobs',
+        sa.Column('contribution_id', sa.Integer(), sa.ForeignKey('contributions.id'), nullable=False),
+        sa.Column('requested_by', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('state', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer()),
+        sa.Column('error', sa.Text()),
+        sa.Column('ipfs_cid', sa.String(length=128)),
+        sa.Column('tx_hash', sa.String(length=80)),
+        sa.Column('result_json', sa.Text()),
+    )
+    _ensure_index('approval_jobs', 'ix_approval_jobs_contribution_id', ['contribution_id'])
+    _ensure_index('approval_jobs', 'ix_approval_jobs_state', ['state'])
+
+    _create_table(
+        tables, 'chain_transactions',
+        sa.Column('tx_hash', sa.String(length=80), nullable=False, unique=True),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('contribution_id', sa.Integer(), sa.ForeignKey('contributions.id')),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('sender', sa.String(length=64)),
+        sa.Column('nonce', sa.Integer()),
+        sa.Column('block_number', sa.Integer()),
+        sa.Column('gas_used', sa.Integer()),
+        sa.Column('checked_at', sa.DateTime()),
+    )
+    _ensure_index('chain_transactions', 'ix_chain_transactions_status', ['status'])
+    _ensure_index('chain_transactions', 'ix_chain_transactions_contribution_id', ['contribution_id'])
+
+    _create_table(
+        tables, 'hash_anchors',
+        sa.Column('ipfs_hash', sa.String(length=128), nullable=False),
+        sa.Column('submitter', sa.String(length=64), nullable=False),
+        sa.Column('tx_hash', sa.String(length=80), nullable=False),
+        sa.Column('block_number', sa.Integer(), nullable=False),
+        sa.Column('block_hash', sa.String(length=66), nullable=False),
+        sa.Column('log_index', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('tx_hash', 'log_index', name='uq_hash_anchors_tx_log'),
+    )
+    _ensure_index('hash_anchors', 'ix_hash_anchors_ipfs_hash', ['ipfs_hash'])
+    _ensure_index('hash_anchors', 'ix_hash_anchors_submitter', ['submitter'])
+    _ensure_index('hash_anchors', 'ix_hash_anchors_block_number', ['block_number'])
+
+    _create_table(
+        tables, 'indexer_checkpoints',
+        sa.Column('name', sa.String(length=50), nullable=False, unique=True),
+        sa.Column('contract_address', sa.String(length=64)),
+        sa.Column('block_number', sa.Integer(), nullable=False),
+        sa.Column('block_hash', sa.String(length=66)),
+    )
+
+    _create_table(
+        tables, 'stored_files',
+        sa.Column('sha256', sa.String(length=64), nullable=False, unique=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=120)),
+        sa.Column('original_name', sa.String(length=255)),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+    )
+
+    missing = _missing_columns('token_transfers', [
+        sa.Column('block_number', sa.Integer()),
+        sa.Column('block_hash', sa.String(length=66)),
+        sa.Column('log_index', sa.Integer()),
+    ])
+    constraints = {u['name'] for u in sa.inspect(op.get_bind()).get_unique_constraints('token_transfers')}
+    if missing or 'uq_token_transfers_tx_log' not in constraints:
+        with op.batch_alter_table('token_transfers') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+            if 'uq_token_transfers_tx_log' not in constraints:
+                batch_op.create_unique_constraint('uq_token_transfers_tx_log', ['tx_hash', 'log_index'])
+    _ensure_index('token_transfers', 'ix_token_transfers_sender', ['sender'])
+    _ensure_index('token_transfers', 'ix_token_transfers_recipient', ['recipient'])
+    _ensure_index('token_transfers', 'ix_token_transfers_block_number', ['block_number'])
+
+
+def downgrade():
+    with op.batch_alter_table('token_transfers') as batch_op:
+        batch_op.drop_index('ix_token_transfers_block_number')
+        batch_op.drop_index('ix_token_transfers_recipient')
+        batch_op.drop_index('ix_token_transfers_sender')
+        batch_op.drop_constraint('uq_token_transfers_tx_log', type_='unique')
+        batch_op.drop_column('log_index')
+        batch_op.drop_column('block_hash')
+        batch_op.drop_column('block_number')
+    op.drop_table('stored_files')
+    op.drop_table('indexer_checkpoints')
+    op.drop_table('hash_anchors')
+    op.drop_table('chain_transactions')
+    op.drop_table('approval_jobs')
+    with op.batch_alter_table('contributions') as batch_op:
+        batch_op.drop_index('ix_contributions_author_created_at_id')
+        batch_op.drop_index('ix_contributions_status_created_at_id')
+        batch_op.drop_index('ix_contributions_created_at_id')
+        batch_op.drop_index('ix_contributions_anchor_batch_id')
+        batch_op.drop_index('ix_contributions_content_cid')
+        batch_op.drop_constraint('fk_contributions_anchor_batch_id', type_='foreignkey')
+        batch_op.drop_column('anchor_proof')
+        batch_op.drop_column('anchor_batch_id')
+        batch_op.drop_column('content_cid')
+    op.drop_table('anchor_batches')
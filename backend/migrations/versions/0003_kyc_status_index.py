@@ -0,0 +1,23 @@
+"""Index kyc_documents.status for the admin review queue
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_kyc_documents_status', 'kyc_documents', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_kyc_documents_status', table_name='kyc_documents')
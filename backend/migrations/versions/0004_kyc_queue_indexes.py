@@ -0,0 +1,28 @@
+"""Composite indexes for keyset pagination of the KYC admin queue
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:03
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_kyc_documents_created_at_id', 'kyc_documents', ['created_at', 'id'], unique=False)
+    op.create_index('ix_kyc_documents_status_created_at_id', 'kyc_documents', ['status', 'created_at', 'id'], unique=False)
+    # Covered by the leading column of the status index above
+    op.drop_index('ix_kyc_documents_status', table_name='kyc_documents')
+
+
+def downgrade():
+    op.create_index('ix_kyc_documents_status', 'kyc_documents', ['status'], unique=False)
+    op.drop_index('ix_kyc_documents_status_created_at_id', table_name='kyc_documents')
+    op.drop_index('ix_kyc_documents_created_at_id', table_name='kyc_documents')
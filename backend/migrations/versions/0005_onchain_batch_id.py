@@ -0,0 +1,26 @@
+"""Record the contract's batch index for each anchor batch
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('anchor_batches') as batch_op:
+        batch_op.add_column(sa.Column('onchain_batch_id', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('anchor_batches') as batch_op:
+        batch_op.drop_column('onchain_batch_id')
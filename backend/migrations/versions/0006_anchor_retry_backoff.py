@@ -0,0 +1,28 @@
+"""Per-job retry count and backoff for batch anchoring
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:05
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('approval_jobs') as batch_op:
+        batch_op.add_column(sa.Column('anchor_attempts', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('approval_jobs') as batch_op:
+        batch_op.drop_column('next_attempt_at')
+        batch_op.drop_column('anchor_attempts')
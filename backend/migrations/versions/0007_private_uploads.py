@@ -0,0 +1,30 @@
+"""Mark uploads that must not be cached by shared caches (KYC documents)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('stored_files') as batch_op:
+        batch_op.add_column(sa.Column('private', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.execute(
+        "UPDATE stored_files SET private = TRUE WHERE EXISTS ("
+        "SELECT 1 FROM kyc_documents WHERE kyc_documents.file_url LIKE '%/' || stored_files.sha256 || '/%')"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('stored_files') as batch_op:
+        batch_op.drop_column('private')
@@ -0,0 +1,35 @@
+"""Allow only one in-flight approval job per contribution
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+ACTIVE = "state IN ('queued', 'pinning', 'anchoring')"
+
+
+def upgrade():
+    # Duplicates left by racing accepts: keep the oldest in-flight job per contribution
+    op.execute(
+        "UPDATE approval_jobs SET state = 'failed', error = 'Duplicate of an earlier approval job' "
+        f"WHERE {ACTIVE} AND id NOT IN ("
+        f"SELECT MIN(id) FROM approval_jobs WHERE {ACTIVE} GROUP BY contribution_id)"
+    )
+    op.create_index(
+        'uq_approval_jobs_active_contribution', 'approval_jobs', ['contribution_id'], unique=True,
+        sqlite_where=sa.text(ACTIVE), postgresql_where=sa.text(ACTIVE),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_approval_jobs_active_contribution', table_name='approval_jobs')
@@ -0,0 +1,31 @@
+"""Store SQLite created_at values of paginated tables with microseconds
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# Tables walked by keyset pagination on (created_at, id)
+TABLES = ('contributions', 'kyc_documents')
+
+
+def upgrade():
+    # SQLite CURRENT_TIMESTAMP is "YYYY-MM-DD HH:MM:SS", but bound datetimes are
+    # "YYYY-MM-DD HH:MM:SS.ffffff" and compare as strings; pad the old rows to match
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade():
+    pass
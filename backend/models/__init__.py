@@ -1,9 +1,12 @@
+from datetime import datetime
 from backend.extensions import db
 
 class BaseModel(db.Model):
     __abstract__ = True
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    # Set in Python as well: SQLite's now() has no fraction of a second, which
+    # breaks (created_at, id) keyset comparisons against bound datetimes
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
 
@@ -0,0 +1,32 @@
+from backend.extensions import db
+from backend.models import BaseModel
+
+
+class AnchorBatch(BaseModel):
+    """One on-chain saveRoot transaction committing a Merkle root over many CIDs."""
+    __tablename__ = "anchor_batches"
+
+    PENDING = "pending"
+    SUBMITTED = "submitted"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+    merkle_root = db.Column(db.String(66), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    tx_hash = db.Column(db.String(80))
+    # Index saveRoot assigned in the contract (BatchAnchored.batchId), set once the receipt is in;
+    # verifyHash takes this, not our row id
+    onchain_batch_id = db.Column(db.Integer)
+    status = db.Column(db.String(20), nullable=False, default=PENDING)
+    error = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "merkleRoot": self.merkle_root,
+            "size": self.size,
+            "txHash": self.tx_hash,
+            "onchainBatchId": self.onchain_batch_id,
+            "status": self.status,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+        }
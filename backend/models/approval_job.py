@@ -0,0 +1,60 @@
+import json
+from backend.extensions import db
+from backend.models import BaseModel
+
+
+class ApprovalJob(BaseModel):
+    """Durable record of an accepted contribution moving through IPFS pinning and chain anchoring."""
+    __tablename__ = "approval_jobs"
+    __table_args__ = (
+        # At most one in-flight job per contribution, even when two accepts race
+        db.Index(
+            "uq_approval_jobs_active_contribution", "contribution_id", unique=True,
+            sqlite_where=db.text("state IN ('queued', 'pinning', 'anchoring')"),
+            postgresql_where=db.text("state IN ('queued', 'pinning', 'anchoring')"),
+        ),
+    )
+
+    QUEUED = "queued"
+    PINNING = "pinning"
+    ANCHORING = "anchoring"
+    DONE = "done"
+    FAILED = "failed"
+    ACTIVE_STATES = (QUEUED, PINNING, ANCHORING)
+
+    contribution_id = db.Column(db.Integer, db.ForeignKey("contributions.id"), nullable=False, index=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey("users.id"))
+    state = db.Column(db.String(20), nullable=False, default=QUEUED, index=True)
+    attempts = db.Column(db.Integer, default=0)
+    # Failed saveRoot submissions in batch mode, and when the batcher may retry this job
+    anchor_attempts = db.Column(db.Integer, default=0)
+    next_attempt_at = db.Column(db.DateTime)
+    error = db.Column(db.Text)
+    ipfs_cid = db.Column(db.String(128))
+    tx_hash = db.Column(db.String(80))
+    result_json = db.Column(db.Text)  # Approval response payload once done
+
+    contribution = db.relationship("Contribution", backref="approval_jobs")
+
+    @property
+    def result(self):
+        return json.loads(self.result_json) if self.result_json else None
+
+    @result.setter
+    def result(self, value):
+        self.result_json = json.dumps(value) if value is not None else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "contributionId": self.contribution_id,
+            "state": self.state,
+            "attempts": self.attempts,
+            "anchorAttempts": self.anchor_attempts or 0,
+            "error": self.error,
+            "ipfsHash": self.ipfs_cid,
+            "txHash": self.tx_hash,
+            "result": self.result,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,36 @@
+from backend.extensions import db
+from backend.models import BaseModel
+
+
+class ChainTransaction(BaseModel):
+    """A transaction the backend broadcast, followed until it is mined or dropped."""
+    __tablename__ = "chain_transactions"
+
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    REVERTED = "reverted"
+    DROPPED = "dropped"
+
+    tx_hash = db.Column(db.String(80), nullable=False, unique=True)
+    kind = db.Column(db.String(30), nullable=False)  # anchor, batch_anchor, reward, upload
+    status = db.Column(db.String(20), nullable=False, default=PENDING, index=True)
+    contribution_id = db.Column(db.Integer, db.ForeignKey("contributions.id"), nullable=True, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)  # Who is notified
+    sender = db.Column(db.String(64))
+    nonce = db.Column(db.Integer)
+    block_number = db.Column(db.Integer)
+    gas_used = db.Column(db.Integer)
+    checked_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "txHash": self.tx_hash,
+            "kind": self.kind,
+            "status": self.status,
+            "contributionId": self.contribution_id,
+            "userId": self.user_id,
+            "blockNumber": self.block_number,
+            "gasUsed": self.gas_used,
+            "submittedAt": self.created_at.isoformat() if self.created_at else None,
+            "checkedAt": self.checked_at.isoformat() if self.checked_at else None,
+        }
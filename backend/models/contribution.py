@@ -1,9 +1,17 @@
 from backend.extensions import db
 from backend.models import BaseModel
+from backend.utils.uploads import derivative_url
 
 
 class Contribution(BaseModel):
     __tablename__ = "contributions"
+    __table_args__ = (
+        # Keyset pagination of the feed walks (created_at, id) newest-first,
+        # optionally narrowed by status or author.
+        db.Index("ix_contributions_created_at_id", "created_at", "id"),
+        db.Index("ix_contributions_status_created_at_id", "status", "created_at", "id"),
+        db.Index("ix_contributions_author_created_at_id", "author_id", "created_at", "id"),
+    )
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -11,31 +19,42 @@ class Contribution(BaseModel):
     ipfs_cid = db.Column(db.String(128))
     ipfs_file_size = db.Column(db.Integer, nullable=True)  # File size in bytes
     ipfs_pin_timestamp = db.Column(db.String(50), nullable=True)  # ISO timestamp
+    content_cid = db.Column(db.String(128), nullable=True, index=True)  # CIDv0 computed locally on upload
+    # Batched anchoring: the Merkle batch holding ipfs_cid and its inclusion proof (JSON list)
+    anchor_batch_id = db.Column(db.Integer, db.ForeignKey("anchor_batches.id"), nullable=True, index=True)
+    anchor_proof = db.Column(db.Text, nullable=True)
     reward_amount = db.Column(db.Float, default=0.0)
     status = db.Column(db.String(50), default="Pending")
 
     author = db.relationship("User", backref="contributions")
+    anchor_batch = db.relationship("AnchorBatch")
 
-    def to_card(self):
+    def to_card(self, author=None):
+        """Feed card. ``author`` is a prebuilt ``User.to_dict()`` to reuse across rows."""
+        if author is None:
+            author = self.author.to_dict()
         return {
             "id": str(self.id),
             "title": self.title,
             "description": (self.description or "")[:160],
-            "contributor": self.author.email,
+            "contributor": author["email"],
             "cid": self.ipfs_cid or "",
             "rewardStatus": "Claimable" if self.reward_amount else "Pending",
             "citations": 0,
             "rewardAmount": f"{self.reward_amount:.2f}",
             "status": self.status,
-            "author": self.author.to_dict(),
+            "author": author,
             "ipfs_cid": self.ipfs_cid,
             "ipfs_file_size": self.ipfs_file_size,
             "ipfs_pin_timestamp": self.ipfs_pin_timestamp,
             "fileUrl": self.file_url,
+            "thumbnailUrl": derivative_url(self.file_url, "card"),
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
-    def to_detail(self):
+    def to_detail(self, author=None):
+        if author is None:
+            author = self.author.to_dict()
         return {
             "id": str(self.id),
             "title": self.title,
@@ -46,7 +65,28 @@ class Contribution(BaseModel):
             "ipfsPinTimestamp": self.ipfs_pin_timestamp,
             "rewardAmount": self.reward_amount,
             "status": self.status,
-            "author": self.author.to_dict(),
+            # The contract's batch index for verifyHash; None until the saveRoot receipt arrives
+            "anchorBatchId": self.anchor_batch.onchain_batch_id if self.anchor_batch else None,
+            "author": author,
         }
 
+    @staticmethod
+    def serialize_cards(items):
+        """Serialize a page of contributions, building each distinct author's dict once.
+
+        Callers should eager-load ``author`` (see ``with_author``) so this issues no queries.
+        """
+        authors = {}
+        cards = []
+        for c in items:
+            if c.author_id not in authors:
+                authors[c.author_id] = c.author.to_dict()
+            cards.append(c.to_card(author=authors[c.author_id]))
+        return cards
+
+    @classmethod
+    def with_author(cls):
+        """Query with the author joined in, avoiding one lazy load per row."""
+        return cls.query.options(db.joinedload(cls.author))
+
 
@@ -0,0 +1,36 @@
+from backend.extensions import db
+from backend.models import BaseModel
+
+
+class HashAnchor(BaseModel):
+    """A HashSaved event: which transaction stored an IPFS CID on-chain."""
+    __tablename__ = "hash_anchors"
+    __table_args__ = (
+        db.UniqueConstraint("tx_hash", "log_index", name="uq_hash_anchors_tx_log"),
+    )
+
+    ipfs_hash = db.Column(db.String(128), nullable=False, index=True)
+    submitter = db.Column(db.String(64), nullable=False, index=True)
+    tx_hash = db.Column(db.String(80), nullable=False)
+    block_number = db.Column(db.Integer, nullable=False, index=True)
+    block_hash = db.Column(db.String(66), nullable=False)
+    log_index = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self):
+        return {
+            "ipfsHash": self.ipfs_hash,
+            "submitter": self.submitter,
+            "txHash": self.tx_hash,
+            "blockNumber": self.block_number,
+            "blockHash": self.block_hash,
+        }
+
+
+class IndexerCheckpoint(BaseModel):
+    """Last block the event indexer fully processed, with its hash for reorg detection."""
+    __tablename__ = "indexer_checkpoints"
+
+    name = db.Column(db.String(50), nullable=False, unique=True)
+    contract_address = db.Column(db.String(64))
+    block_number = db.Column(db.Integer, nullable=False)  # INDEXER_START_BLOCK - 1 before the first chunk
+    block_hash = db.Column(db.String(66))
@@ -4,13 +4,23 @@ from backend.models import BaseModel
 
 class KycDocument(BaseModel):
     __tablename__ = "kyc_documents"
+    __table_args__ = (
+        # The admin queue walks (created_at, id) newest-first, optionally by status
+        db.Index("ix_kyc_documents_created_at_id", "created_at", "id"),
+        db.Index("ix_kyc_documents_status_created_at_id", "status", "created_at", "id"),
+    )
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, unique=True)
     file_url = db.Column(db.String(500), nullable=False)
     status = db.Column(db.String(50), default="Pending")  # Pending, Verified, Rejected
     verified_email = db.Column(db.String(255))  # Email verified via OTP
     
     user = db.relationship("User", backref="kyc_document")
-    
+
+    @classmethod
+    def with_user(cls):
+        """Query with the user joined in, avoiding lazy loads in to_dict()."""
+        return cls.query.options(db.joinedload(cls.user))
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -0,0 +1,38 @@
+from backend.extensions import db
+from backend.models import BaseModel
+
+
+class StoredFile(BaseModel):
+    """A content-addressed upload under UPLOAD_FOLDER/<ab>/<cd>/<sha256>.
+
+    ``ref_count`` is the number of records (contributions, KYC documents,
+    avatars) pointing at the blob; it is deleted when that drops to zero.
+    ``private`` content (any KYC document) is never cached by shared caches
+    and has no derivatives.
+    """
+    __tablename__ = "stored_files"
+
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(120))
+    original_name = db.Column(db.String(255))  # Name of the first upload of this content
+    ref_count = db.Column(db.Integer, nullable=False, default=1)
+    private = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
+    @property
+    def relative_path(self) -> str:
+        return blob_path(self.sha256)
+
+    def to_dict(self):
+        return {
+            "sha256": self.sha256,
+            "size": self.size,
+            "contentType": self.content_type,
+            "originalName": self.original_name,
+            "refCount": self.ref_count,
+            "private": self.private,
+        }
+
+
+def blob_path(sha256: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
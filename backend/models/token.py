@@ -4,9 +4,23 @@ from backend.models import BaseModel
 
 class TokenTransfer(BaseModel):
     __tablename__ = "token_transfers"
-    sender = db.Column(db.String(64), nullable=False)
-    recipient = db.Column(db.String(64), nullable=False)
+    __table_args__ = (
+        db.UniqueConstraint("tx_hash", "log_index", name="uq_token_transfers_tx_log"),
+    )
+    sender = db.Column(db.String(64), nullable=False, index=True)
+    recipient = db.Column(db.String(64), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     tx_hash = db.Column(db.String(80))
+    # Set by the event indexer
+    block_number = db.Column(db.Integer, index=True)
+    block_hash = db.Column(db.String(66))
+    log_index = db.Column(db.Integer)
 
-
+    def to_dict(self):
+        return {
+            "from": self.sender,
+            "to": self.recipient,
+            "amount": self.amount,
+            "txHash": self.tx_hash,
+            "blockNumber": self.block_number,
+        }
@@ -1,6 +1,7 @@
 from backend.extensions import db
 from backend.models import BaseModel
-from werkzeug.security import generate_password_hash, check_password_hash
+from backend.utils.uploads import derivative_url
+from backend.services import passwords
 
 
 class User(BaseModel):
@@ -17,10 +18,14 @@ class User(BaseModel):
     kyc_aadhaar_last4 = db.Column(db.String(4))
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        """Also rehashes with the current settings when they changed; the caller commits."""
+        ok, upgraded = passwords.verify_password(password, self.password_hash)
+        if upgraded:
+            self.password_hash = upgraded
+        return ok
 
     def to_dict(self):
         return {
@@ -29,6 +34,7 @@ class User(BaseModel):
             "email": self.email, 
             "role": self.role, 
             "avatarUrl": self.avatar_url, 
+            "avatarThumbUrl": derivative_url(self.avatar_url, "avatar") or self.avatar_url,
             "bio": self.bio,
             "ctriBalance": self.cnri_balance,
             "kycVerified": bool(self.kyc_verified),
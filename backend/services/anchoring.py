@@ -0,0 +1,234 @@
+"""Batched anchoring: many approved CIDs committed on chain as one Merkle root.
+
+In ANCHOR_MODE "batch" accepted jobs wait in "anchoring" until ``flush``
+claims them into an AnchorBatch and submits ``saveRoot``. They are only
+finished (proofs attached, jobs done) by ``batch_mined`` once the receipt
+tracker sees the transaction confirmed. A reverted or dropped saveRoot, or a
+batch a crash left unsubmitted for ANCHOR_PENDING_TIMEOUT seconds, releases
+its contributions back to the batcher with the usual retry backoff.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from eth_utils import keccak
+from sqlalchemy import or_
+from backend.extensions import db
+from backend.models.anchor_batch import AnchorBatch
+from backend.models.approval_job import ApprovalJob
+from backend.models.contribution import Contribution
+from backend.services.approvals import chain_configured, emit_job
+from backend.services.chain import chain
+from backend.services.merkle import MerkleTree
+from backend.services import receipts
+
+logger = logging.getLogger(__name__)
+
+_flush_lock = threading.Lock()
+
+MAX_RETRY_DELAY = 3600  # seconds
+
+BATCH_ANCHORED_TOPIC = "0x" + keccak(text="BatchAnchored(address,uint256,bytes32,uint256)").hex()
+
+
+def init_app(app) -> None:
+    """Start the batch anchoring loop when ANCHOR_MODE is "batch"."""
+    if app.config["ANCHOR_MODE"] != "batch" or app.testing:
+        return
+    interval = max(1.0, min(app.config["ANCHOR_BATCH_WINDOW"], 5.0))
+
+    def run():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    flush(app.config)
+                except Exception as e:
+                    logger.error("Anchor batch flush failed: %s", e)
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name="anchor-batcher", daemon=True).start()
+
+
+def _waiting_jobs(limit: int, now: datetime):
+    return (
+        ApprovalJob.query.join(Contribution, Contribution.id == ApprovalJob.contribution_id)
+        .filter(
+            ApprovalJob.state == ApprovalJob.ANCHORING,
+            ApprovalJob.result_json.isnot(None),
+            Contribution.ipfs_cid.isnot(None),
+            Contribution.anchor_batch_id.is_(None),
+            or_(ApprovalJob.next_attempt_at.is_(None), ApprovalJob.next_attempt_at <= now),
+        )
+        .order_by(ApprovalJob.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def flush(config, force: bool = False) -> Optional[AnchorBatch]:
+    """Commit waiting CIDs as one Merkle root once the batch is full or its window has elapsed."""
+    with _flush_lock:
+        size = config["ANCHOR_BATCH_SIZE"]
+        now = datetime.utcnow()
+        _release_stale_batches(now, config)
+        jobs = _waiting_jobs(size, now)
+        if not jobs:
+            return None
+        window_start = now - timedelta(seconds=config["ANCHOR_BATCH_WINDOW"])
+        oldest = min(job.updated_at or now for job in jobs)
+        retrying = any(job.anchor_attempts for job in jobs)  # Their backoff already replaced the window
+        if not force and len(jobs) < size and oldest > window_start and not retrying:
+            return None
+        if not chain_configured():
+            # Same as single mode: without a contract and key, approvals complete unanchored
+            _finish_unanchored(jobs)
+            return None
+        return _anchor(jobs, config)
+
+
+def submit_root(root: bytes, size: int) -> str:
+    return chain.transact(chain.contract().functions.saveRoot(root, size), gas=120000)
+
+
+def _finish_unanchored(jobs) -> None:
+    logger.warning("No contract or deployer key configured; %s approval(s) finish without anchoring", len(jobs))
+    for job in jobs:
+        job.state = ApprovalJob.DONE
+    db.session.commit()
+    for job in jobs:
+        emit_job(job)
+
+
+def _release(batch: AnchorBatch, error: str) -> None:
+    """Mark a batch failed and hand its contributions back to the batcher."""
+    batch.status = AnchorBatch.FAILED
+    batch.error = error
+    Contribution.query.filter_by(anchor_batch_id=batch.id).update(
+        {"anchor_batch_id": None, "anchor_proof": None}, synchronize_session=False,
+    )
+
+
+def _release_stale_batches(now: datetime, config) -> None:
+    """Release batches that were claimed but never submitted, e.g. by a worker that crashed."""
+    stale_before = now - timedelta(seconds=config["ANCHOR_PENDING_TIMEOUT"])
+    stale = AnchorBatch.query.filter(
+        AnchorBatch.status == AnchorBatch.PENDING,
+        AnchorBatch.created_at < stale_before,
+    ).all()
+    for batch in stale:
+        logger.warning("Anchor batch %s was never submitted; releasing its contributions", batch.id)
+        _release(batch, "Abandoned before saveRoot was submitted")
+    if stale:
+        db.session.commit()
+
+
+def _retry_later(jobs, error: str, config) -> None:
+    """Back off the jobs of a failed batch, failing those out of attempts."""
+    now = datetime.utcnow()
+    for job in jobs:
+        job.anchor_attempts = (job.anchor_attempts or 0) + 1
+        job.error = f"saveRoot failed: {error}"
+        if job.anchor_attempts >= config["ANCHOR_MAX_ATTEMPTS"]:
+            job.state = ApprovalJob.FAILED
+        else:
+            delay = min(config["ANCHOR_RETRY_BACKOFF"] * 2 ** (job.anchor_attempts - 1), MAX_RETRY_DELAY)
+            job.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def _anchor(jobs, config) -> Optional[AnchorBatch]:
+    contribution_ids = [job.contribution_id for job in jobs]
+    batch = AnchorBatch(merkle_root="", size=0, status=AnchorBatch.PENDING)
+    db.session.add(batch)
+    db.session.flush()
+    # Claim the contributions so a concurrent flusher cannot anchor them twice
+    Contribution.query.filter(
+        Contribution.id.in_(contribution_ids),
+        Contribution.anchor_batch_id.is_(None),
+    ).update({"anchor_batch_id": batch.id}, synchronize_session=False)
+    contributions = Contribution.query.filter_by(anchor_batch_id=batch.id).order_by(Contribution.id).all()
+    if not contributions:
+        db.session.rollback()
+        return None
+
+    tree = MerkleTree([c.ipfs_cid for c in contributions])
+    batch.merkle_root = "0x" + tree.root.hex()
+    batch.size = len(contributions)
+    db.session.commit()
+
+    try:
+        tx_hash = submit_root(tree.root, batch.size)
+    except Exception as e:
+        logger.warning("saveRoot for anchor batch %s failed: %s", batch.id, e)
+        _release(batch, str(e))
+        claimed = {c.id for c in contributions}
+        failed = [job for job in jobs if job.contribution_id in claimed]
+        _retry_later(failed, str(e), config)
+        db.session.commit()
+        for job in failed:
+            if job.state == ApprovalJob.FAILED:
+                emit_job(job)
+        return batch
+
+    batch.tx_hash = tx_hash
+    batch.status = AnchorBatch.SUBMITTED
+    receipts.track(tx_hash, "batch_anchor")
+    claimed = {c.id for c in contributions}
+    submitted = [job for job in jobs if job.contribution_id in claimed]
+    for job in submitted:
+        # Still "anchoring": batch_mined finishes the job once saveRoot is confirmed
+        job.tx_hash = tx_hash
+        job.result = {**(job.result or {}), "txHash": tx_hash}
+    db.session.commit()
+    logger.info("Anchor batch %s submitted %s CID(s) in %s", batch.id, batch.size, tx_hash)
+    for job in submitted:
+        emit_job(job)
+    return batch
+
+
+def batch_mined(tx_hash: str, receipt) -> List[ApprovalJob]:
+    """Attach proofs and finish the jobs of a confirmed saveRoot; returns the jobs. The caller commits."""
+    batch = AnchorBatch.query.filter_by(tx_hash=tx_hash).first()
+    if batch is None:
+        return []
+    onchain_id = _batch_anchored_id(receipt)
+    if onchain_id is None:
+        logger.warning("saveRoot transaction %s has no BatchAnchored event", tx_hash)
+    batch.onchain_batch_id = onchain_id
+    batch.status = AnchorBatch.CONFIRMED
+    contributions = Contribution.query.filter_by(anchor_batch_id=batch.id).order_by(Contribution.id).all()
+    tree = MerkleTree([c.ipfs_cid for c in contributions])  # Same order as when the root was built
+    for index, c in enumerate(contributions):
+        c.anchor_proof = json.dumps(tree.proof(index))
+    jobs = ApprovalJob.query.filter_by(tx_hash=tx_hash, state=ApprovalJob.ANCHORING).all()
+    for job in jobs:
+        job.state = ApprovalJob.DONE
+        job.error = None
+        job.result = {**(job.result or {}), "anchorBatchId": onchain_id}
+    return jobs
+
+
+def batch_failed(tx_hash: str, status: str, config) -> List[ApprovalJob]:
+    """Release the contributions of a reverted or dropped saveRoot for another batch. The caller commits."""
+    batch = AnchorBatch.query.filter_by(tx_hash=tx_hash).first()
+    if batch is None:
+        return []
+    logger.warning("saveRoot %s for anchor batch %s was %s; releasing its contributions", tx_hash, batch.id, status)
+    _release(batch, f"saveRoot {status}")
+    jobs = ApprovalJob.query.filter_by(tx_hash=tx_hash, state=ApprovalJob.ANCHORING).all()
+    for job in jobs:
+        job.tx_hash = None
+    _retry_later(jobs, f"transaction {status}", config)
+    return jobs
+
+
+def _batch_anchored_id(receipt) -> Optional[int]:
+    """``batchId`` of the BatchAnchored event in a saveRoot receipt."""
+    for log in receipt.get("logs") or []:
+        topics = [str(t).lower() for t in log.get("topics") or []]
+        if len(topics) >= 3 and topics[0] == BATCH_ANCHORED_TOPIC:
+            return int(topics[2], 16)
+    return None
@@ -0,0 +1,298 @@
+import os
+import time
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from backend.config import Config
+from backend.extensions import db
+from backend.models.approval_job import ApprovalJob
+from backend.models.contribution import Contribution
+from backend.models.user import User
+from backend.services.chain import chain
+from backend.services.cid import compute_cid
+from backend.services.storage import upload_file_to_pinata, pinata_auth_status, upload_path
+from backend.services import feed, metrics, realtime, receipts
+
+REWARD_AMOUNT = 100.00
+
+logger = logging.getLogger(__name__)
+
+
+class AlreadyAccepted(RuntimeError):
+    """The contribution was accepted (and its author rewarded) before."""
+
+
+def init_app(app) -> None:
+    """Create the approval worker pool and pick up jobs left over from a previous run."""
+    workers = app.config["APPROVAL_WORKERS"]
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="approval") if workers > 0 else None
+    app.extensions["approvals"] = executor
+    if executor and app.config["BACKGROUND_SERVICES"] and not app.testing:
+        with app.app_context():
+            try:
+                resume_pending(app)
+            except Exception as e:
+                # approval_jobs may not exist yet on a fresh database
+                logger.warning("Could not resume pending approval jobs: %s", e)
+
+
+def _active_job(contribution_id: int) -> Optional[ApprovalJob]:
+    return ApprovalJob.query.filter(
+        ApprovalJob.contribution_id == contribution_id,
+        ApprovalJob.state.in_(ApprovalJob.ACTIVE_STATES),
+    ).first()
+
+
+def enqueue(contribution: Contribution, requested_by: Optional[int] = None) -> ApprovalJob:
+    """Queue approval of a contribution, reusing its in-flight job if there is one.
+
+    Raises AlreadyAccepted if the contribution was accepted before, so the
+    reward is never paid twice.
+    """
+    from flask import current_app
+
+    contribution_id = contribution.id
+    job = _active_job(contribution_id)
+    if job:
+        return job
+    done = ApprovalJob.query.filter_by(contribution_id=contribution_id, state=ApprovalJob.DONE).first()
+    if contribution.status == "Accepted" or done:
+        raise AlreadyAccepted(f"Contribution {contribution_id} is already accepted")
+
+    job = ApprovalJob(contribution_id=contribution_id, requested_by=requested_by, state=ApprovalJob.QUEUED)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent accept queued one first (uq_approval_jobs_active_contribution)
+        db.session.rollback()
+        return _active_job(contribution_id)
+    emit_job(job)
+
+    app = current_app._get_current_object()
+    executor = app.extensions.get("approvals")
+    if executor is None:
+        # Inline mode (APPROVAL_WORKERS=0), used by tests and single-threaded tooling
+        run_job(app, job.id)
+        db.session.refresh(job)
+    else:
+        executor.submit(run_job, app, job.id)
+    return job
+
+
+def resume_pending(app) -> int:
+    """Requeue jobs a crashed or restarted worker left behind and submit everything queued."""
+    stale_before = datetime.utcnow() - timedelta(seconds=app.config["APPROVAL_STALE_SECONDS"])
+    # Jobs with a result were already accepted and are only waiting for a batch anchor
+    ApprovalJob.query.filter(
+        ApprovalJob.state.in_((ApprovalJob.PINNING, ApprovalJob.ANCHORING)),
+        ApprovalJob.result_json.is_(None),
+        ApprovalJob.updated_at < stale_before,
+    ).update({"state": ApprovalJob.QUEUED}, synchronize_session=False)
+    db.session.commit()
+
+    executor = app.extensions.get("approvals")
+    job_ids = [j.id for j in ApprovalJob.query.filter_by(state=ApprovalJob.QUEUED).all()]
+    for job_id in job_ids:
+        executor.submit(run_job, app, job_id)
+    if job_ids:
+        logger.info("Resumed %s queued approval job(s)", len(job_ids))
+    return len(job_ids)
+
+
+def run_job(app, job_id: int) -> None:
+    started = time.perf_counter()
+    outcome = "ok"
+    with app.app_context():
+        try:
+            _process(job_id, app.config)
+        except Exception as e:
+            outcome = "error"
+            db.session.rollback()
+            logger.exception("Approval job %s failed", job_id)
+            job = db.session.get(ApprovalJob, job_id)
+            if job:
+                job.state = ApprovalJob.FAILED
+                job.error = str(e)
+                db.session.commit()
+                emit_job(job)
+        finally:
+            db.session.remove()
+            metrics.APPROVAL_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+
+
+def _process(job_id: int, config) -> None:
+    # Claim the job atomically so a resumed job is never run twice
+    claimed = ApprovalJob.query.filter_by(id=job_id, state=ApprovalJob.QUEUED).update(
+        {"state": ApprovalJob.PINNING, "attempts": ApprovalJob.attempts + 1, "error": None},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    if not claimed:
+        return
+
+    job = db.session.get(ApprovalJob, job_id)
+    emit_job(job)
+    c = Contribution.with_author().filter(Contribution.id == job.contribution_id).one()
+    logger.info("Starting approval for contribution %s (job %s)", c.id, job_id)
+
+    ipfs_metadata = pin_contribution(c, config["UPLOAD_FOLDER"], progress=_progress_reporter(job_id))
+    ipfs_hash = ipfs_metadata.get("cid") if ipfs_metadata else None
+    job.ipfs_cid = ipfs_hash
+    job.state = ApprovalJob.ANCHORING
+    db.session.commit()
+    emit_job(job)
+
+    # In batch mode the job stays in "anchoring" until the batcher commits its Merkle root
+    batched = bool(ipfs_hash) and config["ANCHOR_MODE"] == "batch"
+    tx_hash = anchor_hash(ipfs_hash, contribution_id=c.id, user_id=c.author_id) if ipfs_hash and not batched else None
+
+    # Update contribution with IPFS metadata, approved status, and reward amount
+    c.ipfs_cid = ipfs_hash
+    if ipfs_metadata:
+        c.ipfs_file_size = ipfs_metadata.get("size")
+        c.ipfs_pin_timestamp = ipfs_metadata.get("timestamp")
+    # Guarded: a job that finished since this one was queued already paid the reward
+    accepted = Contribution.query.filter(
+        Contribution.id == c.id,
+        or_(Contribution.status.is_(None), Contribution.status != "Accepted"),
+    ).update({"status": "Accepted", "reward_amount": REWARD_AMOUNT}, synchronize_session=False)
+    if not accepted:
+        raise AlreadyAccepted(f"Contribution {c.id} is already accepted")
+    author_id = c.author_id
+    # In SQL: jobs for the same author run concurrently on the worker pool
+    User.query.filter_by(id=author_id).update(
+        {"cnri_balance": db.func.coalesce(User.cnri_balance, 0.0) + REWARD_AMOUNT}, synchronize_session=False,
+    )
+    new_balance = db.session.scalar(db.select(User.cnri_balance).where(User.id == author_id))
+    contribution_id = c.id
+
+    job.tx_hash = tx_hash
+    if not batched:
+        job.state = ApprovalJob.DONE
+    job.result = {
+        "status": "ok",
+        "newStatus": "Accepted",
+        "message": f"Contribution approved! Rewarded {REWARD_AMOUNT:.2f} CTRI tokens.",
+        "ipfsHash": ipfs_hash,
+        "ipfsGatewayUrl": f"https://ipfs.io/ipfs/{ipfs_hash}" if ipfs_hash else None,
+        "pinataDashboardUrl": "https://app.pinata.cloud/pinmanager",
+        "txHash": tx_hash,
+        "rewardAmount": REWARD_AMOUNT,
+        "userBalance": new_balance,
+        "uploadedFileName": ipfs_metadata.get("name") if ipfs_metadata else None,
+        "uploadedFileSize": ipfs_metadata.get("size") if ipfs_metadata else None,
+    }
+    db.session.commit()
+    logger.info("Contribution %s approved with IPFS CID %s", contribution_id, ipfs_hash)
+
+    emit_job(job)
+    feed.status_changed(contribution_id, "Accepted")
+    realtime.emit_to_user("contribution_reviewed", {
+        "id": contribution_id,
+        "status": "Accepted",
+        "message": f"Your contribution has been approved! You earned {REWARD_AMOUNT:.2f} CTRI tokens. New balance: {new_balance:.2f} CTRI",
+        "ipfsHash": ipfs_hash,
+        "txHash": tx_hash,
+        "userId": author_id,
+        "rewardAmount": REWARD_AMOUNT,
+        "newBalance": new_balance,
+    }, author_id)
+
+
+def pin_contribution(c: Contribution, upload_folder: str, progress=None) -> Dict[str, Any]:
+    """Pin the contribution's file to IPFS, or a text entry when it has no file.
+
+    Content that is already pinned for another contribution (same locally
+    computed CID) is not uploaded again; that pin's metadata is reused.
+    """
+    local_path = None
+    if c.file_url:
+        local_path = upload_path(c.file_url, upload_folder)
+        if not local_path or not os.path.exists(local_path):
+            logger.warning("File not found at %s", local_path)
+            local_path = None
+        elif not c.content_cid:
+            # Uploaded before CIDs were recorded
+            c.content_cid = compute_cid(local_path)
+
+    if c.content_cid:
+        pinned = Contribution.query.filter(
+            Contribution.content_cid == c.content_cid,
+            Contribution.ipfs_cid.isnot(None),
+            Contribution.id != c.id,
+        ).first()
+        if pinned:
+            logger.info("Content %s already pinned by contribution %s, skipping upload", c.content_cid, pinned.id)
+            return {
+                "cid": pinned.ipfs_cid,
+                "size": pinned.ipfs_file_size,
+                "timestamp": pinned.ipfs_pin_timestamp,
+                "name": os.path.basename(c.file_url) if c.file_url else None,
+                "deduplicated": True,
+            }
+
+    auth_status = pinata_auth_status()
+    if not auth_status.get("ok"):
+        raise RuntimeError(f"Pinata authentication failed: {auth_status}")
+
+    if local_path:
+        pinata_filename = os.path.basename(c.file_url) or f"contribution_{c.id}"
+        logger.info("Uploading %s to Pinata as %s", local_path, pinata_filename)
+        return upload_file_to_pinata(local_path, name=pinata_filename, progress=progress)
+
+    logger.info("No file to upload for contribution %s, pinning a text entry", c.id)
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, encoding="utf-8") as tmp:
+        tmp.write(f"Contribution: {c.title}\nDescription: {c.description}\nAuthor: {c.author.email}")
+        tmp_path = tmp.name
+    text_filename = f"{c.title}.txt" if c.title else f"contribution_{c.id}_text.txt"
+    try:
+        return upload_file_to_pinata(tmp_path, name=text_filename)
+    finally:
+        os.unlink(tmp_path)
+
+
+def chain_configured() -> bool:
+    """Whether a contract and signing key are set up; without them anchoring is skipped."""
+    try:
+        return bool(chain.contract_address() and Config.DEPLOYER_PRIVATE_KEY)
+    except Exception:
+        return False
+
+
+def anchor_hash(ipfs_hash: str, contribution_id: Optional[int] = None, user_id: Optional[int] = None) -> Optional[str]:
+    """Store the CID on-chain via saveHash. Blockchain is optional: failures return None.
+
+    The transaction is tracked for its receipt; the caller commits.
+    """
+    if not chain_configured():
+        return None
+    try:
+        tx_hash = chain.transact(chain.contract().functions.saveHash(ipfs_hash), gas=300000)
+        logger.info("saveHash transaction sent: %s", tx_hash)
+        receipts.track(tx_hash, "anchor", contribution_id=contribution_id, user_id=user_id)
+        return tx_hash
+    except Exception as e:
+        logger.warning("saveHash transaction failed (the IPFS pin stands): %s", e)
+        return None
+
+
+def emit_job(job: ApprovalJob) -> None:
+    realtime.emit_to_admins("approval_job_updated", job.to_dict())
+
+
+def _progress_reporter(job_id: int):
+    """Emit upload progress for a job in 10% steps rather than once per chunk."""
+    last = {"percent": -10}
+
+    def report(sent: int, total: int) -> None:
+        percent = int(sent * 100 / total) if total else 100
+        if percent >= last["percent"] + 10 or (percent == 100 and last["percent"] != 100):
+            last["percent"] = percent
+            realtime.emit_to_admins("approval_job_progress", {"id": job_id, "sent": sent, "total": total, "percent": percent})
+
+    return report
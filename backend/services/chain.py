@@ -0,0 +1,288 @@
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from backend.config import Config
+from backend.services.metrics import rpc_timing_middleware, timed
+
+logger = logging.getLogger(__name__)
+
+
+class ContractNotDeployed(RuntimeError):
+    pass
+
+
+def is_nonce_error(exc: Exception) -> bool:
+    """Whether a send failed because the node disagrees with our nonce."""
+    # Not "underpriced" or "already known": those reject the fee or a duplicate, not the nonce
+    return "nonce" in str(exc).lower()
+
+
+class NonceManager:
+    """Lock-protected nonce allocator for one signing account.
+
+    Nonces are handed out locally, so concurrent senders neither race for the
+    same value nor pay an RPC round-trip per transaction. The counter syncs
+    from the node's pending transaction count on first use and whenever a
+    send fails with a nonce error; a resync never goes below a nonce that
+    is still being sent or was sent and not yet mined, since the node may
+    not count those yet. Nonces released by sends that never reached the
+    node are reused before new ones so no gap is left behind.
+    """
+
+    def __init__(self, w3: Web3, address: str):
+        self._w3 = w3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        self._released: Set[int] = set()
+        self._sending: Set[int] = set()  # Allocated, send not finished
+        self.pending: Set[int] = set()  # Sent, not yet seen mined
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._next is None:
+                self._sync()
+            if self._released:
+                nonce = min(self._released)
+                self._released.discard(nonce)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._sending.add(nonce)
+            return nonce
+
+    def sent(self, nonce: int) -> None:
+        with self._lock:
+            self._sending.discard(nonce)
+            self.pending.add(nonce)
+
+    def release(self, nonce: int) -> None:
+        """Return a nonce whose transaction was never accepted by the node."""
+        with self._lock:
+            self._sending.discard(nonce)
+            if self._next is not None and nonce < self._next:
+                self._released.add(nonce)
+
+    def confirmed(self, nonce: int) -> None:
+        with self._lock:
+            self.pending = {n for n in self.pending if n > nonce}
+
+    def resync(self, rejected: Optional[int] = None) -> None:
+        """Re-read the node's count; ``rejected`` is a nonce the node refused or dropped.
+
+        If the node has not used ``rejected`` either, it is handed out again
+        so later transactions are not stuck behind the gap.
+        """
+        with self._lock:
+            self._sending.discard(rejected)
+            self.pending.discard(rejected)
+            node_next = self._sync()
+            if rejected is not None and node_next <= rejected < self._next:
+                self._released.add(rejected)
+
+    def _sync(self) -> int:
+        node_next = self._w3.eth.get_transaction_count(self.address, "pending")
+        in_use = self._sending | self.pending
+        self._next = max(node_next, max(in_use) + 1) if in_use else node_next
+        self._released = set()
+        return node_next
+
+
+class ChainClient:
+    """Process-wide web3 access shared by every request.
+
+    Owns one Web3 instance over a pooled keep-alive HTTP session and caches
+    the parsed contract ABI (re-read only when the file's mtime changes),
+    the contract handle, the chain id and the deployer account.
+    """
+
+    def __init__(self, provider=None):
+        self._provider = provider  # Override the HTTP provider, e.g. with eth-tester
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._w3: Optional[Web3] = None
+        self._w3_url: Optional[str] = None
+        self._abi_key = None
+        self._abi_data: Optional[Dict[str, Any]] = None
+        self._contract = None
+        self._contract_key = None
+        self._chain_id: Optional[int] = None
+        self._account = None
+        self._account_key: Optional[str] = None
+        self._nonces: Dict[str, NonceManager] = {}
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def w3(self) -> Web3:
+        url = Config.GANACHE_URL
+        with self._lock:
+            if self._provider is not None:
+                if self._w3 is None:
+                    self._w3 = Web3(self._provider)
+                    self._w3.middleware_onion.add(rpc_timing_middleware, "rpc_timing")
+                return self._w3
+            if self._w3 is None or self._w3_url != url:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.CHAIN_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._w3 = Web3(Web3.HTTPProvider(
+                    url, session=session, request_kwargs={"timeout": Config.CHAIN_RPC_TIMEOUT},
+                ))
+                self._w3.middleware_onion.add(rpc_timing_middleware, "rpc_timing")
+                self._w3_url = url
+                self._session = session
+                self._contract = None
+                self._chain_id = None
+                self._nonces = {}
+            return self._w3
+
+    def contract_data(self) -> Dict[str, Any]:
+        """Parsed contract build file ({"abi": [...], "address": ...})."""
+        path = Config.CONTRACT_ABI_PATH
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            if self._abi_key != (path, mtime):
+                with open(path, "r") as f:
+                    self._abi_data = json.load(f)
+                self._abi_key = (path, mtime)
+                self._contract = None
+            return self._abi_data
+
+    def contract_address(self) -> Optional[str]:
+        return Config.CONTRACT_ADDRESS or self.contract_data().get("address")
+
+    def contract(self):
+        data = self.contract_data()
+        address = Config.CONTRACT_ADDRESS or data.get("address")
+        if not address:
+            raise ContractNotDeployed("Contract not deployed")
+        w3 = self.w3
+        with self._lock:
+            key = (address, self._abi_key)
+            if self._contract is None or self._contract_key != key:
+                self._contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=data["abi"])
+                self._contract_key = key
+            return self._contract
+
+    @property
+    def chain_id(self) -> int:
+        w3 = self.w3
+        with self._lock:
+            if self._chain_id is None:
+                self._chain_id = w3.eth.chain_id
+            return self._chain_id
+
+    @property
+    def account(self):
+        key = Config.DEPLOYER_PRIVATE_KEY
+        with self._lock:
+            if self._account is None or self._account_key != key:
+                self._account = self.w3.eth.account.from_key(key)
+                self._account_key = key
+            return self._account
+
+    def nonces(self, address: str) -> NonceManager:
+        w3 = self.w3
+        with self._lock:
+            if address not in self._nonces:
+                self._nonces[address] = NonceManager(w3, address)
+            return self._nonces[address]
+
+    def transact(self, fn, gas: int) -> str:
+        """Sign a contract call with the deployer key, send it, and return the tx hash."""
+        acct = self.account
+        tx = fn.build_transaction({
+            "from": acct.address,
+            "gas": gas,
+            "maxFeePerGas": self.w3.to_wei("2", "gwei"),
+            "maxPriorityFeePerGas": self.w3.to_wei("1", "gwei"),
+            "chainId": self.chain_id,
+        })
+        return self.send_transaction(tx)
+
+    def send_transaction(self, tx: Dict[str, Any]) -> str:
+        """Fill in a managed nonce, sign with the deployer key and broadcast.
+
+        A nonce rejection resyncs the allocator from the node and retries once.
+        Whatever the outcome, a nonce that did not reach the node is given
+        back, so one failed send cannot leave a gap later ones wait behind.
+        """
+        w3 = self.w3
+        acct = self.account
+        nonces = self.nonces(acct.address)
+        tx = {
+            "from": acct.address,
+            "maxFeePerGas": w3.to_wei("2", "gwei"),
+            "maxPriorityFeePerGas": w3.to_wei("1", "gwei"),
+            "chainId": self.chain_id,
+            **tx,
+        }
+        for attempt in range(2):
+            nonce = nonces.allocate()
+            try:
+                signed = acct.sign_transaction({**tx, "nonce": nonce})
+                tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction).hex()
+            except Exception as e:
+                if not is_nonce_error(e):
+                    nonces.release(nonce)
+                    raise
+                logger.warning("Nonce %s rejected (%s); resyncing", nonce, e)
+                nonces.resync(rejected=nonce)
+                if attempt:
+                    raise
+                continue
+            nonces.sent(nonce)
+            return tx_hash
+
+    def rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """Run several JSON-RPC calls in one HTTP round-trip; returns results in order.
+
+        A call that errors yields None. Injected (non-HTTP) providers, and
+        nodes that answer a batch with anything but a list (e.g. a single
+        error object when batching is disabled), are called one by one.
+        """
+        w3 = self.w3
+        if self._session is None:
+            return [self._request_or_none(w3, method, params) for method, params in calls]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        with timed("web3", "batch"):
+            resp = self._session.post(self._w3_url, json=payload, timeout=Config.CHAIN_RPC_TIMEOUT)
+            resp.raise_for_status()
+        body = resp.json()
+        if not isinstance(body, list):
+            logger.warning("JSON-RPC batch not supported by %s (%s); sending %d calls one by one", self._w3_url, body, len(calls))
+            return [self._request_or_none(w3, method, params) for method, params in calls]
+        by_id = {item.get("id"): item.get("result") for item in body if isinstance(item, dict)}
+        return [by_id.get(i) for i in range(len(calls))]
+
+    @staticmethod
+    def _request_or_none(w3: Web3, method: str, params: list) -> Any:
+        try:
+            return w3.manager.request_blocking(method, params)
+        except Exception:
+            return None
+
+    def reset(self) -> None:
+        """Drop every cached object, e.g. after redeploying the contract."""
+        with self._lock:
+            self._clear()
+
+    def use_provider(self, provider) -> None:
+        """Send every call through ``provider`` (e.g. eth-tester); None restores GANACHE_URL."""
+        with self._lock:
+            self._provider = provider
+            self._clear()
+
+
+chain = ChainClient()
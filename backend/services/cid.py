@@ -0,0 +1,138 @@
+"""Local IPFS CID computation matching `ipfs add` defaults.
+
+Files are split into 256 KiB chunks and assembled into a balanced UnixFS
+DAG with at most 174 links per node. CIDv0 wraps each chunk in a UnixFS
+dag-pb leaf; CIDv1 uses raw leaves, as ``ipfs add --cid-version=1`` does.
+"""
+import base64
+import hashlib
+from typing import Iterator, List, Tuple
+
+CHUNK_SIZE = 256 * 1024
+MAX_LINKS = 174
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_SHA2_256 = b"\x12\x20"
+_CODEC_RAW = 0x55
+_CODEC_DAG_PB = 0x70
+_UNIXFS_FILE = 2
+
+# (hash bytes used in parent links, cumulative Tsize, file bytes below this node)
+_Node = Tuple[bytes, int, int]
+
+
+def compute_cid(path: str, version: int = 0) -> str:
+    """Return the CID ``ipfs add`` would assign to the file at ``path``."""
+    if version not in (0, 1):
+        raise ValueError("CID version must be 0 or 1")
+    with open(path, "rb") as f:
+        root = _build_dag(_leaves(f, raw=version == 1), raw=version == 1)
+    if version == 0:
+        return _b58encode(root[0])
+    return "b" + base64.b32encode(root[0]).decode("ascii").lower().rstrip("=")
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _bytes_field(field: int, value: bytes) -> bytes:
+    return _varint(field << 3 | 2) + _varint(len(value)) + value
+
+
+def _int_field(field: int, value: int) -> bytes:
+    return _varint(field << 3) + _varint(value)
+
+
+def _multihash(data: bytes) -> bytes:
+    return _SHA2_256 + hashlib.sha256(data).digest()
+
+
+def _link_hash(node: bytes, codec: int, raw: bool) -> bytes:
+    mh = _multihash(node)
+    return b"\x01" + _varint(codec) + mh if raw else mh
+
+
+def _leaves(f, raw: bool) -> Iterator[_Node]:
+    first = True
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk and not first:
+            return
+        first = False
+        if raw:
+            yield _link_hash(chunk, _CODEC_RAW, raw), len(chunk), len(chunk)
+        else:
+            unixfs = _int_field(1, _UNIXFS_FILE)
+            if chunk:  # the empty file's leaf carries no Data field
+                unixfs += _bytes_field(2, chunk)
+            unixfs += _int_field(3, len(chunk))
+            node = _bytes_field(1, unixfs)
+            yield _multihash(node), len(node), len(chunk)
+        if len(chunk) < CHUNK_SIZE:
+            return
+
+
+def _internal(children: List[_Node], raw: bool) -> _Node:
+    filesize = sum(child[2] for child in children)
+    unixfs = _int_field(1, _UNIXFS_FILE) + _int_field(3, filesize)
+    links = b""
+    for link_hash, tsize, child_size in children:
+        unixfs += _int_field(4, child_size)
+        # dag-pb serializes Links (field 2) before Data (field 1); Name is always present, empty
+        links += _bytes_field(2, _bytes_field(1, link_hash) + _bytes_field(2, b"") + _int_field(3, tsize))
+    node = links + _bytes_field(1, unixfs)
+    return _link_hash(node, _CODEC_DAG_PB, raw), len(node) + sum(child[1] for child in children), filesize
+
+
+class _Peekable:
+    def __init__(self, it: Iterator[_Node]):
+        self._it = it
+        self._next = next(it, None)
+
+    def done(self) -> bool:
+        return self._next is None
+
+    def pop(self) -> _Node:
+        item, self._next = self._next, next(self._it, None)
+        return item
+
+
+def _build_dag(leaves: Iterator[_Node], raw: bool) -> _Node:
+    """Balanced layout: the tree grows one level at a time, the old root becoming the first child."""
+    source = _Peekable(leaves)
+    root = source.pop()
+    depth = 1
+    while not source.done():
+        children = [root]
+        _fill(children, depth, source, raw)
+        root = _internal(children, raw)
+        depth += 1
+    return root
+
+
+def _fill(children: List[_Node], depth: int, source: _Peekable, raw: bool) -> None:
+    while len(children) < MAX_LINKS and not source.done():
+        if depth == 1:
+            children.append(source.pop())
+        else:
+            subtree: List[_Node] = []
+            _fill(subtree, depth - 1, source, raw)
+            children.append(_internal(subtree, raw))
+
+
+def _b58encode(data: bytes) -> str:
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, rem = divmod(n, 58)
+        out = _B58_ALPHABET[rem] + out
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + out
@@ -0,0 +1,104 @@
+"""Resized image derivatives of content-addressed uploads.
+
+Derivatives are generated on first request and cached on disk under
+DERIVATIVE_FOLDER/<preset>/<ab>/<sha256>.<ext>. The cache is bounded by
+DERIVATIVE_CACHE_MAX_BYTES; the least recently served files are evicted
+first (a cache hit refreshes the file's mtime). Pillow is optional: without
+it callers fall back to the original upload.
+"""
+import os
+import logging
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# name -> (max width, max height, crop to fill)
+PRESETS: Dict[str, Tuple[int, int, bool]] = {
+    "avatar": (64, 64, True),
+    "card": (320, 320, False),
+}
+
+_cache_lock = threading.Lock()
+_cache_bytes: Dict[str, int] = {}  # folder -> bytes currently cached
+
+
+def ensure_derivative(source: str, sha256: str, preset: str, folder: str, max_bytes: int) -> Optional[Tuple[str, str]]:
+    """(path, mimetype) of the cached derivative, generating it if needed.
+
+    None when Pillow is not installed or the source is not a readable image.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    for ext, mimetype in (("png", "image/png"), ("jpg", "image/jpeg")):
+        path = os.path.join(folder, preset, sha256[:2], f"{sha256}.{ext}")
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used
+            return path, mimetype
+
+    width, height, crop = PRESETS[preset]
+    try:
+        with Image.open(source) as img:
+            img.draft("RGB", (width * 2, height * 2))  # Cheap JPEG downscale while decoding
+            img = ImageOps.exif_transpose(img)
+            if crop:
+                img = ImageOps.fit(img, (width, height), Image.LANCZOS)
+            else:
+                img.thumbnail((width, height), Image.LANCZOS)
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            if has_alpha:
+                img, ext, fmt, mimetype = img.convert("RGBA"), "png", "PNG", "image/png"
+            else:
+                img, ext, fmt, mimetype = img.convert("RGB"), "jpg", "JPEG", "image/jpeg"
+            path = os.path.join(folder, preset, sha256[:2], f"{sha256}.{ext}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as out:
+                img.save(out, fmt, optimize=True, **({"quality": 85} if fmt == "JPEG" else {}))
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning("Cannot create %s derivative for %s: %s", preset, sha256, e)
+        return None
+    size = os.path.getsize(tmp_path)
+    os.replace(tmp_path, path)
+    _account(folder, size, max_bytes)
+    return path, mimetype
+
+
+def _scan(folder: str):
+    files = []
+    for root, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    return files
+
+
+def _account(folder: str, added: int, max_bytes: int) -> None:
+    with _cache_lock:
+        if folder not in _cache_bytes:
+            _cache_bytes[folder] = sum(size for _, size, _ in _scan(folder))
+        else:
+            _cache_bytes[folder] += added
+        if _cache_bytes[folder] <= max_bytes:
+            return
+        # Evict least recently used down to 90% of the bound so eviction is not run on every write
+        target = max_bytes * 0.9
+        files = sorted(_scan(folder))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        _cache_bytes[folder] = total
@@ -0,0 +1,72 @@
+"""Coalesced ``contributions_batch`` events for the public contribution feed.
+
+Changes published within FEED_BATCH_WINDOW_MS are merged per contribution
+and broadcast as one message holding only ids and changed fields; clients
+fetch full cards from the REST API when they need them. Each app's
+coalescer (``app.extensions["feed"]``) sends at most
+FEED_MAX_BATCHES_PER_SECOND batches a second, however bursty submissions
+are. The cap is per process: with several server processes sharing a
+SOCKETIO_MESSAGE_QUEUE, clients can see that many batches from each.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from flask import current_app
+from backend.extensions import socketio
+
+EVENT = "contributions_batch"
+
+
+class FeedCoalescer:
+    def __init__(self, window: float = 0.2, max_per_second: float = 4.0,
+                 emit: Optional[Callable[[str, Any], None]] = None):
+        self.window = window
+        self.max_per_second = max_per_second
+        self._emit = emit or socketio.emit
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._scheduled = False
+        self._last_flush = 0.0
+
+    def publish(self, contribution_id: int, **fields) -> None:
+        """Queue changed fields of a contribution for the next batch."""
+        with self._lock:
+            self._pending.setdefault(str(contribution_id), {}).update(fields)
+            if self._scheduled:
+                return
+            self._scheduled = True
+            min_gap = 1.0 / self.max_per_second if self.max_per_second > 0 else 0.0
+            delay = max(self.window, self._last_flush + min_gap - time.monotonic())
+        socketio.start_background_task(self._flush_after, delay)
+
+    def _flush_after(self, delay: float) -> None:
+        socketio.sleep(delay)
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+            self._last_flush = time.monotonic()
+        if pending:
+            self._emit(EVENT, {"items": [{"id": cid, **fields} for cid, fields in pending.items()]})
+
+
+def init_app(app) -> None:
+    app.extensions["feed"] = FeedCoalescer(
+        app.config["FEED_BATCH_WINDOW_MS"] / 1000.0, app.config["FEED_MAX_BATCHES_PER_SECOND"],
+    )
+
+
+def contribution_created(c) -> None:
+    current_app.extensions["feed"].publish(
+        c.id,
+        title=c.title,
+        status=c.status,
+        authorId=c.author_id,
+        createdAt=c.created_at.isoformat() if c.created_at else None,
+    )
+
+
+def status_changed(contribution_id: int, status: str) -> None:
+    current_app.extensions["feed"].publish(contribution_id, status=status)
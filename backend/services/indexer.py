@@ -0,0 +1,168 @@
+"""Resumable contract event indexer.
+
+Scans the contract's ``Transfer`` and ``HashSaved`` logs with
+``eth_getLogs`` in INDEXER_CHUNK_SIZE block ranges and writes them to
+``token_transfers`` and ``hash_anchors``, checkpointing the last processed
+block (and its hash) after every chunk. If the checkpointed block's hash no
+longer matches the chain, the indexer rolls back INDEXER_REORG_DEPTH blocks
+and re-indexes from there.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+from eth_abi import decode as abi_decode
+from eth_utils import keccak
+from web3 import Web3
+from backend.extensions import db
+from backend.models.hash_anchor import HashAnchor, IndexerCheckpoint
+from backend.models.token import TokenTransfer
+from backend.services.chain import chain, ContractNotDeployed
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT = "contract_events"
+TRANSFER_TOPIC = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+HASH_SAVED_TOPIC = "0x" + keccak(text="HashSaved(address,string)").hex()
+TOKEN_DECIMALS = 18
+
+
+def init_app(app) -> None:
+    """Start the indexing loop (not under testing; tests call ``run_once`` directly)."""
+    if app.testing:
+        return
+    interval = app.config["INDEXER_POLL_INTERVAL"]
+
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    run_once(app.config)
+                except Exception as e:
+                    logger.error("Indexing failed: %s", e)
+                finally:
+                    db.session.remove()
+            time.sleep(interval)
+
+    threading.Thread(target=run, name="event-indexer", daemon=True).start()
+
+
+def _hex(value) -> str:
+    if isinstance(value, str):
+        return value if value.startswith("0x") else "0x" + value
+    return "0x" + bytes(value).hex()
+
+
+def _topic_address(topic) -> str:
+    return Web3.to_checksum_address(_hex(topic)[-40:])
+
+
+def _checkpoint(address: str, start_block: int) -> IndexerCheckpoint:
+    cp = IndexerCheckpoint.query.filter_by(name=CHECKPOINT).first()
+    if cp is None:
+        cp = IndexerCheckpoint(name=CHECKPOINT)
+        db.session.add(cp)
+    if cp.contract_address != address:
+        # New or redeployed contract: index it from the start
+        cp.contract_address = address
+        cp.block_number = start_block - 1
+        cp.block_hash = None
+    return cp
+
+
+def _delete_from(block_number: int) -> None:
+    """Remove indexed rows at or above ``block_number``."""
+    TokenTransfer.query.filter(TokenTransfer.block_number >= block_number).delete(synchronize_session=False)
+    HashAnchor.query.filter(HashAnchor.block_number >= block_number).delete(synchronize_session=False)
+
+
+def _block_hash(w3: Web3, number: int) -> str:
+    return _hex(w3.eth.get_block(number)["hash"])
+
+
+def _check_reorg(w3: Web3, cp: IndexerCheckpoint, config) -> None:
+    if not cp.block_hash:
+        return
+    if _block_hash(w3, cp.block_number) == cp.block_hash:
+        return
+    start = config["INDEXER_START_BLOCK"]
+    rewind = max(cp.block_number - config["INDEXER_REORG_DEPTH"], start - 1)
+    logger.warning("Reorg detected at block %s; rolling back to %s", cp.block_number, rewind)
+    _delete_from(rewind + 1)
+    cp.block_number = rewind
+    cp.block_hash = _block_hash(w3, rewind) if rewind >= start else None
+    db.session.commit()
+
+
+def _store(log) -> None:
+    topics = log["topics"]
+    topic0 = _hex(topics[0])
+    data = bytes.fromhex(_hex(log["data"])[2:])
+    position = {
+        "tx_hash": _hex(log["transactionHash"]),
+        "block_number": log["blockNumber"],
+        "block_hash": _hex(log["blockHash"]),
+        "log_index": log["logIndex"],
+    }
+    if topic0 == TRANSFER_TOPIC:
+        db.session.add(TokenTransfer(
+            sender=_topic_address(topics[1]),
+            recipient=_topic_address(topics[2]),
+            amount=int.from_bytes(data, "big") / 10**TOKEN_DECIMALS,
+            **position,
+        ))
+    elif topic0 == HASH_SAVED_TOPIC:
+        (ipfs_hash,) = abi_decode(["string"], data)
+        db.session.add(HashAnchor(ipfs_hash=ipfs_hash, submitter=_topic_address(topics[1]), **position))
+
+
+def run_once(config) -> int:
+    """Index every confirmed block since the checkpoint; returns the number of logs stored."""
+    try:
+        address = chain.contract_address()
+    except (FileNotFoundError, ContractNotDeployed):
+        return 0
+    if not address:
+        return 0
+    address = Web3.to_checksum_address(address)
+    w3 = chain.w3
+
+    cp = _checkpoint(address, config["INDEXER_START_BLOCK"])
+    db.session.commit()
+    _check_reorg(w3, cp, config)
+
+    safe_head = w3.eth.block_number - config["INDEXER_CONFIRMATIONS"]
+    stored = 0
+    from_block = cp.block_number + 1
+    while from_block <= safe_head:
+        to_block = min(from_block + config["INDEXER_CHUNK_SIZE"] - 1, safe_head)
+        logs = w3.eth.get_logs({
+            "address": address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [[TRANSFER_TOPIC, HASH_SAVED_TOPIC]],
+        })
+        # Rows from an interrupted earlier run of this range are replaced, not duplicated
+        _delete_from(from_block)
+        for log in logs:
+            if log.get("removed"):
+                continue
+            _store(log)
+        cp.block_number = to_block
+        cp.block_hash = _block_hash(w3, to_block)
+        db.session.commit()
+        stored += len(logs)
+        from_block = to_block + 1
+    if stored:
+        logger.info("Indexed %s event(s) up to block %s", stored, cp.block_number)
+    return stored
+
+
+def anchors_for(ipfs_hash: str):
+    """Indexed HashSaved events for a CID, oldest first."""
+    return HashAnchor.query.filter_by(ipfs_hash=ipfs_hash).order_by(HashAnchor.block_number, HashAnchor.log_index).all()
+
+
+def last_indexed_block() -> Optional[int]:
+    cp = IndexerCheckpoint.query.filter_by(name=CHECKPOINT).first()
+    return cp.block_number if cp else None
@@ -0,0 +1,51 @@
+"""Keccak-256 Merkle trees over IPFS CIDs for batched on-chain anchoring.
+
+Leaves are ``keccak256(cid)`` and each parent hashes its two children in
+sorted order, so a proof is just the list of sibling hashes and matches the
+contract's ``verifyHash``. An unpaired node moves up a level unchanged.
+"""
+from typing import List, Sequence
+from eth_utils import keccak
+
+
+def leaf_hash(cid: str) -> bytes:
+    return keccak(cid.encode("utf-8"))
+
+
+def _parent(a: bytes, b: bytes) -> bytes:
+    return keccak(a + b) if a < b else keccak(b + a)
+
+
+class MerkleTree:
+    def __init__(self, cids: Sequence[str]):
+        if not cids:
+            raise ValueError("Cannot build a Merkle tree with no leaves")
+        self.cids = list(cids)
+        self.levels: List[List[bytes]] = [[leaf_hash(cid) for cid in self.cids]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[str]:
+        """Hex sibling hashes from the leaf at ``index`` up to the root."""
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append("0x" + level[sibling].hex())
+            index //= 2
+        return proof
+
+
+def verify(cid: str, proof: Sequence[str], root: bytes) -> bool:
+    node = leaf_hash(cid)
+    for sibling in proof:
+        node = _parent(node, bytes.fromhex(sibling[2:] if sibling.startswith("0x") else sibling))
+    return node == root
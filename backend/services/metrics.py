@@ -0,0 +1,175 @@
+"""In-process request, database and external-call metrics in Prometheus text format.
+
+Every request records its latency per route plus how many SQL statements it
+ran and how long they took (through SQLAlchemy cursor events), and returns a
+``Server-Timing`` header with the same breakdown. Calls to Pinata and the
+Ethereum node are timed with ``timed(service, operation)``, so a slow
+approval can be attributed to the database, IPFS or the chain.
+
+Metrics live in process memory: with several worker processes each one
+reports its own, so scrape them per process or sum them in Prometheus.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # per-bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            if slot < len(self.buckets):
+                series[slot] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in snapshot:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {_number(cumulative)}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, inf)} {_number(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {_number(series[-1])}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "contri_http_request_duration_seconds", "HTTP request latency by route.", ("method", "endpoint", "status"))
+REQUEST_QUERIES = Histogram(
+    "contri_http_request_db_queries", "SQL statements run per HTTP request.", ("endpoint",), QUERY_COUNT_BUCKETS)
+REQUEST_DB_SECONDS = Histogram(
+    "contri_http_request_db_seconds", "Time spent in SQL per HTTP request.", ("endpoint",))
+QUERY_SECONDS = Histogram(
+    "contri_db_query_duration_seconds", "SQL statement latency; context is request or background.", ("context",))
+EXTERNAL_SECONDS = Histogram(
+    "contri_external_call_duration_seconds", "Latency of calls to Pinata and the Ethereum node.",
+    ("service", "operation", "outcome"))
+APPROVAL_SECONDS = Histogram(
+    "contri_approval_job_duration_seconds", "Approval job run time from claim to finish.", ("outcome",))
+
+REGISTRY = [REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_DB_SECONDS, QUERY_SECONDS, EXTERNAL_SECONDS, APPROVAL_SECONDS]
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timed(service: str, operation: str) -> Iterator[None]:
+    """Time an external call; inside a request it also counts towards Server-Timing."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_SECONDS.observe(elapsed, service=service, operation=operation, outcome=outcome)
+        if has_request_context() and "metrics_start" in g:
+            g.external_seconds += elapsed
+
+
+def _endpoint() -> str:
+    # The route template keeps label cardinality bounded
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+def init_app(app) -> None:
+    from backend.extensions import db
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+        g.external_seconds = 0.0
+
+    @app.after_request
+    def record_request(response):
+        if "metrics_start" not in g:
+            return response
+        elapsed = time.perf_counter() - g.metrics_start
+        endpoint = _endpoint()
+        REQUEST_SECONDS.observe(elapsed, method=request.method, endpoint=endpoint, status=response.status_code)
+        REQUEST_QUERIES.observe(g.db_queries, endpoint=endpoint)
+        REQUEST_DB_SECONDS.observe(g.db_seconds, endpoint=endpoint)
+        response.headers["Server-Timing"] = (
+            f'db;dur={g.db_seconds * 1000:.1f};desc="{g.db_queries} queries", '
+            f"ext;dur={g.external_seconds * 1000:.1f}, app;dur={elapsed * 1000:.1f}"
+        )
+        return response
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    in_request = has_request_context() and "metrics_start" in g
+    QUERY_SECONDS.observe(elapsed, context="request" if in_request else "background")
+    if in_request:
+        g.db_queries += 1
+        g.db_seconds += elapsed
+
+
+def rpc_timing_middleware(make_request, w3):
+    """web3 middleware timing every JSON-RPC call by method."""
+    def middleware(method, params):
+        with timed("web3", method):
+            return make_request(method, params)
+    return middleware
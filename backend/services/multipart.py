@@ -0,0 +1,93 @@
+import io
+import mimetypes
+import os
+import uuid
+from typing import Callable, Dict, Optional
+
+
+class MultipartFileStream:
+    """Streaming multipart/form-data body for a single file upload.
+
+    Exposes ``read()`` and ``len`` so requests sends it with a Content-Length
+    header while http.client pulls it in small blocks, which keeps memory per
+    upload at one block however large the file is. ``progress(sent, total)``
+    is called as file bytes are handed to the socket.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        field: str = "file",
+        filename: Optional[str] = None,
+        fields: Optional[Dict[str, str]] = None,
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.path = path
+        self.file_size = os.path.getsize(path)
+        self.sent = 0
+
+        filename = filename or os.path.basename(path)
+        file_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        head = io.BytesIO()
+        for name, value in (fields or {}).items():
+            head.write(self._part_header(f'name="{name}"'))
+            head.write(value.encode("utf-8") + b"\r\n")
+        head.write(self._part_header(
+            f'name="{field}"; filename="{_quote(filename)}"', content_type=file_type,
+        ))
+        preamble = head.getvalue()
+        epilogue = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+
+        self.len = len(preamble) + self.file_size + len(epilogue)
+        self._parts = [io.BytesIO(preamble), None, io.BytesIO(epilogue)]
+        self._index = 0
+
+    def _part_header(self, disposition: str, content_type: Optional[str] = None) -> bytes:
+        header = f"--{self.boundary}\r\nContent-Disposition: form-data; {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    def __len__(self) -> int:
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.chunk_size
+        size = min(size, self.chunk_size)
+        while self._index < len(self._parts):
+            part = self._parts[self._index]
+            if part is None:
+                # Open the file lazily so a stream that is never sent holds no handle
+                part = self._parts[self._index] = open(self.path, "rb")
+            chunk = part.read(size)
+            if chunk:
+                if self._index == 1:
+                    self.sent += len(chunk)
+                    if self.progress:
+                        self.progress(self.sent, self.file_size)
+                return chunk
+            part.close()
+            self._index += 1
+        return b""
+
+    def close(self) -> None:
+        for part in self._parts:
+            if part is not None:
+                part.close()
+        self._index = len(self._parts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,122 @@
+"""Password hashing with a configurable KDF, run off the request threads.
+
+PASSWORD_HASH_METHOD picks scrypt, pbkdf2 (both through werkzeug) or
+bcrypt, with its cost from PASSWORD_SCRYPT_N, PASSWORD_PBKDF2_ITERATIONS
+or PASSWORD_BCRYPT_ROUNDS. Hashes made with other settings still verify,
+and ``verify_password`` hands back a replacement hash so logins upgrade
+stored hashes as the settings change.
+
+The KDF runs in a pool of PASSWORD_HASH_WORKERS processes (0 runs it
+inline). Each request thread waits for its own hash, so the pool bounds how
+many cores a login storm can take while the server keeps serving other
+requests. Workers are spawned, not forked, because the server has threads.
+If a worker dies (e.g. OOM-killed) the broken pool is replaced on the next
+call, and the call that hit it is retried once.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+import bcrypt
+from werkzeug.security import check_password_hash, generate_password_hash
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("scrypt", "pbkdf2", "bcrypt")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def current_scheme() -> str:
+    """Identifier of the configured method and cost, as found at the start of new hashes."""
+    method = Config.PASSWORD_HASH_METHOD
+    if method == "scrypt":
+        return f"scrypt:{Config.PASSWORD_SCRYPT_N}:8:1"
+    if method == "pbkdf2":
+        return f"pbkdf2:sha256:{Config.PASSWORD_PBKDF2_ITERATIONS}"
+    if method == "bcrypt":
+        return f"$2b${Config.PASSWORD_BCRYPT_ROUNDS:02d}$"
+    raise ValueError(f"Unknown PASSWORD_HASH_METHOD {method!r}; expected one of {', '.join(METHODS)}")
+
+
+def _scheme_of(stored: str) -> str:
+    if stored.startswith("$2"):
+        return stored[:7]  # "$2b$12$"
+    return stored.split("$", 1)[0]
+
+
+def _hash(password: str, scheme: str) -> str:
+    if scheme.startswith("$2"):
+        rounds = int(scheme[4:6])
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+    return generate_password_hash(password, method=scheme)
+
+
+def _verify(password: str, stored: str, scheme: str) -> Tuple[bool, Optional[str]]:
+    if stored.startswith("$2"):
+        try:
+            ok = bcrypt.checkpw(password.encode(), stored.encode())
+        except ValueError:
+            ok = False  # Malformed hash
+    else:
+        ok = check_password_hash(stored, password)
+    if not ok or _scheme_of(stored) == scheme:
+        return ok, None
+    return True, _hash(password, scheme)
+
+
+def _executor() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    workers = Config.PASSWORD_HASH_WORKERS
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info("Password hashing pool started with %d processes", workers)
+        return _pool
+
+
+def _discard(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:  # Another thread may already have replaced it
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+def _run(fn, *args):
+    for attempt in range(2):
+        executor = _executor()
+        if executor is None:
+            return fn(*args)
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            logger.warning("Password hashing pool broke; starting a new one")
+            _discard(executor)
+            if attempt:
+                raise
+
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password, current_scheme())
+
+
+def verify_password(password: str, stored: str) -> Tuple[bool, Optional[str]]:
+    """(matches, new hash) where the new hash is set only if ``stored`` uses outdated settings."""
+    if not stored:
+        return False, None
+    return _run(_verify, password, stored, current_scheme())
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,70 @@
+"""Socket.IO rooms and targeted emits.
+
+Connections authenticate with the same JWT as the REST API (``auth={"token":
+...}``, a ``token`` query parameter or an ``Authorization: Bearer`` header)
+and join ``user:<id>``, plus ``admin`` for admins. Events that concern one
+user go to that user's room and the admin room only; anonymous connections
+receive public broadcasts such as ``contributions_batch``.
+"""
+import logging
+from typing import Any, Optional
+from flask import request
+from flask_jwt_extended import decode_token
+from flask_socketio import join_room
+from backend.extensions import socketio
+from backend.utils.auth_utils import load_user
+
+logger = logging.getLogger(__name__)
+
+ADMIN_ROOM = "admin"
+
+
+def user_room(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _connection_token(auth: Optional[dict]) -> Optional[str]:
+    if isinstance(auth, dict) and auth.get("token"):
+        return auth["token"]
+    if request.args.get("token"):
+        return request.args["token"]
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        return header[len("Bearer "):]
+    return None
+
+
+def init_app(app) -> None:
+    # Registered per app: socketio.init_app() builds a new server each time
+    socketio.on_event("connect", on_connect)
+
+
+def on_connect(auth=None):
+    token = _connection_token(auth)
+    if not token:
+        return True  # Anonymous: public broadcasts only
+    try:
+        user_id = int(decode_token(token)["sub"])
+    except Exception as e:
+        logger.info("Rejected socket connection with invalid token: %s", e)
+        return False
+    user = load_user(user_id)
+    if not user:
+        return False
+    join_room(user_room(user.id))
+    if user.is_admin:
+        join_room(ADMIN_ROOM)
+    return True
+
+
+def emit_to_user(event: str, data: Any, user_id: Optional[int], admins: bool = True) -> None:
+    """Emit to one user's room, and to admins unless ``admins`` is False."""
+    rooms = [user_room(user_id)] if user_id is not None else []
+    if admins:
+        rooms.append(ADMIN_ROOM)
+    if rooms:
+        socketio.emit(event, data, to=rooms)
+
+
+def emit_to_admins(event: str, data: Any) -> None:
+    socketio.emit(event, data, to=ADMIN_ROOM)
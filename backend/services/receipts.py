@@ -0,0 +1,138 @@
+"""Background tracking of transactions the backend broadcasts.
+
+Senders record the hash with ``track`` and return immediately. A daemon
+thread polls every pending hash with a single JSON-RPC batch per tick
+(receipt plus transaction lookup per hash, and the head block number),
+persists the outcome and emits ``transaction_status`` when it changes.
+The outcome of a ``saveRoot`` is handed to the anchoring service, which
+finishes the batch's approvals once it is confirmed and releases them for
+another batch if it reverted or was dropped.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from web3 import Web3
+from backend.extensions import db
+from backend.models.chain_transaction import ChainTransaction
+from backend.services import realtime
+from backend.services.chain import chain
+
+logger = logging.getLogger(__name__)
+
+def init_app(app) -> None:
+    """Start the receipt poller (not under testing; tests call ``poll`` directly)."""
+    if app.testing:
+        return
+    interval = app.config["RECEIPT_POLL_INTERVAL"]
+
+    def run():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    poll(app.config)
+                except Exception as e:
+                    logger.error("Receipt poll failed: %s", e)
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name="receipt-tracker", daemon=True).start()
+
+
+def track(tx_hash: Optional[str], kind: str, contribution_id: Optional[int] = None,
+          user_id: Optional[int] = None) -> Optional[ChainTransaction]:
+    """Record a just-broadcast transaction as pending. The caller commits."""
+    if not tx_hash:
+        return None
+    tx = ChainTransaction(
+        tx_hash=tx_hash,
+        kind=kind,
+        status=ChainTransaction.PENDING,
+        contribution_id=contribution_id,
+        user_id=user_id,
+    )
+    db.session.add(tx)
+    return tx
+
+
+def _int(value) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def poll(config) -> List[ChainTransaction]:
+    """Check up to RECEIPT_BATCH_SIZE pending transactions; returns those whose status changed."""
+    from backend.services import anchoring  # anchoring imports this module
+    from backend.services.approvals import emit_job
+
+    pending = (
+        ChainTransaction.query.filter_by(status=ChainTransaction.PENDING)
+        .order_by(ChainTransaction.id)
+        .limit(config["RECEIPT_BATCH_SIZE"])
+        .all()
+    )
+    if not pending:
+        return []
+
+    calls = [("eth_blockNumber", [])]
+    for tx in pending:
+        calls.append(("eth_getTransactionReceipt", [tx.tx_hash]))
+        calls.append(("eth_getTransactionByHash", [tx.tx_hash]))
+    results = chain.rpc_batch(calls)
+    head = _int(results[0])
+
+    now = datetime.utcnow()
+    drop_before = now - timedelta(seconds=config["TX_DROP_TIMEOUT"])
+    changed = []
+    settled_jobs = []
+    for i, tx in enumerate(pending):
+        receipt, info = results[1 + 2 * i], results[2 + 2 * i]
+        tx.checked_at = now
+        if info:
+            tx.sender = info.get("from")
+            tx.nonce = _int(info.get("nonce"))
+        if receipt:
+            block_number = _int(receipt.get("blockNumber"))
+            tx.block_number = block_number
+            tx.gas_used = _int(receipt.get("gasUsed"))
+            if _int(receipt.get("status")) == 0:
+                tx.status = ChainTransaction.REVERTED
+            elif head is None or head - block_number + 1 >= config["TX_CONFIRMATIONS"]:
+                tx.status = ChainTransaction.CONFIRMED
+                if tx.kind == "batch_anchor":
+                    settled_jobs += anchoring.batch_mined(tx.tx_hash, receipt)
+            else:
+                continue
+            changed.append(tx)
+        elif info is None and tx.created_at and tx.created_at < drop_before:
+            # The node no longer knows the transaction: evicted from the mempool or never propagated
+            tx.status = ChainTransaction.DROPPED
+            changed.append(tx)
+        if tx.kind == "batch_anchor" and tx.status in (ChainTransaction.REVERTED, ChainTransaction.DROPPED):
+            settled_jobs += anchoring.batch_failed(tx.tx_hash, tx.status, config)
+    db.session.commit()
+
+    for job in settled_jobs:
+        emit_job(job)
+    for tx in changed:
+        _settle_nonce(tx)
+        logger.info("%s transaction %s %s", tx.kind, tx.tx_hash, tx.status)
+        realtime.emit_to_user("transaction_status", tx.to_dict(), tx.user_id)
+    return changed
+
+
+def _settle_nonce(tx: ChainTransaction) -> None:
+    """Tell the nonce allocator the outcome so it can retire or re-sync its pending set."""
+    if not tx.sender:
+        return
+    try:
+        nonces = chain.nonces(Web3.to_checksum_address(tx.sender))
+        if tx.status == ChainTransaction.DROPPED:
+            nonces.resync(rejected=tx.nonce)
+        elif tx.nonce is not None:
+            nonces.confirmed(tx.nonce)
+    except Exception as e:
+        logger.warning("Could not update nonces for %s: %s", tx.sender, e)
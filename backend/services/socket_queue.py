@@ -0,0 +1,117 @@
+"""Message-queue backends that let several backend processes share Socket.IO events.
+
+SOCKETIO_MESSAGE_QUEUE selects the bus: ``redis://``/``rediss://``,
+``kafka://``, ``zmq+tcp://`` or any other Kombu URL use python-socketio's
+managers (their client libraries must be installed); ``memory://`` shares
+events between servers in one process and ``file:///path/to/bus.log`` between
+processes on one host, both meant for tests and local multi-process runs.
+Unset keeps the default single-process manager.
+"""
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+import socketio
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class InMemoryPubSubManager(socketio.PubSubManager):
+    """Bus shared by every server in the current process (one per ``channel``)."""
+    name = "memory"
+
+    _subscribers: Dict[str, List[queue.Queue]] = {}
+    _registry_lock = threading.Lock()
+
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        with self._registry_lock:
+            subscribers = list(self._subscribers.get(self.channel, ()))
+        for inbox in subscribers:
+            inbox.put(message)
+
+    def _listen(self):
+        inbox: queue.Queue = queue.Queue()
+        with self._registry_lock:
+            self._subscribers.setdefault(self.channel, []).append(inbox)
+        while True:
+            yield inbox.get()
+
+
+class FilePubSubManager(socketio.PubSubManager):
+    """Bus over an append-only file of JSON lines, shared by processes on one host.
+
+    Each listener tails the file from the end. The file is never truncated,
+    so it is not meant for long-running production use.
+    """
+    name = "file"
+
+    def __init__(self, path: str, channel: str = "socketio", write_only: bool = False,
+                 logger=None, json=None, poll_interval: float = 0.05):
+        self.path = path
+        self.poll_interval = poll_interval
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        open(path, "a").close()
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+
+    def _publish(self, data):
+        line = self.json.dumps({"channel": self.channel, "message": data}) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _listen(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.seek(0, os.SEEK_END)
+            partial = ""
+            while True:
+                chunk = f.readline()
+                if not chunk:
+                    time.sleep(self.poll_interval)
+                    continue
+                partial += chunk
+                if not partial.endswith("\n"):
+                    continue  # A writer is mid-line
+                record, partial = self.json.loads(partial), ""
+                if record.get("channel") == self.channel:
+                    yield record["message"]
+
+
+def client_manager(url: Optional[str], channel: str = "socketio", write_only: bool = False):
+    """Build the python-socketio client manager for a SOCKETIO_MESSAGE_QUEUE URL (None when unset)."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemoryPubSubManager(channel=channel, write_only=write_only)
+    if url.startswith("file://"):
+        return FilePubSubManager(url[len("file://"):], channel=channel, write_only=write_only)
+    if url.startswith(("redis://", "rediss://")):
+        return socketio.RedisManager(url, channel=channel, write_only=write_only)
+    if url.startswith("kafka://"):
+        return socketio.KafkaManager(url, channel=channel, write_only=write_only)
+    if url.startswith("zmq"):
+        return socketio.ZmqManager(url, channel=channel, write_only=write_only)
+    return socketio.KombuManager(url, channel=channel, write_only=write_only)
+
+
+def socketio_options(config) -> dict:
+    """Keyword arguments for ``socketio.init_app`` from the app config.
+
+    ``client_manager`` is always passed so a manager bound to an earlier app
+    is never reused.
+    """
+    return {
+        "async_mode": config["SOCKETIO_ASYNC_MODE"],
+        "client_manager": client_manager(config["SOCKETIO_MESSAGE_QUEUE"], config["SOCKETIO_CHANNEL"]),
+    }
@@ -1,36 +1,240 @@
 import os
 import json
-from typing import Optional, Dict, Any
+import time
+import logging
+import hashlib
+import tempfile
+import threading
+from typing import Optional, Dict, Any, Callable, NamedTuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 from werkzeug.utils import secure_filename
 from backend.config import Config
+from backend.extensions import db
+from backend.models.stored_file import StoredFile, blob_path
+from backend.services.metrics import timed
+from backend.services.multipart import MultipartFileStream
+from backend.utils.uploads import parse_upload_url
 
+logger = logging.getLogger(__name__)
 
-def save_upload(file, upload_dir: str) -> str:
-    os.makedirs(upload_dir, exist_ok=True)
-    fname = secure_filename(file.filename)
-    path = os.path.join(upload_dir, fname)
-    file.save(path)
-    return fname
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-def upload_file_to_pinata(path: str, name: Optional[str] = None) -> Dict[str, Any]:
-    """Upload a local file path to Pinata and return IPFS metadata (CID, size, timestamp)."""
+# Last test_pinata_auth() result and when it was taken (time.monotonic())
+_auth_status: Optional[Dict[str, Any]] = None
+_auth_checked_at: Optional[float] = None
+_auth_lock = threading.Lock()
+_auth_refresher: Optional[threading.Thread] = None
+
+# Serialises "is this blob still referenced?" checks with unlinking and restoring blobs
+_blob_lock = threading.Lock()
+
+
+class SavedUpload(NamedTuple):
+    file: StoredFile
+    url: str  # /api/uploads/<ab>/<cd>/<sha256>/<original name>
+    path: str  # Absolute path of the blob
+
+
+def save_upload(file, upload_dir: str, private: bool = False) -> SavedUpload:
+    """Store an uploaded file content-addressed, deduplicating identical content.
+
+    The upload is streamed to a temp file while hashing, then moved into
+    place atomically. The StoredFile row is added to the session with its
+    reference count bumped; the caller commits. ``private`` marks the content
+    as never publicly cacheable (identity documents). Until then a hard link to
+    the blob is kept, so a concurrent release of the same content that
+    unlinks it before our row is visible cannot leave the row without a file.
+    """
+    tmp_dir = os.path.join(upload_dir, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        path = os.path.join(upload_dir, *blob_path(sha256).split("/"))
+        # Replacing an existing blob is harmless (same bytes) and restores one that went missing
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        try:
+            os.link(path, tmp_path)
+            db.session.info.setdefault("saved_blobs", []).append((tmp_path, path))
+        except OSError:
+            pass  # No hard links on this filesystem: no restore on commit
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    name = secure_filename(file.filename or "") or "file"
+    stored = _add_reference(sha256, size, file.mimetype, name, private)
+    return SavedUpload(stored, f"/api/uploads/{blob_path(sha256)}/{name}", path)
+
+
+def _add_reference(sha256: str, size: int, content_type: Optional[str], name: str, private: bool) -> StoredFile:
+    changes = {"ref_count": StoredFile.ref_count + 1}
+    if private:
+        changes["private"] = True  # Private once any reference is
+    bumped = StoredFile.query.filter_by(sha256=sha256).update(changes, synchronize_session=False)
+    if not bumped:
+        try:
+            with db.session.begin_nested():
+                db.session.add(StoredFile(
+                    sha256=sha256, size=size, content_type=content_type, original_name=name, ref_count=1,
+                    private=private,
+                ))
+        except IntegrityError:
+            # A concurrent upload of the same content created the row first
+            StoredFile.query.filter_by(sha256=sha256).update(changes, synchronize_session=False)
+    return StoredFile.query.filter_by(sha256=sha256).populate_existing().one()
+
+
+def upload_path(file_url: Optional[str], upload_dir: str) -> Optional[str]:
+    """Local path of an upload URL, or None if it is not a stored upload."""
+    sha256, name = parse_upload_url(file_url)
+    if sha256:
+        return os.path.join(upload_dir, *blob_path(sha256).split("/"))
+    return os.path.join(upload_dir, name) if name else None
+
+
+def release_upload(file_url: Optional[str], upload_dir: str) -> None:
+    """Drop one reference to a stored upload. The caller commits.
+
+    When no references remain the row is deleted; the blob itself is only
+    unlinked after that commit succeeds, and only if no new upload of the
+    same content has recorded a reference by then.
+    """
+    sha256, _ = parse_upload_url(file_url)
+    if not sha256:
+        return
+    StoredFile.query.filter(StoredFile.sha256 == sha256, StoredFile.ref_count > 0).update(
+        {"ref_count": StoredFile.ref_count - 1}, synchronize_session=False,
+    )
+    # populate_existing: a row already in the session would otherwise keep its pre-update count
+    stored = StoredFile.query.filter_by(sha256=sha256).populate_existing().first()
+    if stored and stored.ref_count <= 0:
+        db.session.delete(stored)
+        db.session.info.setdefault("released_blobs", []).append((sha256, upload_path(file_url, upload_dir)))
+
+
+@event.listens_for(Session, "after_commit")
+def _settle_blobs(session):
+    if session.in_nested_transaction():
+        return  # A savepoint, not the caller's commit
+    saved = session.info.pop("saved_blobs", [])
+    released = session.info.pop("released_blobs", [])
+    if released:
+        with session.get_bind().connect() as conn, _blob_lock:
+            for sha256, path in released:
+                if conn.execute(db.select(StoredFile.id).where(StoredFile.sha256 == sha256)).first():
+                    continue  # Uploaded again since the release
+                _unlink(path)
+    with _blob_lock:
+        for keep, path in saved:
+            if os.path.exists(path):
+                _unlink(keep)
+            else:
+                os.replace(keep, path)  # A concurrent release removed it
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_blobs(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop("released_blobs", None)
+    for keep, _ in session.info.pop("saved_blobs", []):
+        _unlink(keep)
+
+
+def _unlink(path: Optional[str]) -> None:
+    try:
+        os.unlink(path)
+    except (FileNotFoundError, TypeError):
+        pass
+
+
+def pinata_session() -> requests.Session:
+    """Shared keep-alive session for Pinata, so pins reuse pooled TCP/TLS connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Uploads retry themselves (a streamed body cannot be replayed), so the
+                # adapter only retries connection failures and idempotent GETs.
+                retry = Retry(
+                    total=Config.PINATA_MAX_RETRIES,
+                    backoff_factor=Config.PINATA_RETRY_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=Config.PINATA_POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def reset_pinata_session() -> None:
+    """Drop the pooled session, e.g. after changing Pinata settings."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _pinata_url(path: str) -> str:
+    return f"{Config.PINATA_BASE_URL.rstrip('/')}{path}"
+
+
+def _pinata_timeout():
+    return (Config.PINATA_CONNECT_TIMEOUT, Config.PINATA_READ_TIMEOUT)
+
+
+def upload_file_to_pinata(
+    path: str,
+    name: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Upload a local file path to Pinata and return IPFS metadata (CID, size, timestamp).
+
+    The file is streamed in chunks; ``progress(sent, total)`` reports bytes uploaded.
+    """
     api_key = Config.PINATA_API_KEY
     api_secret = Config.PINATA_SECRET_API_KEY
     if not api_key or not api_secret:
         raise RuntimeError("Missing Pinata API credentials")
 
-    print(f"[Pinata] Starting upload: {path} (name: {name})")
-    print(f"[Pinata] API Key present: {bool(api_key)}, Secret present: {bool(api_secret)}")
-    
+    logger.info("Pinata upload starting: %s (name: %s)", path, name)
+
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
     
-    file_size = os.path.getsize(path)
-    print(f"[Pinata] File size: {file_size} bytes")
+    logger.debug("Pinata upload size: %s bytes", os.path.getsize(path))
 
-    url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
+    url = _pinata_url("/pinning/pinFileToIPFS")
     headers = {
         "pinata_api_key": api_key,
         "pinata_secret_api_key": api_secret,
@@ -43,24 +247,35 @@ def upload_file_to_pinata(path: str, name: Optional[str] = None) -> Dict[str, An
     }
     
     # Simple retry with backoff for transient failures/rate limits
-    last_exc: Optional[Exception] = None
-    for attempt in range(3):
+    attempts = max(1, Config.PINATA_MAX_RETRIES)
+    session = pinata_session()
+    for attempt in range(attempts):
         try:
-            # Open file fresh for each attempt
-            with open(path, "rb") as file_obj:
-                files = {"file": (pinata_filename, file_obj)}
-                data = {"pinataMetadata": json.dumps(pinata_metadata)}
-                print(f"[Pinata] Attempt {attempt + 1}/3: Uploading to Pinata with filename: {pinata_filename}...")
-                resp = requests.post(url, headers=headers, files=files, data=data, timeout=60)
-                print(f"[Pinata] Response status: {resp.status_code}")
+            # Stream the file fresh for each attempt instead of building the body in memory
+            with MultipartFileStream(
+                path,
+                filename=pinata_filename,
+                fields={"pinataMetadata": json.dumps(pinata_metadata)},
+                chunk_size=Config.PINATA_UPLOAD_CHUNK_SIZE,
+                progress=progress,
+            ) as body:
+                with timed("pinata", "pin_file"):
+                    resp = session.post(
+                        url,
+                        headers={**headers, "Content-Type": body.content_type},
+                        data=body,
+                        timeout=_pinata_timeout(),
+                    )
+                logger.debug("Pinata attempt %s/%s: status %s", attempt + 1, attempts, resp.status_code)
                 
+                if resp.status_code in (401, 403):
+                    # Credentials were revoked or rotated; the cached auth state is stale
+                    invalidate_pinata_auth()
                 if resp.status_code >= 500 or resp.status_code in (429,):
                     raise RuntimeError(f"Pinata transient error {resp.status_code}: {resp.text[:200]}")
                 
                 resp.raise_for_status()
                 data = resp.json()
-                print(f"[Pinata] Upload successful! Response: {data}")
-                
                 cid = data.get("IpfsHash") or data.get("ipfsHash")
                 if not cid:
                     raise RuntimeError(f"No CID in Pinata response: {data}")
@@ -71,20 +286,18 @@ def upload_file_to_pinata(path: str, name: Optional[str] = None) -> Dict[str, An
                     "timestamp": data.get("Timestamp"),
                     "name": name or os.path.basename(path)
                 }
-                print(f"[Pinata] Upload complete! CID: {cid}, Size: {result.get('size')}, Timestamp: {result.get('timestamp')}")
+                logger.info("Pinata upload complete: CID %s, size %s", cid, result.get("size"))
                 return result
         except Exception as e:
-            last_exc = e
-            print(f"[Pinata] Attempt {attempt + 1}/3 failed: {str(e)}")
-            if attempt < 2:
-                # Exponential backoff: 0.5s, 1.5s
-                import time
-                wait_time = 0.5 + attempt
-                print(f"[Pinata] Retrying in {wait_time}s...")
+            if attempt < attempts - 1:
+                # Backoff: 0.5s, 1.5s, ... with the default PINATA_RETRY_BACKOFF
+                wait_time = Config.PINATA_RETRY_BACKOFF * (1 + 2 * attempt)
+                logger.warning("Pinata attempt %s/%s failed: %s; retrying in %ss", attempt + 1, attempts, e, wait_time)
                 time.sleep(wait_time)
                 continue
-            print(f"[Pinata] All attempts failed. Last error: {str(e)}")
-            raise RuntimeError(f"Pinata upload failed after 3 attempts: {str(e)}")
+            logger.error("Pinata upload failed after %s attempts: %s", attempts, e)
+            invalidate_pinata_auth()
+            raise RuntimeError(f"Pinata upload failed after {attempts} attempts: {str(e)}")
 
 
 def test_pinata_auth() -> Dict[str, Any]:
@@ -98,13 +311,14 @@ def test_pinata_auth() -> Dict[str, Any]:
             "reason": "Missing Pinata API credentials",
         }
 
-    url = "https://api.pinata.cloud/data/testAuthentication"
+    url = _pinata_url("/data/testAuthentication")
     headers = {
         "pinata_api_key": api_key,
         "pinata_secret_api_key": api_secret,
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=20)
+        with timed("pinata", "test_auth"):
+            resp = pinata_session().get(url, headers=headers, timeout=(Config.PINATA_CONNECT_TIMEOUT, 20))
         if resp.status_code == 200:
             return {"ok": True}
         return {"ok": False, "status": resp.status_code, "body": resp.text[:500]}
@@ -112,3 +326,54 @@ def test_pinata_auth() -> Dict[str, Any]:
         return {"ok": False, "reason": str(e)}
 
 
+
+
+def pinata_auth_status(force: bool = False) -> Dict[str, Any]:
+    """TTL-cached ``test_pinata_auth()`` result, with ``cacheAge`` in seconds.
+
+    Successful checks are reused for PINATA_AUTH_TTL seconds and failures for
+    PINATA_AUTH_FAILURE_TTL, so callers on the hot path normally make no
+    network call. Pin failures invalidate the cache.
+    """
+    with _auth_lock:
+        status, checked_at = _auth_status, _auth_checked_at
+    if not force and status is not None:
+        age = time.monotonic() - checked_at
+        ttl = Config.PINATA_AUTH_TTL if status.get("ok") else Config.PINATA_AUTH_FAILURE_TTL
+        if age < ttl:
+            return {**status, "cached": True, "cacheAge": round(age, 3)}
+    status = refresh_pinata_auth()
+    return {**status, "cached": False, "cacheAge": 0.0}
+
+
+def refresh_pinata_auth() -> Dict[str, Any]:
+    global _auth_status, _auth_checked_at
+    status = test_pinata_auth()
+    with _auth_lock:
+        _auth_status, _auth_checked_at = status, time.monotonic()
+    return status
+
+
+def invalidate_pinata_auth() -> None:
+    global _auth_status, _auth_checked_at
+    with _auth_lock:
+        _auth_status, _auth_checked_at = None, None
+
+
+def start_pinata_auth_refresher(interval: Optional[float] = None) -> None:
+    """Renew the cached auth state in a daemon thread so approvals never wait on the probe."""
+    global _auth_refresher
+    interval = Config.PINATA_AUTH_REFRESH_INTERVAL if interval is None else interval
+    if interval <= 0 or (_auth_refresher is not None and _auth_refresher.is_alive()):
+        return
+
+    def run():
+        while True:
+            try:
+                refresh_pinata_auth()
+            except Exception as e:
+                logger.warning("Pinata auth refresh failed: %s", e)
+            time.sleep(interval)
+
+    _auth_refresher = threading.Thread(target=run, name="pinata-auth-refresher", daemon=True)
+    _auth_refresher.start()
@@ -3,7 +3,8 @@ from backend.app import create_app, db
 
 
 def setup_app():
-    app = create_app()
+    # No worker threads: they would outlive the test and share monkeypatched services
+    app = create_app({"BACKGROUND_SERVICES": False})
     app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI="sqlite:///:memory:")
     with app.app_context():
         db.create_all()
@@ -18,3 +19,607 @@ def test_health():
     assert res.get_json()["status"] == "ok"
 
 
+
+
+def make_app():
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "APPROVAL_WORKERS": 0,
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed_contributions(app, count, **overrides):
+    from datetime import datetime, timedelta
+    from backend.models.user import User
+    from backend.models.contribution import Contribution
+
+    with app.app_context():
+        author = User(name="Author", email=f"author{count}@example.com")
+        author.set_password("pw")
+        db.session.add(author)
+        db.session.flush()
+        base = datetime(2025, 1, 1)
+        for i in range(count):
+            fields = {"status": "Pending", "created_at": base + timedelta(minutes=i // 2)}
+            fields.update(overrides)
+            db.session.add(Contribution(title=f"c{i}", description="d", author_id=author.id, **fields))
+        db.session.commit()
+        return author.id
+
+
+def test_contributions_cursor_pagination():
+    app = make_app()
+    seed_contributions(app, 7)
+    client = app.test_client()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/contributions?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        res = client.get(url)
+        assert res.status_code == 200
+        seen.extend(item["id"] for item in res.get_json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    assert client.get("/api/contributions?cursor=bogus").status_code == 400
+
+
+def test_contributions_pagination_with_default_timestamps():
+    from backend.models.contribution import Contribution
+
+    app = make_app()
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        # Inserted in the same second, created_at left to the model
+        db.session.add_all(Contribution(title=f"c{i}", description="d", author_id=author_id) for i in range(7))
+        db.session.commit()
+    client = app.test_client()
+
+    seen, cursor = [], None
+    for _ in range(5):
+        res = client.get("/api/contributions?limit=3" + (f"&cursor={cursor}" if cursor else ""))
+        seen.extend(item["id"] for item in res.get_json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [str(i) for i in range(7, 0, -1)]
+
+
+def test_contributions_filters():
+    app = make_app()
+    author_id = seed_contributions(app, 4, status="Accepted")
+    seed_contributions(app, 2)
+    client = app.test_client()
+
+    accepted = client.get("/api/contributions?status=Accepted").get_json()
+    assert len(accepted) == 4
+    by_author = client.get(f"/api/contributions?author_id={author_id}").get_json()
+    assert {c["author"]["id"] for c in by_author} == {author_id}
+    ranged = client.get("/api/contributions?since=2025-01-01T00:01:00&until=2025-01-01T00:02:00").get_json()
+    assert len(ranged) == 2
+    # The same window given in UTC+02:00 (%2B is an encoded "+")
+    shifted = client.get("/api/contributions?since=2025-01-01T02:01:00%2B02:00&until=2025-01-01T02:02:00%2B02:00").get_json()
+    assert [c["id"] for c in shifted] == [c["id"] for c in ranged]
+    assert client.get("/api/contributions?since=yesterday").status_code == 400
+
+
+def test_contributions_list_loads_authors_eagerly():
+    from sqlalchemy import event
+
+    app = make_app()
+    seed_contributions(app, 5)
+    seed_contributions(app, 6)
+    client = app.test_client()
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        res = client.get("/api/contributions?limit=50")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(res.get_json()) == 11
+    assert len(statements) == 1
+
+
+def admin_headers(app):
+    from flask_jwt_extended import create_access_token
+    from backend.models.user import User
+
+    with app.app_context():
+        admin = User(name="Admin", email="admin@example.com", role="admin")
+        admin.set_password("pw")
+        db.session.add(admin)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"}
+
+
+def test_accept_queues_approval_job(monkeypatch):
+    from backend.services import approvals
+
+    app = make_app()
+    seed_contributions(app, 1)
+    headers = admin_headers(app)
+    monkeypatch.setattr(approvals, "pinata_auth_status", lambda: {"ok": True})
+    monkeypatch.setattr(approvals, "upload_file_to_pinata", lambda path, name=None, progress=None: {
+        "cid": "QmTest", "size": 12, "timestamp": "2025-01-01T00:00:00Z", "name": name,
+    })
+    monkeypatch.setattr(approvals, "anchor_hash", lambda ipfs_hash, **kwargs: None)
+    client = app.test_client()
+
+    res = client.post("/api/contributions/1/review", json={"action": "accept"}, headers=headers)
+    assert res.status_code == 202
+    job_id = res.get_json()["jobId"]
+
+    job = client.get(f"/api/approval-jobs/{job_id}", headers=headers).get_json()
+    assert job["state"] == "done"
+    assert job["result"]["ipfsHash"] == "QmTest"
+    detail = client.get("/api/contributions/1").get_json()
+    assert detail["status"] == "Accepted"
+    assert detail["ipfsCID"] == "QmTest"
+
+
+def test_accepts_share_one_job_and_pay_the_reward_once(monkeypatch):
+    import pytest
+    from sqlalchemy.exc import IntegrityError
+    from backend.models.approval_job import ApprovalJob
+    from backend.models.user import User
+    from backend.services import approvals
+
+    app = make_app()
+    author_id = seed_contributions(app, 2)
+    headers = admin_headers(app)
+    monkeypatch.setattr(approvals, "pin_contribution", lambda c, folder, progress=None: {"cid": f"Qm{c.id}"})
+    monkeypatch.setattr(approvals, "anchor_hash", lambda ipfs_hash, **kwargs: None)
+    client = app.test_client()
+
+    def balance():
+        with app.app_context():
+            return db.session.scalar(db.select(User.cnri_balance).where(User.id == author_id))
+
+    with app.app_context():
+        # Two accepts racing past the in-flight check cannot both insert a job
+        db.session.add(ApprovalJob(contribution_id=1, state=ApprovalJob.QUEUED))
+        db.session.commit()
+        db.session.add(ApprovalJob(contribution_id=1, state=ApprovalJob.QUEUED))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+        # Meanwhile the reward is added in SQL, on top of a credit this session never saw
+        assert not db.session.get(User, author_id).cnri_balance
+        with db.engine.begin() as conn:
+            conn.execute(db.update(User).where(User.id == author_id).values(cnri_balance=5.0))
+        approvals._process(1, app.config)
+    assert balance() == 5.0 + approvals.REWARD_AMOUNT
+
+    # Accepting an accepted contribution again pays nothing
+    res = client.post("/api/contributions/1/review", json={"action": "accept"}, headers=headers)
+    assert res.status_code == 409
+    res = client.post("/api/contributions/2/review", json={"action": "accept"}, headers=headers)
+    assert res.get_json()["job"]["state"] == "done"
+    assert client.post("/api/contributions/2/review", json={"action": "accept"}, headers=headers).status_code == 409
+    assert balance() == 5.0 + 2 * approvals.REWARD_AMOUNT
+
+    # A job queued before the first one finished fails instead of paying again
+    with app.app_context():
+        late = ApprovalJob(contribution_id=2, state=ApprovalJob.QUEUED)
+        db.session.add(late)
+        db.session.commit()
+        approvals.run_job(app, late.id)
+    with app.app_context():
+        late = db.session.get(ApprovalJob, late.id)
+        assert late.state == ApprovalJob.FAILED and "already accepted" in late.error
+    assert balance() == 5.0 + 2 * approvals.REWARD_AMOUNT
+
+
+def test_accept_reuses_existing_pin_for_same_content(monkeypatch):
+    from backend.models.contribution import Contribution
+    from backend.services import approvals
+
+    app = make_app()
+    seed_contributions(app, 2, content_cid="QmSame")
+    with app.app_context():
+        pinned = db.session.get(Contribution, 1)
+        pinned.ipfs_cid = "QmSame"
+        pinned.ipfs_file_size = 42
+        db.session.commit()
+    headers = admin_headers(app)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("duplicate content must not be uploaded again")
+
+    monkeypatch.setattr(approvals, "pinata_auth_status", fail)
+    monkeypatch.setattr(approvals, "upload_file_to_pinata", fail)
+    monkeypatch.setattr(approvals, "anchor_hash", lambda ipfs_hash, **kwargs: None)
+
+    res = app.test_client().post("/api/contributions/2/review", json={"action": "accept"}, headers=headers)
+    job = res.get_json()["job"]
+    assert job["state"] == "done"
+    assert job["ipfsHash"] == "QmSame"
+
+
+def test_batch_mode_anchors_many_approvals_in_one_transaction(monkeypatch):
+    from backend.services import anchoring, approvals
+
+    app = make_app()
+    app.config.update(ANCHOR_MODE="batch", ANCHOR_BATCH_SIZE=10)
+    seed_contributions(app, 3)
+    headers = admin_headers(app)
+    monkeypatch.setattr(approvals, "pinata_auth_status", lambda: {"ok": True})
+    monkeypatch.setattr(approvals, "upload_file_to_pinata", lambda path, name=None, progress=None: {
+        "cid": f"Qm{name}", "size": 1, "timestamp": None, "name": name,
+    })
+    sent = []
+    monkeypatch.setattr(anchoring, "chain_configured", lambda: True)
+    monkeypatch.setattr(anchoring, "submit_root", lambda root, size: sent.append((root, size)) or "0xbatch")
+    client = app.test_client()
+
+    for cid in (1, 2, 3):
+        res = client.post(f"/api/contributions/{cid}/review", json={"action": "accept"}, headers=headers)
+        assert res.get_json()["job"]["state"] == "anchoring"
+
+    with app.app_context():
+        assert anchoring.flush(app.config) is None  # window not elapsed, batch not full
+        batch = anchoring.flush(app.config, force=True)
+        assert batch.size == 3 and batch.tx_hash == "0xbatch"
+    assert len(sent) == 1
+
+    # Submitted is not anchored: nothing is final until the receipt is in
+    job = client.get("/api/approval-jobs/1", headers=headers).get_json()
+    assert job["state"] == "anchoring" and job["txHash"] == "0xbatch"
+    assert client.get("/api/blockchain/anchors/2").status_code == 404
+
+    # The contract numbers batches itself; the mined receipt's BatchAnchored event carries its index
+    from backend.services import receipts
+
+    class FakeChain:
+        def rpc_batch(self, calls):
+            receipt = {"blockNumber": "0x5", "gasUsed": "0x1", "status": "0x1", "logs": [{
+                "topics": [anchoring.BATCH_ANCHORED_TOPIC, "0x" + "00" * 32, "0x" + f"{7:064x}"], "data": "0x",
+            }]}
+            return ["0x10"] + [receipt, None] * ((len(calls) - 1) // 2)
+
+    monkeypatch.setattr(receipts, "chain", FakeChain())
+    with app.app_context():
+        receipts.poll(app.config)
+    anchor = client.get("/api/blockchain/anchors/2").get_json()
+    assert anchor["verified"] is True
+    assert anchor["batch"]["txHash"] == "0xbatch"
+    assert anchor["batch"]["status"] == "confirmed"
+    assert anchor["batch"]["onchainBatchId"] == 7
+    assert client.get("/api/contributions/2").get_json()["anchorBatchId"] == 7
+    job = client.get("/api/approval-jobs/1", headers=headers).get_json()
+    assert job["state"] == "done"
+    assert job["result"]["anchorBatchId"] == 7
+
+
+def test_reverted_or_abandoned_batches_release_their_contributions(monkeypatch):
+    from datetime import datetime, timedelta
+    from backend.models.anchor_batch import AnchorBatch
+    from backend.models.approval_job import ApprovalJob
+    from backend.models.contribution import Contribution
+    from backend.services import anchoring, approvals, receipts
+
+    app = make_app()
+    app.config.update(ANCHOR_MODE="batch", ANCHOR_PENDING_TIMEOUT=300)
+    seed_contributions(app, 2)
+    headers = admin_headers(app)
+    monkeypatch.setattr(approvals, "pinata_auth_status", lambda: {"ok": True})
+    monkeypatch.setattr(approvals, "upload_file_to_pinata", lambda path, name=None, progress=None: {
+        "cid": f"Qm{name}", "size": 1, "timestamp": None, "name": name,
+    })
+    tx_hashes = iter(["0xreverted", "0xmined"])
+    monkeypatch.setattr(anchoring, "chain_configured", lambda: True)
+    monkeypatch.setattr(anchoring, "submit_root", lambda root, size: next(tx_hashes))
+    client = app.test_client()
+    for cid in (1, 2):
+        client.post(f"/api/contributions/{cid}/review", json={"action": "accept"}, headers=headers)
+
+    class RevertingChain:
+        def rpc_batch(self, calls):
+            receipt = {"blockNumber": "0x5", "gasUsed": "0x1", "status": "0x0", "logs": []}
+            return ["0x10"] + [receipt, None] * ((len(calls) - 1) // 2)
+
+    monkeypatch.setattr(receipts, "chain", RevertingChain())
+    with app.app_context():
+        reverted = anchoring.flush(app.config, force=True)
+        receipts.poll(app.config)
+        assert db.session.get(AnchorBatch, reverted.id).status == AnchorBatch.FAILED
+        assert Contribution.query.filter(Contribution.anchor_batch_id.isnot(None)).count() == 0
+        job = db.session.get(ApprovalJob, 1)
+        assert job.state == ApprovalJob.ANCHORING and job.anchor_attempts == 1 and job.tx_hash is None
+        assert "reverted" in job.error
+
+        # A worker crashed after claiming the contributions but before submitting saveRoot
+        abandoned = AnchorBatch(merkle_root="0x00", size=2, status=AnchorBatch.PENDING,
+                                created_at=datetime.utcnow() - timedelta(seconds=600))
+        db.session.add(abandoned)
+        db.session.flush()
+        Contribution.query.update({"anchor_batch_id": abandoned.id})
+        ApprovalJob.query.update({"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+        batch = anchoring.flush(app.config)
+        assert batch.tx_hash == "0xmined" and batch.size == 2
+        assert db.session.get(AnchorBatch, abandoned.id).status == AnchorBatch.FAILED
+
+
+def test_batch_anchoring_backs_off_and_gives_up_after_failed_submissions(monkeypatch):
+    from datetime import datetime, timedelta
+    from backend.models.anchor_batch import AnchorBatch
+    from backend.models.approval_job import ApprovalJob
+    from backend.services import anchoring, approvals
+
+    app = make_app()
+    app.config.update(ANCHOR_MODE="batch", ANCHOR_MAX_ATTEMPTS=3, ANCHOR_RETRY_BACKOFF=30)
+    seed_contributions(app, 2)
+    headers = admin_headers(app)
+    monkeypatch.setattr(approvals, "pinata_auth_status", lambda: {"ok": True})
+    monkeypatch.setattr(approvals, "upload_file_to_pinata", lambda path, name=None, progress=None: {
+        "cid": f"Qm{name}", "size": 1, "timestamp": None, "name": name,
+    })
+    client = app.test_client()
+    for cid in (1, 2):
+        client.post(f"/api/contributions/{cid}/review", json={"action": "accept"}, headers=headers)
+
+    # Unconfigured chain: the jobs finish unanchored, as in single mode, and no batch row is written
+    monkeypatch.setattr(anchoring, "chain_configured", lambda: False)
+    with app.app_context():
+        job = db.session.get(ApprovalJob, 1)
+        assert job.state == ApprovalJob.ANCHORING
+        assert anchoring.flush(app.config, force=True) is None
+        assert db.session.get(ApprovalJob, 1).state == ApprovalJob.DONE
+        assert AnchorBatch.query.count() == 0
+        # Put job 2 back in the queue for the failure path
+        db.session.get(ApprovalJob, 2).state = ApprovalJob.ANCHORING
+        db.session.commit()
+
+    def fail(root, size):
+        raise ConnectionError("node down")
+
+    monkeypatch.setattr(anchoring, "chain_configured", lambda: True)
+    monkeypatch.setattr(anchoring, "submit_root", fail)
+    with app.app_context():
+        assert anchoring.flush(app.config, force=True).status == AnchorBatch.FAILED
+        job = db.session.get(ApprovalJob, 2)
+        assert job.anchor_attempts == 1
+        assert job.next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+        assert anchoring.flush(app.config, force=True) is None  # Backing off
+
+        for attempt in (2, 3):
+            job.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            assert anchoring.flush(app.config) is not None  # Retries skip the batch window
+            job = db.session.get(ApprovalJob, 2)
+            assert job.anchor_attempts == attempt
+        assert job.state == ApprovalJob.FAILED
+        assert "node down" in job.error
+        assert AnchorBatch.query.count() == 3
+        assert anchoring.flush(app.config, force=True) is None
+
+
+def test_admin_gate_uses_cached_identity_and_sees_role_changes():
+    from sqlalchemy import event
+    from flask_jwt_extended import create_access_token
+    from backend.models.user import User
+
+    app = make_app()
+    with app.app_context():
+        user = User(name="Member", email="member@example.com")
+        user.set_password("pw")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+        engine = db.engine
+    client = app.test_client()
+
+    assert client.get("/api/kyc/admin/list", headers=headers).status_code == 403
+
+    statements = []
+
+    def count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert client.get("/api/kyc/admin/list", headers=headers).status_code == 403
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert statements == []
+
+    with app.app_context():
+        db.session.get(User, user_id).role = "admin"
+        db.session.commit()
+    res = client.get("/api/kyc/admin/list", headers=headers)
+    assert res.status_code == 200
+    assert res.get_json() == []
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_kyc_queue_pages_with_users_loaded_and_counts_by_status():
+    from datetime import datetime, timedelta
+    from sqlalchemy import event
+    from backend.models.kyc_document import KycDocument
+    from backend.models.user import User
+
+    app = make_app()
+    headers = admin_headers(app)
+    with app.app_context():
+        base = datetime(2025, 1, 1)
+        for i in range(5):
+            user = User(name=f"User {i}", email=f"user{i}@example.com", password_hash="-")
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(KycDocument(user_id=user.id, file_url="/api/uploads/kyc.png",
+                                       status="Pending" if i % 2 else "Verified", created_at=base + timedelta(minutes=i)))
+        db.session.commit()
+        engine = db.engine
+    client = app.test_client()
+
+    assert client.get("/api/kyc/admin/counts", headers=headers).get_json() == {"Pending": 2, "Verified": 3, "total": 5}
+
+    statements = []
+
+    def count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    seen, cursor = [], None
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        while True:
+            res = client.get("/api/kyc/admin/list?limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+            assert res.status_code == 200
+            seen.extend((doc["userName"], doc["status"]) for doc in res.get_json())
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert [name for name, _ in seen] == [f"User {i}" for i in reversed(range(5))]
+    assert len(statements) == 3  # One per page
+    pending = client.get("/api/kyc/admin/list?status=Pending", headers=headers).get_json()
+    assert [doc["userName"] for doc in pending] == ["User 3", "User 1"]
+    assert client.get("/api/kyc/admin/list?cursor=bogus", headers=headers).status_code == 400
+
+
+def test_kyc_queue_pages_through_uploaded_documents(tmp_path):
+    import io
+    from flask_jwt_extended import create_access_token
+    from backend.models.user import User
+
+    app = make_app()
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    headers = admin_headers(app)
+    client = app.test_client()
+    for i in range(5):
+        with app.app_context():
+            user = User(name=f"User {i}", email=f"user{i}@example.com", password_hash="-")
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(identity=str(user.id))
+        # created_at comes from the model default, all within the same second
+        res = client.post("/api/kyc/upload", headers={"Authorization": f"Bearer {token}"},
+                          content_type="multipart/form-data",
+                          data={"file": (io.BytesIO(f"id {i}".encode()), "id.pdf")})
+        assert res.status_code == 200
+
+    seen, cursor = [], None
+    for _ in range(5):
+        res = client.get("/api/kyc/admin/list?limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+        seen.extend(doc["userName"] for doc in res.get_json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"User {i}" for i in reversed(range(5))]
+
+
+def test_profile_routes_act_on_the_token_user():
+    from flask_jwt_extended import create_access_token
+    from backend.models.user import User
+
+    app = make_app()
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        other = User(name="Other", email="other@example.com", password_hash="-")
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(author_id))}"}
+    client = app.test_client()
+
+    assert client.put(f"/api/profile/{other_id}", json={"name": "Hijacked"}, headers=headers).status_code == 403
+    res = client.put(f"/api/profile/{author_id}", json={"bio": "Hello"}, headers=headers)
+    assert res.status_code == 200 and res.get_json()["bio"] == "Hello"
+    assert client.post("/api/profile/kyc/start", json={"aadhaar": "123412341234"}).status_code == 401
+    assert client.post("/api/profile/kyc/start", json={"aadhaar": "123412341234"}, headers=headers).status_code == 200
+    with app.app_context():
+        otp = db.session.get(User, author_id).bio.rsplit(":", 1)[1]
+    res = client.post("/api/profile/kyc/verify", json={"otp": otp, "aadhaar": "123412341234"}, headers=headers)
+    assert res.get_json()["user"]["kycVerified"] is True
+
+
+def test_review_events_only_reach_author_and_admins():
+    from flask_jwt_extended import create_access_token
+    from backend.extensions import socketio
+    from backend.models.contribution import Contribution
+    from backend.models.user import User
+
+    app = make_app()
+    author_id = seed_contributions(app, 1)
+    headers = admin_headers(app)
+    with app.app_context():
+        other = User(name="Other", email="other@example.com")
+        other.set_password("pw")
+        db.session.add(other)
+        db.session.commit()
+        author_token = create_access_token(identity=str(author_id))
+        other_token = create_access_token(identity=str(other.id))
+        contribution_id = Contribution.query.first().id
+
+    author = socketio.test_client(app, auth={"token": author_token})
+    other = socketio.test_client(app, auth={"token": other_token})
+    admin = socketio.test_client(app, headers=headers)
+    anonymous = socketio.test_client(app)
+    assert not socketio.test_client(app, auth={"token": "garbage"}).is_connected()
+
+    res = app.test_client().post(
+        f"/api/contributions/{contribution_id}/review", json={"action": "reject"}, headers=headers,
+    )
+    assert res.status_code == 200
+
+    def events(client):
+        return [e["name"] for e in client.get_received()]
+
+    assert events(author) == ["contribution_reviewed"]
+    assert events(admin) == ["contribution_reviewed"]
+    assert events(other) == []
+    assert events(anonymous) == []
+
+
+def test_contribution_feed_is_coalesced_into_batches(monkeypatch):
+    import time
+    from flask_jwt_extended import create_access_token
+    from backend.extensions import socketio
+    from backend.services import feed
+
+    app = make_app()
+    # Wide enough for every post to land in one batch
+    app.extensions["feed"] = feed.FeedCoalescer(window=1.0, max_per_second=4)
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        token = create_access_token(identity=str(author_id))
+    listener = socketio.test_client(app)
+    client = app.test_client()
+
+    for i in range(5):
+        res = client.post("/api/contributions", data={"title": f"burst {i}"},
+                          headers={"Authorization": f"Bearer {token}"})
+        assert res.status_code == 201
+    time.sleep(1.5)
+
+    # Another app's coalescer may still flush into the shared socketio server
+    events = [e for e in listener.get_received() if "burst 0" in json.dumps(e["args"])]
+    assert [e["name"] for e in events] == ["contributions_batch"]
+    items = events[0]["args"][0]["items"]
+    assert [item["title"] for item in items] == [f"burst {i}" for i in range(5)]
+    assert set(items[0]) == {"id", "title", "status", "authorId", "createdAt"}
@@ -0,0 +1,28 @@
+import pytest
+from backend.benchmarks.common import compare
+
+
+def scenario(p95, rps, errors=0):
+    return {"p95Ms": p95, "rps": rps, "errors": errors}
+
+
+def test_compare_flags_latency_throughput_and_error_regressions():
+    baseline = {"scenarios": {"list": scenario(10, 100), "login": scenario(50, 20), "create": scenario(30, 40)}}
+    current = {"scenarios": {"list": scenario(12, 95), "login": scenario(80, 10), "create": scenario(30, 40, errors=2)}}
+    assert compare(current, baseline, tolerance=0.25) == [
+        "login: p95 50 ms -> 80 ms",
+        "login: throughput 20 -> 10 req/s",
+        "create: errors 0 -> 2",
+    ]
+
+
+def test_api_load_smoke():
+    pytest.importorskip("eth_tester", reason="pip install -r backend/requirements-dev.txt")
+    from backend.benchmarks import api_load
+
+    results = api_load.run(users=3, contributions=20, requests_per_scenario=4, concurrency=2, approval_workers=1)
+    assert set(results["scenarios"]) == set(api_load.SCENARIOS)
+    assert all(s["errors"] == 0 and s["requests"] == 4 for s in results["scenarios"].values())
+    assert results["approvalJobs"]["jobs"] == 4
+    assert results["approvalJobs"]["unfinished"] == 0
+    assert results["approvalJobs"]["failed"] == 0
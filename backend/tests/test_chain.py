@@ -0,0 +1,327 @@
+import json
+import os
+from backend.config import Config
+from backend.services.chain import ChainClient
+
+
+def test_contract_abi_cached_until_file_changes(monkeypatch, tmp_path):
+    path = tmp_path / "contract.json"
+    path.write_text(json.dumps({"address": "0x" + "11" * 20, "abi": []}))
+    monkeypatch.setattr(Config, "CONTRACT_ABI_PATH", str(path))
+    monkeypatch.setattr(Config, "CONTRACT_ADDRESS", "")
+    client = ChainClient()
+
+    first = client.contract_data()
+    assert client.contract_data() is first
+    contract = client.contract()
+    assert client.contract() is contract
+
+    path.write_text(json.dumps({"address": "0x" + "22" * 20, "abi": []}))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert client.contract_address() == "0x" + "22" * 20
+    assert client.contract() is not contract
+
+
+def test_nonce_allocation_is_unique_across_threads():
+    import threading
+    from backend.services.chain import NonceManager
+
+    class FakeEth:
+        calls = 0
+
+        def get_transaction_count(self, address, block):
+            FakeEth.calls += 1
+            return 7
+
+    class FakeWeb3:
+        eth = FakeEth()
+
+    nonces = NonceManager(FakeWeb3(), "0xabc")
+    allocated = []
+    threads = [threading.Thread(target=lambda: allocated.append(nonces.allocate())) for _ in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(allocated) == list(range(7, 57))
+    assert FakeEth.calls == 1
+    nonces.release(30)
+    assert nonces.allocate() == 30
+    assert nonces.allocate() == 57
+
+
+def test_nonce_resync_stays_above_nonces_still_in_flight():
+    from backend.services.chain import NonceManager
+
+    class FakeEth:
+        count = 7
+
+        def get_transaction_count(self, address, block):
+            return FakeEth.count
+
+    class FakeWeb3:
+        eth = FakeEth()
+
+    nonces = NonceManager(FakeWeb3(), "0xabc")
+    first, second, third = nonces.allocate(), nonces.allocate(), nonces.allocate()
+    nonces.sent(first)
+    nonces.sent(second)
+    # A lagging node only counts the first; the third is still being sent by another thread
+    FakeEth.count = 8
+    nonces.resync()
+    assert nonces.allocate() == 10
+
+    # The node dropped the second, so the next transaction fills its gap
+    nonces.resync(rejected=second)
+    assert nonces.allocate() == second
+    nonces.sent(third)
+    nonces.confirmed(third)
+    assert nonces.allocate() == 11
+
+
+def test_rpc_batch_posts_one_request_and_falls_back_when_batches_are_refused(monkeypatch):
+    from json import loads
+    from backend.services import chain as chain_module
+
+    class FakeResponse:
+        def __init__(self, body):
+            self.body = body
+            self.content = json.dumps(body).encode()
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.body
+
+    class FakeSession:
+        batch_body = None
+
+        def __init__(self):
+            self.posts = []
+
+        def mount(self, prefix, adapter):
+            pass
+
+        def post(self, url, json=None, data=None, **kwargs):
+            self.posts.append(json if json is not None else data)
+            if json is not None:
+                return FakeResponse(self.batch_body)
+            call = loads(data)
+            return FakeResponse({"jsonrpc": "2.0", "id": call["id"], "result": f"{call['method']}:{call['params'][0]}"})
+
+    monkeypatch.setattr(chain_module.requests, "Session", FakeSession)
+    monkeypatch.setattr(Config, "GANACHE_URL", "http://node.invalid:8545")
+    client = ChainClient()
+    client.w3
+    session = client._session
+    hashes = ["0x" + "01" * 32, "0x" + "02" * 32]
+    calls = [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+
+    # Answers may come back in any order; missing or failed ids yield None
+    FakeSession.batch_body = [{"id": 1, "result": "b"}, {"id": 0, "result": "a"}]
+    assert client.rpc_batch(calls) == ["a", "b"]
+    assert len(session.posts) == 1
+    assert [c["method"] for c in session.posts[0]] == ["eth_getTransactionReceipt"] * 2
+    FakeSession.batch_body = [{"id": 0, "error": {"code": -32000, "message": "boom"}}]
+    assert client.rpc_batch(calls) == [None, None]
+
+    # A node with batching disabled answers with one error object
+    FakeSession.batch_body = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+    session.posts.clear()
+    assert client.rpc_batch(calls) == [f"eth_getTransactionReceipt:{tx_hash}" for tx_hash in hashes]
+    assert len(session.posts) == 3
+
+
+def test_send_transaction_resyncs_after_out_of_band_send(monkeypatch):
+    import pytest
+
+    eth_tester = pytest.importorskip("eth_tester", reason="pip install -r backend/requirements-dev.txt")
+    from web3 import EthereumTesterProvider, Web3
+
+    tester = eth_tester.EthereumTester()
+    key = tester.backend.account_keys[0]
+    monkeypatch.setattr(Config, "DEPLOYER_PRIVATE_KEY", key.to_hex())
+    client = ChainClient(provider=EthereumTesterProvider(tester))
+    w3 = client.w3
+    recipient = Web3.to_checksum_address("0x" + "33" * 20)
+    transfer = {"to": recipient, "value": 1, "gas": 21000}
+
+    first = client.send_transaction(transfer)
+    second = client.send_transaction(transfer)
+    assert w3.eth.get_transaction(first)["nonce"] == 0
+    assert w3.eth.get_transaction(second)["nonce"] == 1
+
+    # Another signer using the same key moves the chain's nonce past ours
+    acct = w3.eth.account.from_key(key.to_hex())
+    signed = acct.sign_transaction({
+        **transfer, "nonce": 2, "chainId": w3.eth.chain_id,
+        "maxFeePerGas": w3.to_wei("2", "gwei"), "maxPriorityFeePerGas": w3.to_wei("1", "gwei"),
+    })
+    w3.eth.send_raw_transaction(signed.rawTransaction)
+
+    third = client.send_transaction(transfer)
+    assert w3.eth.get_transaction(third)["nonce"] == 3
+
+
+def test_failed_sends_leave_no_nonce_gap(monkeypatch):
+    import pytest
+
+    eth_tester = pytest.importorskip("eth_tester", reason="pip install -r backend/requirements-dev.txt")
+    from web3 import EthereumTesterProvider, Web3
+
+    tester = eth_tester.EthereumTester()
+    monkeypatch.setattr(Config, "DEPLOYER_PRIVATE_KEY", tester.backend.account_keys[0].to_hex())
+    client = ChainClient(provider=EthereumTesterProvider(tester))
+    w3 = client.w3
+    transfer = {"to": Web3.to_checksum_address("0x" + "33" * 20), "value": 1, "gas": 21000}
+    send_raw = w3.eth.send_raw_transaction
+    attempts = []
+
+    def reject(message):
+        def send(raw):
+            attempts.append(message)
+            raise ValueError(message)
+        return send
+
+    # Rejected on the retry as well
+    monkeypatch.setattr(w3.eth, "send_raw_transaction", reject("nonce too high"))
+    with pytest.raises(ValueError):
+        client.send_transaction(transfer)
+    assert len(attempts) == 2
+    # A fee rejection is not retried as a nonce problem
+    monkeypatch.setattr(w3.eth, "send_raw_transaction", reject("transaction underpriced"))
+    with pytest.raises(ValueError):
+        client.send_transaction(transfer)
+    assert len(attempts) == 3
+
+    monkeypatch.setattr(w3.eth, "send_raw_transaction", send_raw)
+    tx_hash = client.send_transaction(transfer)
+    assert w3.eth.get_transaction(tx_hash)["nonce"] == 0
+
+
+def test_merkle_proofs_verify_every_leaf():
+    from backend.services.merkle import MerkleTree, verify
+
+    cids = [f"Qm{i:044d}" for i in range(7)]
+    tree = MerkleTree(cids)
+    for index, cid in enumerate(cids):
+        assert verify(cid, tree.proof(index), tree.root)
+    assert not verify("QmOther", tree.proof(0), tree.root)
+    assert MerkleTree(["QmOnly"]).proof(0) == []
+
+
+def test_receipt_tracker_confirms_pending_transactions_in_one_batch(monkeypatch):
+    import pytest
+
+    eth_tester = pytest.importorskip("eth_tester", reason="pip install -r backend/requirements-dev.txt")
+    from web3 import EthereumTesterProvider, Web3
+    from backend.app import create_app, db
+    from backend.models.chain_transaction import ChainTransaction
+    from backend.services import receipts
+
+    tester = eth_tester.EthereumTester()
+    monkeypatch.setattr(Config, "DEPLOYER_PRIVATE_KEY", tester.backend.account_keys[0].to_hex())
+    client = ChainClient(provider=EthereumTesterProvider(tester))
+    monkeypatch.setattr(receipts, "chain", client)
+    batches = []
+    rpc_batch = client.rpc_batch
+    monkeypatch.setattr(client, "rpc_batch", lambda calls: batches.append(calls) or rpc_batch(calls))
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    with app.app_context():
+        db.create_all()
+        recipient = Web3.to_checksum_address("0x" + "33" * 20)
+        hashes = [client.send_transaction({"to": recipient, "value": 1, "gas": 21000}) for _ in range(3)]
+        for tx_hash in hashes:
+            receipts.track(tx_hash, "reward")
+        receipts.track("0x" + "ab" * 32, "anchor")
+        db.session.commit()
+
+        changed = receipts.poll(app.config)
+        assert len(batches) == 1
+        assert {tx.tx_hash for tx in changed} == set(hashes)
+        confirmed = ChainTransaction.query.filter_by(tx_hash=hashes[0]).one()
+        assert confirmed.status == ChainTransaction.CONFIRMED
+        assert confirmed.block_number is not None
+        assert ChainTransaction.query.filter_by(status=ChainTransaction.PENDING).count() == 1
+        assert not client.nonces(client.account.address).pending
+
+        res = app.test_client().get(f"/api/blockchain/transactions/{hashes[1]}")
+        assert res.get_json()["status"] == "confirmed"
+
+
+def test_event_indexer_resumes_and_rolls_back_reorgs(monkeypatch):
+    from eth_abi import encode as abi_encode
+    from backend.app import create_app, db
+    from backend.models.hash_anchor import HashAnchor
+    from backend.models.token import TokenTransfer
+    from backend.services import indexer
+
+    contract = "0x" + "cc" * 20
+    sender = "0x" + "00" * 12 + "11" * 20
+    recipient = "0x" + "00" * 12 + "22" * 20
+
+    class FakeEth:
+        def __init__(self):
+            self.block_number = 0
+            self.forks = {}  # block -> fork id, changes the block hash
+            self.logs = []
+            self.get_logs_calls = []
+
+        def get_block(self, number):
+            return {"hash": "0x" + f"{number:032x}{self.forks.get(number, 0):032x}"}
+
+        def get_logs(self, params):
+            self.get_logs_calls.append((params["fromBlock"], params["toBlock"]))
+            return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+        def add(self, block, topic, data, extra_topics=()):
+            self.logs.append({
+                "topics": [topic, *extra_topics], "data": "0x" + data.hex(),
+                "blockNumber": block, "blockHash": self.get_block(block)["hash"],
+                "transactionHash": "0x" + f"{block:064x}", "logIndex": 0,
+            })
+
+    class FakeChain:
+        w3 = type("W3", (), {})()
+
+        def contract_address(self):
+            return contract
+
+    fake = FakeChain()
+    fake.w3.eth = eth = FakeEth()
+    monkeypatch.setattr(indexer, "chain", fake)
+    app = create_app({
+        "TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "INDEXER_CHUNK_SIZE": 10, "INDEXER_REORG_DEPTH": 5,
+    })
+    with app.app_context():
+        db.create_all()
+        eth.add(3, indexer.HASH_SAVED_TOPIC, abi_encode(["string"], ["QmFirst"]), [sender])
+        eth.add(15, indexer.TRANSFER_TOPIC, (5 * 10**18).to_bytes(32, "big"), [sender, recipient])
+        eth.add(24, indexer.HASH_SAVED_TOPIC, abi_encode(["string"], ["QmSecond"]), [sender])
+        eth.block_number = 25
+        assert indexer.run_once(app.config) == 3
+        assert eth.get_logs_calls == [(0, 9), (10, 19), (20, 25)]
+        assert TokenTransfer.query.one().amount == 5.0
+
+        # Nothing new: no log scan
+        eth.get_logs_calls.clear()
+        assert indexer.run_once(app.config) == 0
+        assert eth.get_logs_calls == []
+
+        # Block 24 is reorged away and its event moves to block 26
+        eth.forks = {24: 1, 25: 1}
+        eth.logs = [log for log in eth.logs if log["blockNumber"] != 24]
+        eth.add(26, indexer.HASH_SAVED_TOPIC, abi_encode(["string"], ["QmSecond"]), [sender])
+        eth.block_number = 26
+        indexer.run_once(app.config)
+        assert eth.get_logs_calls == [(21, 26)]
+        anchor = HashAnchor.query.filter_by(ipfs_hash="QmSecond").one()
+        assert anchor.block_number == 26
+
+        res = app.test_client().get("/api/blockchain/hashes/QmFirst")
+        assert res.get_json()["anchors"][0]["blockNumber"] == 3
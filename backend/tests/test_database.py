@@ -0,0 +1,22 @@
+from sqlalchemy import text
+from backend.app import create_app, db
+from backend.config import Config
+from backend.utils.database import database_uri, engine_options
+
+
+def test_sqlite_connections_get_wal_and_busy_timeout(tmp_path):
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'wal.db'}"})
+    with app.app_context(), db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_server_databases_get_a_pool():
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    assert engine_options({**config, "SQLALCHEMY_DATABASE_URI": "sqlite:///dev.db"}) == {}
+    options = engine_options({**config, "SQLALCHEMY_DATABASE_URI": "postgresql://u:p@db/contri"})
+    assert options["pool_size"] == Config.DB_POOL_SIZE
+    assert options["max_overflow"] == Config.DB_MAX_OVERFLOW
+    assert options["pool_pre_ping"] is True
+    assert database_uri("postgres://u:p@db/contri") == "postgresql://u:p@db/contri"
@@ -0,0 +1,47 @@
+import pytest
+from backend.app import create_app, db
+from backend.services import metrics
+
+
+def make_app(**config):
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:", **config})
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("t_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(value, op="x")
+    lines = h.render()
+    assert 't_seconds_bucket{op="x",le="0.1"} 2' in lines
+    assert 't_seconds_bucket{op="x",le="1"} 3' in lines
+    assert 't_seconds_bucket{op="x",le="+Inf"} 4' in lines
+    assert 't_seconds_sum{op="x"} 3.65' in lines
+    assert 't_seconds_count{op="x"} 4' in lines
+
+
+def test_requests_report_latency_and_sql_counts():
+    app = make_app()
+    client = app.test_client()
+    res = client.get("/api/contributions")
+    assert res.status_code == 200
+    assert res.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="1 queries"' in res.headers["Server-Timing"]
+
+    with pytest.raises(RuntimeError):
+        with metrics.timed("pinata", "pin_file"):
+            raise RuntimeError("down")
+
+    body = client.get("/api/metrics").get_data(as_text=True)
+    assert ('contri_http_request_duration_seconds_count'
+            '{method="GET",endpoint="/api/contributions",status="200"}') in body
+    assert 'contri_http_request_db_queries_bucket{endpoint="/api/contributions",le="1"}' in body
+    assert 'contri_external_call_duration_seconds_count{service="pinata",operation="pin_file",outcome="error"}' in body
+
+
+def test_metrics_token():
+    client = make_app(METRICS_TOKEN="s3cret").test_client()
+    assert client.get("/api/metrics").status_code == 403
+    assert client.get("/api/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
@@ -0,0 +1,67 @@
+import sqlite3
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from flask_migrate import upgrade
+from backend.app import create_app, db
+from backend.utils.schema import check_schema, schema_status
+
+HEAD = "0009"
+
+
+def make_app(path, **config):
+    return create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SCHEMA_CHECK": "error",
+        **config,
+    })
+
+
+def schema_diff(app):
+    with app.app_context(), db.engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"compare_type": True})
+        return compare_metadata(context, db.metadata)
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    app = make_app(tmp_path / "new.db")
+    assert schema_status(app) == (None, HEAD)
+    with app.app_context():
+        upgrade()
+    assert schema_status(app) == (HEAD, HEAD)
+    assert schema_diff(app) == []
+    check_schema(app)  # At head: no error
+
+
+def test_migrations_adopt_a_legacy_database(tmp_path):
+    path = tmp_path / "legacy.db"
+    # Schema left behind by the old create_all() startup code, before the ALTER TABLE patches
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE users (id INTEGER NOT NULL, created_at DATETIME, updated_at DATETIME,
+                name VARCHAR(120) NOT NULL, email VARCHAR(255) NOT NULL, password_hash VARCHAR(255) NOT NULL,
+                role VARCHAR(50), avatar_url VARCHAR(500), bio TEXT, cnri_balance FLOAT,
+                PRIMARY KEY (id), UNIQUE (email));
+            CREATE TABLE contributions (id INTEGER NOT NULL, created_at DATETIME, updated_at DATETIME,
+                title VARCHAR(200) NOT NULL, description TEXT NOT NULL, author_id INTEGER NOT NULL,
+                file_url VARCHAR(500), ipfs_cid VARCHAR(128), reward_amount FLOAT, status VARCHAR(50),
+                PRIMARY KEY (id), FOREIGN KEY(author_id) REFERENCES users (id));
+            CREATE TABLE token_transfers (id INTEGER NOT NULL, created_at DATETIME, updated_at DATETIME,
+                sender VARCHAR(64) NOT NULL, recipient VARCHAR(64) NOT NULL, amount FLOAT NOT NULL, tx_hash VARCHAR(80),
+                PRIMARY KEY (id));
+            INSERT INTO users (id, name, email, password_hash) VALUES (1, 'Old', 'old@example.com', 'x');
+            INSERT INTO contributions (id, title, description, author_id, status, created_at)
+                VALUES (1, 'Kept', 'd', 1, 'Approved', '2025-01-01 12:00:00');
+        """)
+    app = make_app(path)
+    with pytest.raises(RuntimeError, match="db upgrade"):
+        check_schema(app)
+
+    check_schema(make_app(path, SCHEMA_CHECK="upgrade"))
+    assert schema_status(app) == (HEAD, HEAD)
+    assert schema_diff(app) == []
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT title, status FROM contributions").fetchall() == [("Kept", "Approved")]
+        # Padded to the precision of bound datetimes, so keyset cursors compare correctly
+        assert conn.execute("SELECT created_at FROM contributions").fetchone() == ("2025-01-01 12:00:00.000000",)
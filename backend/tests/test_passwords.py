@@ -0,0 +1,67 @@
+from backend.app import create_app, db
+from backend.config import Config
+from backend.services import passwords
+
+
+def use_scheme(monkeypatch, method, **cost):
+    monkeypatch.setattr(Config, "PASSWORD_HASH_METHOD", method)
+    for name, value in cost.items():
+        monkeypatch.setattr(Config, name, value)
+
+
+def test_verify_upgrades_hashes_made_with_other_settings(monkeypatch):
+    monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 0)
+    use_scheme(monkeypatch, "pbkdf2", PASSWORD_PBKDF2_ITERATIONS=1000)
+    stored = passwords.hash_password("secret")
+    assert stored.startswith("pbkdf2:sha256:1000$")
+    assert passwords.verify_password("secret", stored) == (True, None)
+
+    use_scheme(monkeypatch, "bcrypt", PASSWORD_BCRYPT_ROUNDS=4)
+    assert passwords.verify_password("wrong", stored) == (False, None)
+    ok, upgraded = passwords.verify_password("secret", stored)
+    assert ok and upgraded.startswith("$2b$04$")
+    assert passwords.verify_password("secret", upgraded) == (True, None)
+    assert passwords.verify_password("secret", "-") == (False, None)
+
+
+def test_login_rehashes_through_the_worker_pool(monkeypatch):
+    from backend.models.user import User
+
+    monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 1)
+    use_scheme(monkeypatch, "pbkdf2", PASSWORD_PBKDF2_ITERATIONS=1000)
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    try:
+        with app.app_context():
+            db.create_all()
+            user = User(name="Member", email="member@example.com")
+            user.set_password("secret")
+            db.session.add(user)
+            db.session.commit()
+        client = app.test_client()
+
+        use_scheme(monkeypatch, "bcrypt", PASSWORD_BCRYPT_ROUNDS=4)
+        assert client.post("/api/auth/login", json={"email": "member@example.com", "password": "nope"}).status_code == 401
+        res = client.post("/api/auth/login", json={"email": "member@example.com", "password": "secret"})
+        assert res.status_code == 200
+        with app.app_context():
+            assert User.query.one().password_hash.startswith("$2b$04$")
+        res = client.post("/api/auth/login", json={"email": "member@example.com", "password": "secret"})
+        assert res.status_code == 200
+    finally:
+        passwords.shutdown()
+
+
+def test_pool_is_replaced_after_a_worker_dies(monkeypatch):
+    monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 1)
+    use_scheme(monkeypatch, "pbkdf2", PASSWORD_PBKDF2_ITERATIONS=1000)
+    try:
+        stored = passwords.hash_password("secret")
+        broken = passwords._pool
+        for process in list(broken._processes.values()):
+            process.kill()  # As if OOM-killed
+            process.join()
+
+        assert passwords.verify_password("secret", stored) == (True, None)
+        assert passwords._pool is not broken
+    finally:
+        passwords.shutdown()
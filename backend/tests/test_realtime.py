@@ -0,0 +1,31 @@
+import time
+import socketio
+from backend.services.socket_queue import FilePubSubManager, InMemoryPubSubManager, client_manager
+
+
+def _relay(sender, receiver, monkeypatch):
+    """Emit on one server and return what the other server's manager delivers."""
+    received = []
+    monkeypatch.setattr(receiver, "_handle_emit", received.append)
+    servers = [socketio.Server(client_manager=m, async_mode="threading") for m in (sender, receiver)]
+    receiver.initialize()
+    servers[1].manager_initialized = True
+    time.sleep(0.2)  # Let the listener subscribe
+    servers[0].emit("contribution_reviewed", {"id": 1}, to="user:1")
+    deadline = time.time() + 5
+    while not received and time.time() < deadline:
+        time.sleep(0.02)
+    return received
+
+
+def test_memory_queue_relays_emits_between_servers(monkeypatch):
+    received = _relay(InMemoryPubSubManager(channel="t1"), InMemoryPubSubManager(channel="t1"), monkeypatch)
+    assert [(m["event"], m["room"]) for m in received] == [("contribution_reviewed", "user:1")]
+
+
+def test_file_queue_relays_emits_between_servers(monkeypatch, tmp_path):
+    path = str(tmp_path / "bus.log")
+    received = _relay(FilePubSubManager(path, channel="t2"), FilePubSubManager(path, channel="t2"), monkeypatch)
+    assert received[0]["data"] == [{"id": 1}]
+    assert client_manager(None) is None
+    assert isinstance(client_manager(f"file://{path}"), FilePubSubManager)
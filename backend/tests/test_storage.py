@@ -0,0 +1,265 @@
+import pytest
+from backend.config import Config
+from backend.services import storage
+from backend.benchmarks.pinata_stub import PinataStub
+
+
+@pytest.fixture
+def pinata(monkeypatch):
+    with PinataStub() as stub:
+        monkeypatch.setattr(Config, "PINATA_BASE_URL", stub.url)
+        monkeypatch.setattr(Config, "PINATA_API_KEY", "key")
+        monkeypatch.setattr(Config, "PINATA_SECRET_API_KEY", "secret")
+        storage.reset_pinata_session()
+        storage.invalidate_pinata_auth()
+        yield stub
+        storage.reset_pinata_session()
+        storage.invalidate_pinata_auth()
+
+
+def test_pinata_calls_reuse_pooled_connection(pinata, tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_bytes(b"hello world\n")
+
+    assert storage.test_pinata_auth() == {"ok": True}
+    first = storage.upload_file_to_pinata(str(path), name="report.txt")
+    second = storage.upload_file_to_pinata(str(path), name="report.txt")
+
+    assert first["cid"].startswith("Qm") and second["cid"].startswith("Qm")
+    assert first["name"] == "report.txt"
+    # One keep-alive connection served every call
+    assert len({client for _, _, client, _ in pinata.requests}) == 1
+
+
+def test_pinata_upload_streams_file(pinata, tmp_path):
+    import tracemalloc
+
+    path = tmp_path / "large.bin"
+    size = 8 * 1024 * 1024
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    progress = []
+
+    tracemalloc.start()
+    storage.upload_file_to_pinata(str(path), progress=lambda sent, total: progress.append((sent, total)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert progress[-1] == (size, size)
+    assert pinata.requests[-1][3] > size
+    assert peak < 1024 * 1024
+
+
+def test_compute_cid_matches_ipfs_add(tmp_path):
+    from backend.services.cid import compute_cid
+
+    hello = tmp_path / "hello.txt"
+    hello.write_bytes(b"hello world\n")
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+
+    assert compute_cid(str(hello)) == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+    assert compute_cid(str(empty)) == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+    assert compute_cid(str(empty), version=1) == "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"
+
+
+def test_pinata_auth_status_is_cached_until_invalidated(pinata):
+    def probes():
+        return sum(1 for method, _, _, _ in pinata.requests if method == "GET")
+
+    first = storage.pinata_auth_status()
+    second = storage.pinata_auth_status()
+    assert first["ok"] and not first["cached"]
+    assert second["cached"] and second["cacheAge"] >= 0
+    assert probes() == 1
+
+    storage.invalidate_pinata_auth()
+    assert not storage.pinata_auth_status()["cached"]
+    assert probes() == 2
+
+
+def test_uploads_are_content_addressed_and_reference_counted(tmp_path):
+    import io
+    import os
+    from flask_jwt_extended import create_access_token
+    from backend.models.stored_file import StoredFile
+    from backend.tests.test_api import make_app, seed_contributions
+    from backend.extensions import db
+
+    app = make_app()
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(author_id))}"}
+    client = app.test_client()
+
+    urls = []
+    for name in ("report.pdf", "copy.pdf"):
+        res = client.post("/api/contributions", headers=headers, content_type="multipart/form-data",
+                          data={"title": name, "file": (io.BytesIO(b"%PDF same bytes"), name)})
+        urls.append(res.get_json()["fileUrl"])
+    assert urls[0].endswith("/report.pdf") and urls[1].endswith("/copy.pdf")
+    assert urls[0].rsplit("/", 1)[0] == urls[1].rsplit("/", 1)[0]
+
+    blobs = [f for _, _, files in os.walk(tmp_path) for f in files]
+    assert len(blobs) == 1
+    with app.app_context():
+        assert db.session.query(StoredFile).one().ref_count == 2
+
+    res = client.get(urls[1])
+    assert res.data == b"%PDF same bytes"
+    assert res.mimetype == "application/pdf"
+
+    # Replacing an avatar releases the old blob once nothing else uses it
+    for content in (b"first avatar", b"second avatar"):
+        res = client.post("/api/profile/avatar", headers=headers, content_type="multipart/form-data",
+                          data={"file": (io.BytesIO(content), "me.png")})
+        assert res.status_code == 200
+    with app.app_context():
+        sizes = sorted(f.size for f in StoredFile.query.all())
+    assert sizes == sorted([len(b"%PDF same bytes"), len(b"second avatar")])
+
+    # Re-uploading the same avatar under the same name keeps a single reference
+    for _ in range(3):
+        res = client.post("/api/profile/avatar", headers=headers, content_type="multipart/form-data",
+                          data={"file": (io.BytesIO(b"second avatar"), "me.png")})
+        assert res.status_code == 200
+    with app.app_context():
+        assert StoredFile.query.filter_by(size=len(b"second avatar")).one().ref_count == 1
+
+
+def test_uploads_served_with_etag_range_and_proxy_offload(tmp_path):
+    import hashlib
+    import io
+    from flask_jwt_extended import create_access_token
+    from backend.tests.test_api import make_app, seed_contributions
+
+    app = make_app()
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(author_id))}"}
+    client = app.test_client()
+    body = b"%PDF-1.4 " + b"x" * 1000
+    res = client.post("/api/contributions", headers=headers, content_type="multipart/form-data",
+                      data={"title": "t", "file": (io.BytesIO(body), "paper.pdf")})
+    url = res.get_json()["fileUrl"]
+    sha256 = hashlib.sha256(body).hexdigest()
+
+    res = client.get(url)
+    assert res.data == body
+    assert res.headers["ETag"] == f'"{sha256}"'
+    cache_control = res.headers["Cache-Control"]
+    assert "immutable" in cache_control
+    assert "public" in cache_control and "private" not in cache_control
+
+    # Identity documents stay out of shared caches and get no derivatives
+    res = client.post("/api/kyc/upload", headers=headers, content_type="multipart/form-data",
+                      data={"file": (io.BytesIO(b"passport scan"), "id.png")})
+    kyc_url = res.get_json()["kyc"]["fileUrl"]
+    cache_control = client.get(kyc_url).headers["Cache-Control"]
+    assert "private" in cache_control and "public" not in cache_control
+    kyc_sha256 = hashlib.sha256(b"passport scan").hexdigest()
+    assert client.get(f"/api/derivatives/card/{kyc_sha256}").status_code == 404
+    assert client.get(url, headers={"If-None-Match": f'"{sha256}"'}).status_code == 304
+    part = client.get(url, headers={"Range": "bytes=0-7"})
+    assert part.status_code == 206 and part.data == b"%PDF-1.4"
+
+    # The name in the URL is the client's; the type comes from what was stored
+    res = client.post("/api/contributions", headers=headers, content_type="multipart/form-data",
+                      data={"title": "t", "file": (io.BytesIO(b"<script>alert(1)</script>"), "notes.txt")})
+    text_url = res.get_json()["fileUrl"]
+    res = client.get(text_url.rsplit("/", 1)[0] + "/evil.html")
+    assert res.mimetype == "text/plain"
+    assert res.headers["X-Content-Type-Options"] == "nosniff"
+    # Stored names outside the safe types are served as downloads
+    res = client.post("/api/profile/avatar", headers=headers, content_type="multipart/form-data",
+                      data={"file": (io.BytesIO(b"<html>"), "page.html")})
+    assert client.get(res.get_json()["avatarUrl"]).mimetype == "application/octet-stream"
+
+    app.config.update(UPLOAD_SEND_MODE="x-accel", UPLOAD_ACCEL_PREFIX="/_uploads/")
+    res = client.get(url)
+    assert res.data == b""
+    assert res.headers["X-Accel-Redirect"] == f"/_uploads/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+    assert res.mimetype == "application/pdf"
+    assert "private" not in res.headers["Cache-Control"]
+    assert client.get(url, headers={"If-None-Match": f'"{sha256}"'}).status_code == 304
+    assert client.get("/api/uploads/../secret.txt").status_code == 404
+
+
+def test_image_uploads_get_cached_resized_derivatives(tmp_path):
+    import io
+    Image = pytest.importorskip("PIL.Image")
+    from flask_jwt_extended import create_access_token
+    from backend.services import derivatives
+    from backend.tests.test_api import make_app, seed_contributions
+
+    app = make_app()
+    app.config.update(UPLOAD_FOLDER=str(tmp_path / "uploads"), DERIVATIVE_FOLDER=str(tmp_path / "cache"))
+    author_id = seed_contributions(app, 0)
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(author_id))}"}
+    client = app.test_client()
+
+    def png(width, height, color):
+        buf = io.BytesIO()
+        Image.new("RGB", (width, height), color).save(buf, "PNG")
+        return buf.getvalue()
+
+    res = client.post("/api/contributions", headers=headers, content_type="multipart/form-data",
+                      data={"title": "photo", "file": (io.BytesIO(png(1600, 800, "red")), "photo.png")})
+    contribution_id = res.get_json()["id"]
+    card = client.get("/api/contributions").get_json()[0]
+    assert card["thumbnailUrl"].startswith("/api/derivatives/card/")
+
+    res = client.get(card["thumbnailUrl"])
+    assert res.status_code == 200 and res.mimetype == "image/jpeg"
+    assert Image.open(io.BytesIO(res.data)).size == (320, 160)
+    assert "immutable" in res.headers["Cache-Control"]
+    assert client.get(f"/api/contributions/{contribution_id}").status_code == 200
+
+    res = client.post("/api/profile/avatar", headers=headers, content_type="multipart/form-data",
+                      data={"file": (io.BytesIO(png(300, 200, "blue")), "me.png")})
+    thumb = client.get(f"/api/profile/{author_id}").get_json()["avatarThumbUrl"]
+    assert Image.open(io.BytesIO(client.get(thumb).data)).size == (64, 64)
+
+    # The cache stays within its bound, dropping the least recently used file
+    cache = str(tmp_path / "cache")
+    used = sum(size for _, size, _ in derivatives._scan(cache))
+    derivatives._cache_bytes.pop(cache, None)
+    derivatives._account(cache, 0, used - 1)
+    assert len(derivatives._scan(cache)) == 1
+
+
+def test_released_blobs_are_unlinked_only_after_commit(tmp_path):
+    import io
+    import os
+    from werkzeug.datastructures import FileStorage
+    from backend.extensions import db
+    from backend.models.stored_file import StoredFile
+    from backend.tests.test_api import make_app
+
+    app = make_app()
+    with app.app_context():
+        saved = storage.save_upload(FileStorage(io.BytesIO(b"identity document"), "id.pdf"), str(tmp_path))
+        db.session.commit()
+        assert os.listdir(os.path.join(tmp_path, ".tmp")) == []  # Restore link dropped on commit
+
+        storage.release_upload(saved.url, str(tmp_path))
+        db.session.flush()
+        assert os.path.exists(saved.path)  # Not before the commit...
+        db.session.rollback()
+        assert os.path.exists(saved.path)  # ...and not at all when it rolls back
+        assert StoredFile.query.one().ref_count == 1
+
+        storage.release_upload(saved.url, str(tmp_path))
+        db.session.commit()
+        assert not os.path.exists(saved.path)
+        assert StoredFile.query.count() == 0
+
+        # A release that unlinks the blob before a concurrent upload commits: the upload restores it
+        again = storage.save_upload(FileStorage(io.BytesIO(b"identity document"), "id.pdf"), str(tmp_path))
+        os.unlink(again.path)
+        db.session.commit()
+        with open(again.path, "rb") as f:
+            assert f.read() == b"identity document"
@@ -1,7 +1,143 @@
-from flask_jwt_extended import jwt_required
+"""JWT identity lookup and role gates for the API.
+
+``flask_jwt_extended.current_user`` is a ``CachedUser`` (id, role and KYC
+flag) kept in a small per-app TTL/LRU cache, so role checks on authenticated
+requests normally cost no query. Handlers that need the full row still load
+it with ``db.session.get(User, current_user.id)``.
+
+Commits that change or delete a user drop its entry. With several worker
+processes the other processes only see the change when their entry
+expires, so USER_CACHE_TTL bounds how long a revoked admin keeps access.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import NamedTuple, Optional, Set, Tuple
+from flask import current_app, has_app_context, jsonify
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class CachedUser(NamedTuple):
+    id: int
+    role: str
+    kyc_verified: bool
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+
+class UserCache:
+    def __init__(self, ttl: float, size: int):
+        self.ttl, self.size = ttl, size
+        self._entries: "OrderedDict[int, Tuple[float, CachedUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user: CachedUser) -> None:
+        if self.ttl <= 0 or self.size <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 def auth_required(fn):
     return jwt_required()(fn)
 
 
+def admin_required(fn):
+    """``jwt_required()`` plus a 403 unless the caller's role is admin."""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not current_user.is_admin:
+            return jsonify({"error": "Forbidden"}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def load_user(user_id: int) -> Optional[CachedUser]:
+    from backend.extensions import db
+    from backend.models.user import User
+
+    cache: UserCache = current_app.extensions["user_cache"]
+    cached = cache.get(user_id)
+    if cached is not None:
+        return cached
+    row = db.session.execute(
+        db.select(User.id, User.role, User.kyc_verified).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    user = CachedUser(row.id, row.role or "user", bool(row.kyc_verified))
+    cache.put(user)
+    return user
+
+
+def init_app(app) -> None:
+    from backend.extensions import jwt
+
+    app.extensions["user_cache"] = UserCache(app.config["USER_CACHE_TTL"], app.config["USER_CACHE_SIZE"])
+
+    @jwt.user_lookup_loader
+    def user_lookup(jwt_header, jwt_data):
+        try:
+            return load_user(int(jwt_data[current_app.config["JWT_IDENTITY_CLAIM"]]))
+        except (TypeError, ValueError):
+            return None  # Reported as 401 by flask_jwt_extended
+
+    if not event.contains(Session, "after_flush", _collect_changed_users):
+        event.listen(Session, "after_flush", _collect_changed_users)
+        event.listen(Session, "after_commit", _invalidate_changed_users)
+        event.listen(Session, "after_rollback", _discard_changed_users)
+
+
+def _collect_changed_users(session, flush_context):
+    from backend.models.user import User
+
+    changed: Set[int] = session.info.setdefault("changed_user_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+def _invalidate_changed_users(session):
+    if session.in_nested_transaction():
+        return  # A savepoint; wait for the real commit
+    changed = session.info.pop("changed_user_ids", None)
+    if not changed or not has_app_context():
+        return
+    cache = current_app.extensions.get("user_cache")
+    if cache is not None:
+        for user_id in changed:
+            cache.invalidate(user_id)
+
+
+def _discard_changed_users(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,54 @@
+"""Engine tuning per database dialect.
+
+SQLite connections get WAL journaling, ``synchronous=NORMAL`` and a busy
+timeout so readers do not block the writer and concurrent writers wait
+instead of failing with "database is locked". Server databases (Postgres,
+MySQL) get a sized, pre-pinged connection pool.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def database_uri(uri: str) -> str:
+    # Heroku-style postgres:// URLs are rejected by SQLAlchemy 2
+    if uri.startswith("postgres://"):
+        return "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def is_sqlite(uri: str) -> bool:
+    return make_url(uri).get_backend_name() == "sqlite"
+
+
+def engine_options(config) -> dict:
+    """Pool options for SQLALCHEMY_ENGINE_OPTIONS; empty for SQLite, which Flask-SQLAlchemy pools itself."""
+    if is_sqlite(config["SQLALCHEMY_DATABASE_URI"]):
+        return {}
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def install_sqlite_pragmas(engine, config) -> None:
+    """Apply the SQLITE_* pragmas to every new connection of ``engine``."""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = (
+        ("journal_mode", config["SQLITE_JOURNAL_MODE"]),
+        ("synchronous", config["SQLITE_SYNCHRONOUS"]),
+        ("busy_timeout", int(config["SQLITE_BUSY_TIMEOUT_MS"])),
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                if value:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,49 @@
+"""Leveled, non-blocking logging for the ``backend`` package.
+
+Request and worker threads only put records on an in-memory queue; a single
+listener thread formats them and writes to stderr, so a slow or blocked
+terminal or log shipper never stalls a request.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def configure_logging(app) -> None:
+    """Route ``backend.*`` loggers through a queue at LOG_LEVEL (once per process)."""
+    global _listener
+    logger = logging.getLogger("backend")
+    logger.setLevel(app.config["LOG_LEVEL"].upper())
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stderr)
+    if app.config["LOG_FORMAT"] == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    records: queue.Queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.propagate = False  # Alembic's fileConfig() adds a root handler; avoid duplicates
+    _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,68 @@
+import base64
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for a (created_at, id) position."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 date or datetime query parameter."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}")
+    # created_at columns are stored naive (UTC) by the database
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def page_size(requested: Optional[str], default: int, maximum: int) -> int:
+    try:
+        size = int(requested) if requested else default
+    except ValueError:
+        size = default
+    return max(1, min(size, maximum))
+
+
+def keyset_page(query, model, cursor: Optional[str], limit: int):
+    """Return (rows, next_cursor) for newest-first keyset pagination on (created_at, id).
+
+    The position filter only ever compares against the last row seen, so the
+    cost of fetching a page does not grow with how deep the client has scrolled.
+    """
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < ts,
+            and_(model.created_at == ts, model.id < row_id),
+        ))
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
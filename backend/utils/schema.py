@@ -0,0 +1,45 @@
+"""Startup check of the database schema against the Alembic head.
+
+Booting only compares two revision ids; the schema itself is changed by
+``python -m backend.manage db upgrade`` (or SCHEMA_CHECK=upgrade).
+"""
+import logging
+from typing import Optional, Tuple
+from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import current_app
+from backend.extensions import db
+
+logger = logging.getLogger(__name__)
+
+UPGRADE_HINT = 'run "python -m backend.manage db upgrade"'
+
+
+def schema_status(app) -> Tuple[Optional[str], Optional[str]]:
+    """(current, head) revision ids; current is None for an unversioned database."""
+    config = AlembicConfig()
+    config.set_main_option("script_location", app.extensions["migrate"].directory)
+    head = ScriptDirectory.from_config(config).get_current_head()
+    with app.app_context(), db.engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    return current, head
+
+
+def check_schema(app) -> None:
+    mode = app.config["SCHEMA_CHECK"]
+    if mode == "off":
+        return
+    current, head = schema_status(app)
+    if current == head:
+        return
+    if mode == "upgrade":
+        from flask_migrate import upgrade
+        with app.app_context():
+            upgrade(directory=current_app.extensions["migrate"].directory)
+        logger.info("Database schema upgraded from %s to %s", current, head)
+        return
+    message = f"Database schema at {current}, head is {head}; {UPGRADE_HINT}"
+    if mode == "error":
+        raise RuntimeError(message)
+    logger.warning(message)
@@ -0,0 +1,48 @@
+"""Upload URL helpers shared by the models and the storage services.
+
+Nothing here imports models or services, so models can build upload and
+derivative URLs without an import cycle through ``backend.services``.
+"""
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+
+# Types uploads may be served as; anything else (HTML, SVG, scripts) is a download
+SAFE_MIMETYPES = {
+    "image/png", "image/jpeg", "image/gif", "image/webp",
+    "application/pdf", "text/plain", "text/markdown",
+}
+
+_BLOB_URL = re.compile(r"^(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P<sha256>(?P=a)(?P=b)[0-9a-f]{60})/(?P<name>[^/]+)$")
+
+
+def parse_upload_url(file_url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(sha256, name) of a content-addressed upload URL; (None, filename) for legacy flat uploads."""
+    if not file_url:
+        return None, None
+    relative = file_url.split("/api/uploads/", 1)[-1]
+    match = _BLOB_URL.match(relative)
+    if match:
+        return match.group("sha256"), match.group("name")
+    return None, os.path.basename(relative)
+
+
+def upload_mimetype(name: Optional[str]) -> str:
+    """Content-Type to serve a stored file named ``name`` with; never a type the browser would render as a page."""
+    mimetype = mimetypes.guess_type(name or "")[0]
+    return mimetype if mimetype in SAFE_MIMETYPES else "application/octet-stream"
+
+
+def is_image(name: Optional[str]) -> bool:
+    return bool(name) and "." in name and name.rsplit(".", 1)[1].lower() in IMAGE_EXTENSIONS
+
+
+def derivative_url(file_url: Optional[str], preset: str) -> Optional[str]:
+    """URL of a preset derivative (see services.derivatives.PRESETS) for an uploaded image, or None."""
+    sha256, name = parse_upload_url(file_url)
+    if not sha256 or not is_image(name):
+        return None
+    return f"/api/derivatives/{preset}/{sha256}"
@@ -1,3 +1,20 @@
-from backend.app import app as application
+"""WSGI entry point.
 
+For many concurrent Socket.IO connections set SOCKETIO_ASYNC_MODE=gevent and
+run one worker per process, e.g. ``gunicorn -k gevent -w 1 backend.wsgi:application``.
+Several such processes need SOCKETIO_MESSAGE_QUEUE and sticky sessions.
+"""
+import os
 
+# Green async modes need the stdlib patched before anything else is imported
+_async_mode = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
+if _async_mode == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+elif _async_mode == "eventlet":
+    import eventlet
+    eventlet.monkey_patch()
+
+from backend.app import create_app  # noqa: E402
+
+application = create_app()
@@ -21,6 +21,8 @@ export const KYCVerificationSection = () => {
   const { toast } = useToast();
   const [requests, setRequests] = useState<KYCRequest[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [actionLoading, setActionLoading] = useState<number | null>(null);
   const API_BASE = (import.meta as any).env?.VITE_API_URL || 'http://localhost:5001/api';
 
@@ -28,21 +30,24 @@ export const KYCVerificationSection = () => {
     fetchKYCRequests();
   }, []);
 
-  const fetchKYCRequests = async () => {
+  // The list is paginated: pass the X-Next-Cursor of the previous page to append the next one
+  const fetchKYCRequests = async (cursor?: string) => {
     if (!token) return;
-    setLoading(true);
+    cursor ? setLoadingMore(true) : setLoading(true);
     try {
-      const res = await fetch(`${API_BASE}/kyc/admin/list`, {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`${API_BASE}/kyc/admin/list${query}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       if (res.ok) {
-        const data = await res.json();
-        setRequests(data);
+        const data: KYCRequest[] = await res.json();
+        setRequests(prev => (cursor ? [...prev, ...data] : data));
+        setNextCursor(res.headers.get('X-Next-Cursor'));
       }
     } catch (error) {
       console.error('Error fetching KYC requests:', error);
     } finally {
-      setLoading(false);
+      cursor ? setLoadingMore(false) : setLoading(false);
     }
   };
 
@@ -163,6 +168,13 @@ export const KYCVerificationSection = () => {
           </div>
         </div>
       ))}
+      {nextCursor && (
+        <div className="text-center">
+          <Button variant="outline" onClick={() => fetchKYCRequests(nextCursor)} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        </div>
+      )}
     </div>
   );
 };
@@ -52,6 +52,9 @@ const Admin = () => {
   const [currentView, setCurrentView] = useState<'dashboard' | 'kyc' | 'contributions'>('dashboard');
   const [kycRequests, setKycRequests] = useState<KYCRequest[]>([]);
   const [kycLoading, setKycLoading] = useState(false);
+  const [kycNextCursor, setKycNextCursor] = useState<string | null>(null);
+  const [kycLoadingMore, setKycLoadingMore] = useState(false);
+  const [kycCounts, setKycCounts] = useState<Record<string, number>>({});
   const [kycActionLoading, setKycActionLoading] = useState<number | null>(null);
 
   const API_BASE = (import.meta as any).env?.VITE_API_URL || 'http://localhost:5001/api';
@@ -124,16 +127,22 @@ const Admin = () => {
     }
   };
 
-  const fetchKYCRequests = async () => {
+  // The list is paginated: pass the X-Next-Cursor of the previous page to append the next one
+  const fetchKYCRequests = async (cursor?: string) => {
     if (!token) return;
-    setKycLoading(true);
+    cursor ? setKycLoadingMore(true) : setKycLoading(true);
     try {
-      const res = await fetch(`${API_BASE}/kyc/admin/list`, {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const res = await fetch(`${API_BASE}/kyc/admin/list${query}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       if (res.ok) {
-        const data = await res.json();
-        setKycRequests(data);
+        const data: KYCRequest[] = await res.json();
+        setKycRequests(prev => (cursor ? [...prev, ...data] : data));
+        setKycNextCursor(res.headers.get('X-Next-Cursor'));
+      }
+      if (!cursor) {
+        fetchKYCCounts();
       }
     } catch (error) {
       console.error('Error fetching KYC requests:', error);
@@ -143,7 +152,22 @@ const Admin = () => {
         variant: 'destructive',
       });
     } finally {
-      setKycLoading(false);
+      cursor ? setKycLoadingMore(false) : setKycLoading(false);
+    }
+  };
+
+  // Totals come from the server, since kycRequests only holds the pages loaded so far
+  const fetchKYCCounts = async () => {
+    if (!token) return;
+    try {
+      const res = await fetch(`${API_BASE}/kyc/admin/counts`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      if (res.ok) {
+        setKycCounts(await res.json());
+      }
+    } catch (error) {
+      console.error('Error fetching KYC counts:', error);
     }
   };
 
@@ -200,9 +224,9 @@ const Admin = () => {
   };
 
   // Calculate KYC stats
-  const kycRequestsCount = kycRequests.length;
-  const kycPendingCount = kycRequests.filter(r => r.status === 'Pending').length;
-  const kycVerifiedCount = kycRequests.filter(r => r.status === 'Verified').length;
+  const kycRequestsCount = kycCounts.total ?? 0;
+  const kycPendingCount = kycCounts.Pending ?? 0;
+  const kycVerifiedCount = kycCounts.Verified ?? 0;
 
   // Fetch full contribution details (contains fileUrl) and update local state
   const fetchContributionDetail = async (id: number) => {
@@ -234,6 +258,25 @@ const Admin = () => {
     }
   };
 
+  const waitForApprovalJob = async (jobId: number, authToken: string) => {
+    for (;;) {
+      const res = await fetch(`${API_BASE}/approval-jobs/${jobId}`, {
+        headers: { 'Authorization': `Bearer ${authToken}` },
+      });
+      const job = await res.json();
+      if (!res.ok) {
+        throw new Error(job?.error || 'Failed to fetch approval status');
+      }
+      if (job.state === 'done') {
+        return job.result ?? {};
+      }
+      if (job.state === 'failed') {
+        throw new Error(job.error || 'Approval failed');
+      }
+      await new Promise(resolve => setTimeout(resolve, 1500));
+    }
+  };
+
   const handleReview = async (contributionId: number, action: 'accept' | 'reject') => {
     setActionLoading(contributionId);
     
@@ -276,9 +319,14 @@ const Admin = () => {
         }
       }
 
-      const reviewData = await reviewResponse.json();
+      let reviewData = await reviewResponse.json();
       console.log('Review response data:', reviewData);
 
+      // Approvals are processed in the background; wait for the job to finish
+      if (reviewResponse.status === 202 && reviewData?.jobId) {
+        reviewData = await waitForApprovalJob(reviewData.jobId, authToken);
+      }
+
       // Show success toast with IPFS verification links
       if (action === 'accept' && reviewData?.ipfsHash) {
         const cidShort = reviewData.ipfsHash.length > 20 
@@ -733,7 +781,7 @@ const Admin = () => {
                       key={req.id}
                       initial={{ opacity: 0, y: 20 }}
                       animate={{ opacity: 1, y: 0 }}
-                      transition={{ duration: 0.3, delay: index * 0.1 }}
+                      transition={{ duration: 0.3, delay: (index % 50) * 0.1 }}
                       className="glass border-primary/20 rounded-xl p-6 hover-glow"
                     >
                       <div className="flex items-start justify-between">
@@ -809,6 +857,13 @@ const Admin = () => {
                       </div>
                     </motion.div>
                   ))}
+                  {kycNextCursor && (
+                    <div className="text-center">
+                      <Button variant="outline" onClick={() => fetchKYCRequests(kycNextCursor)} disabled={kycLoadingMore}>
+                        {kycLoadingMore ? 'Loading...' : 'Load more'}
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </CardContent>